@@ -1,6 +1,82 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 
+from .changes import stamp_receipt_changes
+from .events import EVENT_RECEIPT_DELETED, EVENT_RECEIPT_UPDATED, publish_household_event
+from .line_items import sync_line_items
 from .models import HouseholdSession, Receipt
+from .rollups import refresh_household_months
+from .search import receipt_text_match
+from .vendors import resolve_vendor_key
+
+# Unfiltered changelists over tables at least this large show Postgres' row estimate instead of COUNT(*).
+ESTIMATED_COUNT_MIN_ROWS = 100_000
+
+
+def _record_receipt_write(household_id, dates, changed_ids=(), deleted_ids=()):
+    sync_line_items(changed_ids)
+    # Receipts outside a household have no rollups, data version or change feed to keep in step.
+    household = HouseholdSession.objects.filter(id=household_id).first() if household_id else None
+    if household is None:
+        return
+    refresh_household_months(household_id, dates)
+    version = household.bump_data_version()
+    stamp_receipt_changes(household_id, version, changed_ids, deleted_ids)
+    event = EVENT_RECEIPT_DELETED if deleted_ids else EVENT_RECEIPT_UPDATED
+    publish_household_event(household_id, event, version, [*changed_ids, *deleted_ids])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Counts an unfiltered Postgres table from ``pg_class.reltuples`` rather than a full ``COUNT(*)`` scan.
+
+    Filtered changelists (household, search, dates) still get exact counts; they are index-backed.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 until the table is first analyzed.
+            if row and row[0] >= ESTIMATED_COUNT_MIN_ROWS:
+                return row[0]
+        return super().count
+
+
+class HouseholdAutocompleteFilter(admin.SimpleListFilter):
+    """Household filter picked through the admin autocomplete instead of listing every household."""
+
+    title = "household"
+    parameter_name = "household__id__exact"
+    template = "admin/receipts/household_autocomplete_filter.html"
+
+    def lookups(self, request, model_admin):
+        # Only the selected household is loaded, to label the current choice.
+        value = self.value()
+        household = HouseholdSession.objects.filter(pk=value).first() if value and value.isdigit() else None
+        return [(str(household.pk), str(household))] if household else []
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        if not value.isdigit():
+            return queryset.none()
+        return queryset.filter(household_id=int(value))
 
 
 @admin.register(HouseholdSession)
@@ -12,5 +88,64 @@ class HouseholdSessionAdmin(admin.ModelAdmin):
 @admin.register(Receipt)
 class ReceiptAdmin(admin.ModelAdmin):
     list_display = ("id", "household", "uploaded_by", "vendor", "expense_date", "total", "uploaded_at")
-    list_filter = ("uploaded_by", "expense_date", "household")
-    search_fields = ("vendor", "raw_text", "household__household_name", "household__code")
+    list_select_related = ("household",)
+    list_filter = ("uploaded_by", "is_saved", HouseholdAutocompleteFilter)
+    date_hierarchy = "expense_date"
+    ordering = ("-expense_date", "-uploaded_at", "-id")
+    autocomplete_fields = ("household",)
+    # get_search_results replaces these; they only switch the search box on.
+    search_fields = ("=id", "=household__code")
+    search_help_text = "Words from the vendor, item names or receipt text, a household code, or a receipt id."
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    @property
+    def media(self):
+        household_widget = AutocompleteSelect(Receipt._meta.get_field("household"), self.admin_site)
+        return super().media + household_widget.media + forms.Media(js=["receipts/admin/household_filter.js"])
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        # Each branch is index-backed: the search_vector GIN index, the unique household code, the pk.
+        match = receipt_text_match(search_term) | Q(
+            household_id__in=HouseholdSession.objects.filter(code=search_term.upper()).values("id")
+        )
+        if search_term.isdigit():
+            match |= Q(pk=int(search_term))
+        return queryset.filter(match), False
+
+    def save_model(self, request, obj, form, change):
+        previous_household_id, previous_date = None, None
+        if change:
+            previous_household_id, previous_date = (
+                Receipt.objects.filter(pk=obj.pk).values_list("household_id", "expense_date").first() or (None, None)
+            )
+        with transaction.atomic():
+            if not change or {"vendor", "household"} & set(form.changed_data):
+                obj.vendor_key = resolve_vendor_key(obj.household_id, obj.vendor)
+            super().save_model(request, obj, form, change)
+            if previous_household_id and previous_household_id != obj.household_id:
+                _record_receipt_write(previous_household_id, [previous_date], deleted_ids=[obj.pk])
+            _record_receipt_write(obj.household_id, [previous_date, obj.expense_date], changed_ids=[obj.pk])
+
+    def delete_model(self, request, obj):
+        receipt_id = obj.pk
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            _record_receipt_write(obj.household_id, [obj.expense_date], deleted_ids=[receipt_id])
+
+    def delete_queryset(self, request, queryset):
+        touched = {}
+        receipts = queryset.filter(household__isnull=False).values_list("id", "household_id", "expense_date")
+        for receipt_id, household_id, expense_date in receipts:
+            dates, receipt_ids = touched.setdefault(household_id, ([], []))
+            dates.append(expense_date)
+            receipt_ids.append(receipt_id)
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            for household_id, (expense_dates, receipt_ids) in touched.items():
+                _record_receipt_write(household_id, expense_dates, deleted_ids=receipt_ids)
@@ -0,0 +1,78 @@
+import mimetypes
+import os
+import posixpath
+import zipfile
+from typing import NamedTuple
+
+MAX_ARCHIVE_ENTRIES = int(os.getenv("MAX_ARCHIVE_ENTRIES", "500"))
+RECEIPT_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp", ".tif", ".tiff", ".heic", ".heif"}
+
+
+class ReceiptArchiveError(Exception):
+    pass
+
+
+class ArchiveEntry(NamedTuple):
+    index: int
+    filename: str
+    mime_type: str
+    data: bytes | None
+    failure: dict | None
+
+
+def _is_archive_noise(info: zipfile.ZipInfo) -> bool:
+    if info.is_dir():
+        return True
+    parts = info.filename.split("/")
+    return parts[0] == "__MACOSX" or posixpath.basename(info.filename).startswith(".")
+
+
+class ReceiptArchive:
+    """Read receipt images out of a ZIP upload one entry at a time.
+
+    Only the central directory is loaded up front; each entry is decompressed when
+    ``iter_entries`` reaches it, so memory stays bounded by a single image.
+    """
+
+    def __init__(self, fileobj, *, max_entry_bytes: int, max_entries: int = MAX_ARCHIVE_ENTRIES):
+        try:
+            self._zip = zipfile.ZipFile(fileobj)
+        except (zipfile.BadZipFile, OSError) as exc:
+            raise ReceiptArchiveError("Upload a valid ZIP archive.") from exc
+
+        self._max_entry_bytes = max_entry_bytes
+        self.entries = [info for info in self._zip.infolist() if not _is_archive_noise(info)]
+        if not self.entries:
+            raise ReceiptArchiveError("The archive does not contain any receipt images.")
+        if len(self.entries) > max_entries:
+            raise ReceiptArchiveError(f"The archive has {len(self.entries)} files. Import at most {max_entries} at a time.")
+
+    def _read(self, info: zipfile.ZipInfo) -> tuple[bytes | None, str | None]:
+        extension = posixpath.splitext(info.filename)[1].lower()
+        if extension not in RECEIPT_IMAGE_EXTENSIONS:
+            return None, "Unsupported file type. Only receipt images can be imported."
+        if info.file_size > self._max_entry_bytes:
+            return None, "Image file is too large. Please upload a smaller ticket image."
+
+        try:
+            with self._zip.open(info) as entry_file:
+                # Never trust the declared size: stop reading one byte past the limit.
+                data = entry_file.read(self._max_entry_bytes + 1)
+        except (zipfile.BadZipFile, RuntimeError, NotImplementedError, OSError, EOFError):
+            return None, "Could not read this file from the archive."
+
+        if len(data) > self._max_entry_bytes:
+            return None, "Image file is too large. Please upload a smaller ticket image."
+        return data, None
+
+    def iter_entries(self):
+        for index, info in enumerate(self.entries, start=1):
+            data, failure_detail = self._read(info)
+            mime_type = mimetypes.guess_type(info.filename)[0] or "image/jpeg"
+            yield ArchiveEntry(
+                index=index,
+                filename=info.filename,
+                mime_type=mime_type,
+                data=data,
+                failure={"filename": info.filename, "detail": failure_detail} if failure_detail else None,
+            )
@@ -0,0 +1,321 @@
+import asyncio
+import os
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from .changes import astamp_receipt_changes
+from .events import (
+    EVENT_ANALYSIS_PROGRESS,
+    EVENT_RECEIPT_CREATED,
+    EVENT_STREAM_READY,
+    apublish_household_event,
+    encode_event,
+    format_sse,
+    listen_household_events,
+    poll_household_events,
+    supports_listen_notify,
+)
+from .models import HouseholdSession, Receipt
+from .notifications import latest_notifications, notification_summaries
+from .serializers import (
+    BulkReceiptAnalyzeResponseSerializer,
+    DashboardSerializer,
+    ReceiptAnalysisSerializer,
+    ReceiptBulkUploadSerializer,
+    ReceiptFieldsQuerySerializer,
+    ReceiptRecordSerializer,
+    ReceiptUploadSerializer,
+    receipt_record_rows,
+)
+from .services import ReceiptAnalysisError, analyze_receipt_image_async
+from .vendors import aresolve_vendor_key
+from .views import (
+    EVENT_STREAM_UNAVAILABLE,
+    MAX_ANALYZE_UPLOAD_BYTES,
+    READ_CACHE_SECONDS,
+    _analyzed_receipt_fields,
+    _current_month_rows,
+    _build_dashboard_payload,
+    _dashboard_currency_querysets,
+    _dashboard_querysets,
+    _dashboard_sums,
+    _etag_matches,
+    _event_ticket_claims,
+    _served_over_asgi,
+    _has_unsettled_current_month,
+    _read_etag,
+    _request_session_token,
+    _session_token_claims,
+    _valid_user_codes,
+)
+
+ASYNC_BULK_ANALYZE_CONCURRENCY = int(os.getenv("ASYNC_BULK_ANALYZE_CONCURRENCY", "4"))
+
+
+def _unauthorized():
+    return JsonResponse({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+
+async def _asession_context(request):
+    user_code = await request.session.aget("user_code")
+    household_id = await request.session.aget("household_id")
+
+    if user_code in _valid_user_codes() and household_id:
+        household = await HouseholdSession.objects.filter(id=household_id).afirst()
+        if household:
+            return household, user_code
+
+    household_id, user_code = _session_token_claims(_request_session_token(request))
+    if not household_id:
+        return None, None
+    household = await HouseholdSession.objects.filter(id=household_id).afirst()
+    if not household:
+        return None, None
+    return household, user_code
+
+
+async def _alatest_notifications_by_user(household: HouseholdSession):
+    return notification_summaries(household, [record async for record in latest_notifications(household)])
+
+
+@csrf_exempt
+@require_POST
+async def receipt_analyze_async(request):
+    household, user_code = await _asession_context(request)
+    if not household or not user_code:
+        return _unauthorized()
+
+    upload_serializer = ReceiptUploadSerializer(data={"image": request.FILES.get("image")})
+    if not upload_serializer.is_valid():
+        return JsonResponse(upload_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    image = upload_serializer.validated_data["image"]
+    if getattr(image, "size", 0) and image.size > MAX_ANALYZE_UPLOAD_BYTES:
+        return JsonResponse(
+            {"detail": "Image file is too large. Please upload a smaller ticket image."},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+    image_bytes = image.read()
+    mime_type = image.content_type or "image/jpeg"
+
+    try:
+        analysis = await analyze_receipt_image_async(image_bytes=image_bytes, mime_type=mime_type)
+    except ReceiptAnalysisError as exc:
+        return JsonResponse({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception:
+        return JsonResponse(
+            {"detail": "Receipt analysis service failed unexpectedly. Please try again."},
+            status=status.HTTP_502_BAD_GATEWAY,
+        )
+
+    output_serializer = ReceiptAnalysisSerializer(data=analysis)
+    if not output_serializer.is_valid():
+        return JsonResponse(output_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    image.seek(0)
+
+    fields = _analyzed_receipt_fields(household, user_code, image, output_serializer.validated_data)
+    receipt = await Receipt.objects.acreate(**fields, vendor_key=await aresolve_vendor_key(household.id, fields["vendor"]))
+    version = await household.abump_data_version()
+    await astamp_receipt_changes(household.id, version, [receipt.id])
+    await apublish_household_event(household.id, EVENT_RECEIPT_CREATED, version, [receipt.id], user=user_code)
+    return JsonResponse({"receipt": ReceiptRecordSerializer(receipt).data}, status=status.HTTP_201_CREATED)
+
+
+async def _analyze_bulk_image(client, semaphore, image, index: int, total: int):
+    filename = getattr(image, "name", f"receipt-{index}")
+    if getattr(image, "size", 0) and image.size > MAX_ANALYZE_UPLOAD_BYTES:
+        return None, {"filename": filename, "detail": "Image file is too large. Please upload a smaller ticket image."}
+
+    image_bytes = image.read()
+    mime_type = image.content_type or "image/jpeg"
+    try:
+        async with semaphore:
+            analysis = await analyze_receipt_image_async(
+                image_bytes=image_bytes,
+                mime_type=mime_type,
+                bulk_index=index,
+                bulk_total=total,
+                client=client,
+            )
+        output_serializer = ReceiptAnalysisSerializer(data=analysis)
+        output_serializer.is_valid(raise_exception=True)
+    except (ReceiptAnalysisError, ValidationError, ValueError, TypeError) as exc:
+        return None, {"filename": filename, "detail": str(exc)}
+    except Exception:
+        return None, {"filename": filename, "detail": "Unexpected analysis service error."}
+    return output_serializer.validated_data, None
+
+
+async def _analyze_bulk_image_with_progress(household, user_code: str, client, semaphore, image, index: int, total: int):
+    parsed_analysis, failure = await _analyze_bulk_image(client, semaphore, image, index, total)
+    await apublish_household_event(
+        household.id,
+        EVENT_ANALYSIS_PROGRESS,
+        user=user_code,
+        index=index,
+        total=total,
+        failed=failure is not None,
+    )
+    return parsed_analysis, failure
+
+
+@csrf_exempt
+@require_POST
+async def receipt_bulk_analyze_async(request):
+    household, user_code = await _asession_context(request)
+    if not household or not user_code:
+        return _unauthorized()
+
+    upload_serializer = ReceiptBulkUploadSerializer(data={"images": request.FILES.getlist("images")})
+    if not upload_serializer.is_valid():
+        return JsonResponse(upload_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    validated_images = upload_serializer.validated_data["images"]
+    total_images = len(validated_images)
+
+    # Images are analyzed concurrently; receipts are still created in upload order.
+    semaphore = asyncio.Semaphore(ASYNC_BULK_ANALYZE_CONCURRENCY)
+    async with httpx.AsyncClient(timeout=60) as client:
+        results = await asyncio.gather(
+            *(
+                _analyze_bulk_image_with_progress(household, user_code, client, semaphore, image, index, total_images)
+                for index, image in enumerate(validated_images, start=1)
+            )
+        )
+
+    created_receipts = []
+    failed = []
+    for image, (parsed_analysis, failure) in zip(validated_images, results):
+        if failure:
+            failed.append(failure)
+            continue
+        image.seek(0)
+        fields = _analyzed_receipt_fields(household, user_code, image, parsed_analysis)
+        receipt = await Receipt.objects.acreate(**fields, vendor_key=await aresolve_vendor_key(household.id, fields["vendor"]))
+        created_receipts.append(receipt)
+
+    if created_receipts:
+        created_ids = [receipt.id for receipt in created_receipts]
+        version = await household.abump_data_version()
+        await astamp_receipt_changes(household.id, version, created_ids)
+        await apublish_household_event(household.id, EVENT_RECEIPT_CREATED, version, created_ids, user=user_code)
+
+    if not created_receipts:
+        return JsonResponse(
+            {"detail": "No receipts were analyzed successfully.", "failed": failed},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    payload = {
+        "receipts": created_receipts,
+        "processed_count": len(created_receipts),
+        "failed_count": len(failed),
+        "failed": failed,
+    }
+    serializer = BulkReceiptAnalyzeResponseSerializer(payload)
+    return JsonResponse(serializer.data, status=status.HTTP_201_CREATED)
+
+
+async def _adashboard_data(household: HouseholdSession, user_code: str, today, receipt_fields=None):
+    window_qs, last_month_qs, recent_qs = _dashboard_querysets(household, today)
+    sums = _dashboard_sums(
+        [row async for row in _current_month_rows(household, today)],
+        [row async for row in last_month_qs],
+    )
+    currency = None
+    for currency_qs in _dashboard_currency_querysets(window_qs):
+        currency = await currency_qs.afirst()
+        if currency:
+            break
+    # Selected fields are rendered from ``values_list`` below, as the sync dashboard does.
+    recent_receipts = [receipt async for receipt in recent_qs] if receipt_fields is None else []
+    latest_notifications = None
+    if not _has_unsettled_current_month(sums):
+        latest_notifications = await _alatest_notifications_by_user(household)
+
+    payload = _build_dashboard_payload(
+        household,
+        user_code,
+        today,
+        sums,
+        currency,
+        recent_receipts,
+        latest_notifications,
+    )
+    data = DashboardSerializer(payload).data
+    if receipt_fields is not None:
+        data["recent_receipts"] = await sync_to_async(receipt_record_rows)(recent_qs, household, receipt_fields)
+    return data
+
+
+@require_GET
+async def receipt_dashboard_async(request):
+    household, user_code = await _asession_context(request)
+    if not household or not user_code:
+        return _unauthorized()
+
+    query_serializer = ReceiptFieldsQuerySerializer(data=request.GET)
+    if not query_serializer.is_valid():
+        return JsonResponse(query_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    fields = query_serializer.validated_data["receipt_fields"]
+    today = timezone.localdate()
+    etag = _read_etag(household, "dashboard-async", user_code, today, fields)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return HttpResponseNotModified(headers=headers)
+
+    cache_key = f"receipts:read:{etag}"
+    body = await cache.aget(cache_key) if READ_CACHE_SECONDS > 0 else None
+    if body is None:
+        body = JsonResponse(await _adashboard_data(household, user_code, today, fields)).content
+        if READ_CACHE_SECONDS > 0:
+            await cache.aset(cache_key, body, READ_CACHE_SECONDS)
+    return HttpResponse(body, content_type="application/json", status=status.HTTP_200_OK, headers=headers)
+
+
+async def _aevent_stream_context(request):
+    # Only stream tickets are accepted: they sit in the URL, so they must be short-lived and scoped.
+    household_id, user_code = _event_ticket_claims(request.GET.get("ticket", "").strip())
+    if not household_id:
+        return None, None
+    household = await HouseholdSession.objects.filter(id=household_id).afirst()
+    return (household, user_code) if household else (None, None)
+
+
+async def _sse_messages(version: int, events):
+    yield b"retry: 3000\n\n" + format_sse(encode_event(EVENT_STREAM_READY, version))
+    async for payload in events:
+        # ``None`` marks a quiet interval; a comment line keeps proxies from timing the stream out.
+        yield b": keepalive\n\n" if payload is None else format_sse(payload)
+
+
+@require_GET
+async def receipt_events_stream(request):
+    """Server-sent events for the session's household: receipt, analysis and settlement changes.
+
+    Backed by ``LISTEN/NOTIFY`` on Postgres. Other databases fall back to polling the household
+    data version and sending ``household.changed``.
+    """
+    if not _served_over_asgi(request):
+        # Django would run the endless generator to completion on a worker thread and send nothing.
+        return JsonResponse({"detail": EVENT_STREAM_UNAVAILABLE}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    household, _ = await _aevent_stream_context(request)
+    if not household:
+        return _unauthorized()
+
+    if supports_listen_notify():
+        events = listen_household_events(household.id, household.data_version)
+    else:
+        events = poll_household_events(household.id, household.data_version)
+    response = StreamingHttpResponse(_sse_messages(household.data_version, events), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
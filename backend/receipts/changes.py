@@ -0,0 +1,43 @@
+from django.utils import timezone
+
+from .models import HouseholdSession, Receipt, ReceiptTombstone
+
+
+def stamp_receipt_changes(household_id: int, version: int, changed_ids=(), deleted_ids=()):
+    """Tag receipts written under ``version`` and record tombstones for the ones that left the household.
+
+    Call inside the write's transaction, after the household data version was bumped to ``version``.
+    """
+    if changed_ids:
+        Receipt.objects.filter(household_id=household_id, id__in=changed_ids).update(
+            change_version=version,
+            updated_at=timezone.now(),
+        )
+    if deleted_ids:
+        ReceiptTombstone.objects.bulk_create(
+            ReceiptTombstone(household_id=household_id, receipt_id=receipt_id, change_version=version)
+            for receipt_id in deleted_ids
+        )
+
+
+async def astamp_receipt_changes(household_id: int, version: int, changed_ids=()):
+    if changed_ids:
+        await Receipt.objects.filter(household_id=household_id, id__in=changed_ids).aupdate(
+            change_version=version,
+            updated_at=timezone.now(),
+        )
+
+
+def receipt_changes(household: HouseholdSession, since: int | None, until: int):
+    """Receipts and tombstones written in ``(since, until]``; without ``since``, every live receipt.
+
+    ``until`` is the household data version read before these queries, so a write that commits
+    while they run is left for the next sync instead of being skipped.
+    """
+    receipts = household.receipts.filter(change_version__lte=until)
+    if since is None:
+        return receipts, []
+
+    tombstones = household.receipt_tombstones.filter(change_version__gt=since, change_version__lte=until)
+    deleted_ids = list(tombstones.values_list("receipt_id", flat=True).distinct())
+    return receipts.filter(change_version__gt=since), deleted_ids
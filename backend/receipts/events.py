@@ -0,0 +1,250 @@
+"""Household change events, fanned out to the SSE stream through Postgres ``LISTEN/NOTIFY``.
+
+Events are compact hints (``type``, ``version``, affected ``ids``), not full records. Clients
+patch what they can and fetch the rest from ``/changes/?since=``. ``version`` is the household
+data version the write bumped to, so a gap tells the client it missed something.
+
+Every household publishes on one channel. Each process holds a single ``LISTEN`` connection
+(``HouseholdEventHub``) and routes notifications to its streams' in-process queues, so open
+streams do not count against the database's ``max_connections``.
+"""
+
+import asyncio
+import json
+import os
+
+import psycopg
+from asgiref.sync import sync_to_async
+from django.db import connection, connections
+from psycopg.conninfo import make_conninfo
+
+from .models import HouseholdSession
+
+EVENT_RECEIPT_CREATED = "receipt.created"
+EVENT_RECEIPT_UPDATED = "receipt.updated"
+EVENT_RECEIPT_DELETED = "receipt.deleted"
+EVENT_ANALYSIS_PROGRESS = "analysis.progress"
+EVENT_HOUSEHOLD_SETTLED = "household.settled"
+EVENT_NOTIFICATIONS_READ = "notifications.read"
+# First message on every stream; carries the version the client should sync up to.
+EVENT_STREAM_READY = "stream.ready"
+# Sent instead of specific events when the stream cannot say what changed (polling fallback).
+EVENT_HOUSEHOLD_CHANGED = "household.changed"
+
+EVENT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+EVENT_STREAM_POLL_SECONDS = float(os.getenv("EVENT_STREAM_POLL_SECONDS", "2"))
+# NOTIFY payloads must stay under 8000 bytes; past this many ids the event only carries the version.
+MAX_EVENT_IDS = 200
+EVENT_CHANNEL = "receipts_household_events"
+# Events buffered per stream; a stream that falls further behind is told to resync instead.
+EVENT_SUBSCRIBER_QUEUE_SIZE = 100
+EVENT_LISTEN_RECONNECT_SECONDS = 1.0
+
+# libpq settings copied from DATABASES["default"]["OPTIONS"] onto the LISTEN connection.
+_LISTEN_CONNECTION_OPTIONS = ("sslmode", "sslrootcert", "sslcert", "sslkey", "connect_timeout", "options")
+
+
+def supports_listen_notify(alias: str = "default") -> bool:
+    return connections[alias].vendor == "postgresql"
+
+
+def encode_event(event_type: str, version: int | None = None, ids=None, **data) -> str:
+    event = {"type": event_type, "version": version}
+    if ids is not None:
+        ids = list(ids)
+        event["ids"] = ids if len(ids) <= MAX_EVENT_IDS else None
+    event.update(data)
+    return json.dumps(event, separators=(",", ":"), default=str)
+
+
+def publish_household_event(household_id: int, event_type: str, version: int | None = None, ids=None, **data):
+    """``NOTIFY`` the event channel for the household; a no-op off Postgres.
+
+    NOTIFY is transactional, so an event sent inside a write's transaction is delivered on
+    commit and dropped on rollback. The payload is ``"<household_id>:<event>"``.
+    """
+    if not household_id or not supports_listen_notify():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, %s)",
+            [EVENT_CHANNEL, f"{int(household_id)}:{encode_event(event_type, version, ids, **data)}"],
+        )
+
+
+async def apublish_household_event(household_id: int, event_type: str, version: int | None = None, ids=None, **data):
+    await sync_to_async(publish_household_event)(household_id, event_type, version, ids, **data)
+
+
+def format_sse(data: str) -> bytes:
+    """One unnamed SSE message; the event type travels inside the JSON ``data``."""
+    return ("\n".join(f"data: {line}" for line in data.splitlines() or [""]) + "\n\n").encode()
+
+
+def _listen_conninfo() -> str:
+    settings_dict = connections["default"].settings_dict
+    params = {
+        "dbname": settings_dict.get("NAME"),
+        "user": settings_dict.get("USER"),
+        "password": settings_dict.get("PASSWORD"),
+        "host": settings_dict.get("HOST"),
+        "port": settings_dict.get("PORT"),
+    }
+    options = settings_dict.get("OPTIONS") or {}
+    params.update({key: options[key] for key in _LISTEN_CONNECTION_OPTIONS if key in options})
+    return make_conninfo(**{key: str(value) for key, value in params.items() if value})
+
+
+# Queued in place of an event when a stream must re-check the data version: the hub (re)connected,
+# or the stream's queue overflowed.
+_RESYNC = object()
+
+
+class HouseholdEventHub:
+    """One ``LISTEN`` connection per process, fanned out to per-stream ``asyncio.Queue``s.
+
+    The connection opens with the first subscriber and closes after a heartbeat interval with
+    none. If it drops, the hub reconnects and tells every stream to resync.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._listening = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def listening(self) -> bool:
+        return self._listening.is_set()
+
+    def subscribe(self, household_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=EVENT_SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(household_id, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, household_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(household_id, set())
+        queues.discard(queue)
+        if not queues:
+            self._subscribers.pop(household_id, None)
+
+    async def aclose(self):
+        task, self._task = self._task, None
+        self._listening.clear()
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _put(self, queue: asyncio.Queue, item):
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_RESYNC)
+
+    def _dispatch(self, payload: str):
+        household_id, _, event = payload.partition(":")
+        if not household_id.isdigit():
+            return
+        for queue in list(self._subscribers.get(int(household_id), ())):
+            self._put(queue, event)
+
+    def _resync_all(self):
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._put(queue, _RESYNC)
+
+    async def _listen(self):
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(_listen_conninfo(), autocommit=True) as listen_connection:
+                    await listen_connection.execute(f"LISTEN {EVENT_CHANNEL}")
+                    self._listening.set()
+                    # Writes that committed before LISTEN took effect are only visible as a version bump.
+                    self._resync_all()
+                    while self._subscribers:
+                        async for notify in listen_connection.notifies(timeout=EVENT_STREAM_HEARTBEAT_SECONDS):
+                            self._dispatch(notify.payload)
+                    # Idle: step aside before closing, so a new subscriber starts a fresh listener.
+                    self._task = None
+                    self._listening.clear()
+                    return
+            except (psycopg.OperationalError, psycopg.InterfaceError):
+                self._listening.clear()
+                if not self._subscribers:
+                    self._task = None
+                    return
+                await asyncio.sleep(EVENT_LISTEN_RECONNECT_SECONDS)
+
+
+_hub: HouseholdEventHub | None = None
+
+
+def household_event_hub() -> HouseholdEventHub:
+    """The hub for the running event loop (one per worker process under uvicorn)."""
+    global _hub
+    if _hub is None or _hub.loop is not asyncio.get_running_loop():
+        _hub = HouseholdEventHub()
+    return _hub
+
+
+async def _adata_version(household_id: int):
+    return await HouseholdSession.objects.filter(id=household_id).values_list("data_version", flat=True).afirst()
+
+
+async def listen_household_events(household_id: int, version: int):
+    """Yield raw event payloads for one household, and ``None`` after each quiet heartbeat interval.
+
+    Subscribes to the process-wide ``HouseholdEventHub``. Whenever the hub cannot vouch for the
+    events in between (stream start, reconnect, overflow), the data version is re-read and a bump
+    is reported as one ``household.changed``.
+    """
+    hub = household_event_hub()
+    queue = hub.subscribe(household_id)
+    try:
+        if hub.listening:
+            queue.put_nowait(_RESYNC)
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), EVENT_STREAM_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield None
+                continue
+            if payload is not _RESYNC:
+                version = json.loads(payload).get("version") or version
+                yield payload
+                continue
+            latest = await _adata_version(household_id)
+            if latest is not None and latest != version:
+                version = latest
+                yield encode_event(EVENT_HOUSEHOLD_CHANGED, version)
+    finally:
+        hub.unsubscribe(household_id, queue)
+
+
+async def poll_household_events(household_id: int, version: int):
+    """Fallback for databases without ``LISTEN/NOTIFY``: watch the data version and report bumps.
+
+    Yields ``None`` when a heartbeat interval passes without a change.
+    """
+    quiet_seconds = 0.0
+    while True:
+        await asyncio.sleep(EVENT_STREAM_POLL_SECONDS)
+        latest = (
+            await HouseholdSession.objects.filter(id=household_id).values_list("data_version", flat=True).afirst()
+        )
+        if latest is not None and latest != version:
+            version = latest
+            quiet_seconds = 0.0
+            yield encode_event(EVENT_HOUSEHOLD_CHANGED, version)
+            continue
+        quiet_seconds += EVENT_STREAM_POLL_SECONDS
+        if quiet_seconds >= EVENT_STREAM_HEARTBEAT_SECONDS:
+            quiet_seconds = 0.0
+            yield None
@@ -0,0 +1,217 @@
+import asyncio
+import os
+import re
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import ModelCallGovernorState, ModelCallLease
+
+OPENAI_GOVERNOR_KEY = "openai"
+DEFAULT_OPENAI_MAX_IN_FLIGHT = 4
+DEFAULT_OPENAI_MAX_REQUESTS_PER_MINUTE = 60
+DEFAULT_OPENAI_GOVERNOR_MAX_WAIT_SECONDS = 30
+DEFAULT_OPENAI_GOVERNOR_POLL_SECONDS = 0.25
+DEFAULT_OPENAI_GOVERNOR_LEASE_SECONDS = 90
+DEFAULT_RATE_LIMIT_BACKOFF_SECONDS = 1.0
+RATE_LIMIT_WINDOW = timedelta(minutes=1)
+_DURATION_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+class ModelCallGovernorTimeout(Exception):
+    pass
+
+
+def _governor_enabled() -> bool:
+    return os.getenv("OPENAI_GOVERNOR_ENABLED", "True").lower() == "true"
+
+
+def _max_in_flight() -> int:
+    return int(os.getenv("OPENAI_MAX_IN_FLIGHT", str(DEFAULT_OPENAI_MAX_IN_FLIGHT)))
+
+
+def _max_requests_per_minute() -> int:
+    return int(os.getenv("OPENAI_MAX_REQUESTS_PER_MINUTE", str(DEFAULT_OPENAI_MAX_REQUESTS_PER_MINUTE)))
+
+
+def _max_wait_seconds() -> float:
+    return float(os.getenv("OPENAI_GOVERNOR_MAX_WAIT_SECONDS", str(DEFAULT_OPENAI_GOVERNOR_MAX_WAIT_SECONDS)))
+
+
+def _poll_seconds() -> float:
+    return float(os.getenv("OPENAI_GOVERNOR_POLL_SECONDS", str(DEFAULT_OPENAI_GOVERNOR_POLL_SECONDS)))
+
+
+def _lease_seconds() -> float:
+    return float(os.getenv("OPENAI_GOVERNOR_LEASE_SECONDS", str(DEFAULT_OPENAI_GOVERNOR_LEASE_SECONDS)))
+
+
+def parse_rate_limit_duration(value) -> float | None:
+    """Parse OpenAI reset headers such as ``"20ms"``, ``"1s"`` or ``"6m0s"`` into seconds."""
+    if value in (None, ""):
+        return None
+    raw = str(value).strip().lower()
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART_PATTERN.findall(raw)
+    if not parts or "".join(number + unit for number, unit in parts) != raw:
+        return None
+
+    multipliers = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    return sum(float(number) * multipliers[unit] for number, unit in parts)
+
+
+def _parse_remaining(value) -> int | None:
+    if value in (None, ""):
+        return None
+    try:
+        return int(float(str(value).strip()))
+    except ValueError:
+        return None
+
+
+def _state_for_update(key: str) -> ModelCallGovernorState:
+    # The row lock serializes every worker process on the same governor key
+    # for the duration of the surrounding transaction.
+    try:
+        ModelCallGovernorState.objects.get_or_create(key=key)
+    except IntegrityError:
+        pass
+    return ModelCallGovernorState.objects.select_for_update().get(key=key)
+
+
+def _try_acquire(key: str) -> tuple[ModelCallLease | None, float]:
+    now = timezone.now()
+    with transaction.atomic():
+        state = _state_for_update(key)
+        ModelCallLease.objects.filter(key=key, expires_at__lte=now).delete()
+
+        if state.blocked_until and state.blocked_until > now:
+            return None, (state.blocked_until - now).total_seconds()
+
+        if now - state.window_started_at >= RATE_LIMIT_WINDOW:
+            state.window_started_at = now
+            state.window_request_count = 0
+
+        if state.window_request_count >= _max_requests_per_minute():
+            return None, (state.window_started_at + RATE_LIMIT_WINDOW - now).total_seconds()
+
+        in_flight = ModelCallLease.objects.filter(key=key).count()
+        if in_flight >= _max_in_flight():
+            return None, _poll_seconds()
+
+        # The provider's last reported allowance is spent first by the calls still in flight. Once
+        # those would use it up, wait for their responses to report a fresh count; with nothing in
+        # flight, one call goes through so a stale count cannot stall every worker.
+        if state.remaining_requests is not None and 0 < in_flight and state.remaining_requests <= in_flight:
+            return None, _poll_seconds()
+
+        lease = ModelCallLease.objects.create(
+            key=key,
+            expires_at=now + timedelta(seconds=_lease_seconds()),
+        )
+        state.window_request_count += 1
+        state.save(update_fields=["window_started_at", "window_request_count", "updated_at"])
+        return lease, 0.0
+
+
+def acquire_model_call_slot(key: str = OPENAI_GOVERNOR_KEY) -> ModelCallLease:
+    deadline = time.monotonic() + _max_wait_seconds()
+    while True:
+        lease, wait_seconds = _try_acquire(key)
+        if lease is not None:
+            return lease
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ModelCallGovernorTimeout("Timed out waiting for a model call slot.")
+        time.sleep(max(min(wait_seconds, _poll_seconds(), remaining), 0.0))
+
+
+def release_model_call_slot(lease: ModelCallLease):
+    ModelCallLease.objects.filter(id=lease.id).delete()
+
+
+@contextmanager
+def model_call_slot(key: str = OPENAI_GOVERNOR_KEY):
+    if not _governor_enabled():
+        yield None
+        return
+
+    lease = acquire_model_call_slot(key)
+    try:
+        yield lease
+    finally:
+        release_model_call_slot(lease)
+
+
+@asynccontextmanager
+async def async_model_call_slot(key: str = OPENAI_GOVERNOR_KEY):
+    """Async twin of ``model_call_slot`` that waits on the event loop instead of a worker thread."""
+    if not _governor_enabled():
+        yield None
+        return
+
+    deadline = time.monotonic() + _max_wait_seconds()
+    while True:
+        lease, wait_seconds = await sync_to_async(_try_acquire)(key)
+        if lease is not None:
+            break
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ModelCallGovernorTimeout("Timed out waiting for a model call slot.")
+        await asyncio.sleep(max(min(wait_seconds, _poll_seconds(), remaining), 0.0))
+
+    try:
+        yield lease
+    finally:
+        await sync_to_async(release_model_call_slot)(lease)
+
+
+def record_model_call_response(status_code: int, headers, key: str = OPENAI_GOVERNOR_KEY):
+    """Pause the whole cluster when the provider reports an exhausted or exceeded rate limit."""
+    if not _governor_enabled():
+        return
+
+    headers = headers or {}
+    backoff_seconds = None
+
+    for limit_kind in ("requests", "tokens"):
+        remaining = _parse_remaining(headers.get(f"x-ratelimit-remaining-{limit_kind}"))
+        reset_seconds = parse_rate_limit_duration(headers.get(f"x-ratelimit-reset-{limit_kind}"))
+        if remaining is not None and remaining <= 0 and reset_seconds is not None:
+            backoff_seconds = max(backoff_seconds or 0.0, reset_seconds)
+
+    remaining_requests = _parse_remaining(headers.get("x-ratelimit-remaining-requests"))
+
+    if status_code == 429:
+        retry_after = parse_rate_limit_duration(headers.get("retry-after"))
+        backoff_seconds = max(
+            backoff_seconds or 0.0,
+            retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_BACKOFF_SECONDS,
+        )
+
+    if backoff_seconds is None and remaining_requests is None:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        state = _state_for_update(key)
+        update_fields = ["updated_at"]
+        if remaining_requests is not None:
+            state.remaining_requests = remaining_requests
+            update_fields.append("remaining_requests")
+        if backoff_seconds is not None:
+            blocked_until = now + timedelta(seconds=backoff_seconds)
+            if not state.blocked_until or blocked_until > state.blocked_until:
+                state.blocked_until = blocked_until
+                update_fields.append("blocked_until")
+        state.save(update_fields=update_fields)
@@ -0,0 +1,127 @@
+"""Spending insights for one month: top vendors, biggest receipts and category growth.
+
+Everything is read from the rollup tables or a single month of receipts, so the cost does not
+grow with the household's history. Deltas compare against the month before.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from .models import HouseholdSession, Receipt
+from .reports import UNKNOWN_VENDOR_LABEL
+
+INSIGHTS_DEFAULT_LIMIT = 5
+
+
+def _previous_month(month: date) -> date:
+    return (month - timedelta(days=1)).replace(day=1)
+
+
+def _delta(current: Decimal, previous: Decimal):
+    """``(change, growth)``; growth is ``None`` when there was nothing to grow from."""
+    change = current - previous
+    growth = float(change / previous) if previous else None
+    return change, growth
+
+
+def _top_vendors(household: HouseholdSession, month: date, limit: int):
+    top = list(
+        household.vendor_rollups.filter(month=month)
+        .order_by("-total", "vendor_key")
+        .values("vendor_key", "vendor", "total", "receipt_count")[:limit]
+    )
+    previous_totals = dict(
+        household.vendor_rollups.filter(
+            month=_previous_month(month),
+            vendor_key__in=[row["vendor_key"] for row in top],
+        ).values_list("vendor_key", "total")
+    )
+
+    vendors = []
+    for row in top:
+        previous_total = previous_totals.get(row["vendor_key"], Decimal("0.00"))
+        change, growth = _delta(row["total"], previous_total)
+        vendors.append(
+            {
+                "vendor_key": row["vendor_key"],
+                "vendor": row["vendor"] or UNKNOWN_VENDOR_LABEL,
+                "total": row["total"],
+                "receipt_count": row["receipt_count"],
+                "previous_total": previous_total,
+                "change": change,
+                "growth": growth,
+            }
+        )
+    return vendors
+
+
+def _category_growth(household: HouseholdSession, month: date):
+    previous_month = _previous_month(month)
+    totals = {(month, value): Decimal("0.00") for value, _ in Receipt.CATEGORY_CHOICES}
+    totals.update({(previous_month, value): Decimal("0.00") for value, _ in Receipt.CATEGORY_CHOICES})
+    rows = (
+        household.monthly_rollups.filter(month__in=[previous_month, month])
+        .order_by()
+        .values("month", "category")
+        .annotate(category_total=Sum("total"))
+    )
+    for row in rows:
+        key = (row["month"], row["category"])
+        if key in totals:
+            totals[key] += row["category_total"] or Decimal("0.00")
+
+    categories = []
+    for value, label in Receipt.CATEGORY_CHOICES:
+        current_total = totals[(month, value)]
+        previous_total = totals[(previous_month, value)]
+        change, growth = _delta(current_total, previous_total)
+        categories.append(
+            {
+                "category": value,
+                "label": label,
+                "total": current_total,
+                "previous_total": previous_total,
+                "change": change,
+                "growth": growth,
+            }
+        )
+    # Fastest-growing first, by absolute change so small categories do not win on percentages alone.
+    categories.sort(key=lambda category: (-category["change"], category["category"]))
+    return categories
+
+
+def _biggest_receipts(household: HouseholdSession, month: date, limit: int):
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    return (
+        household.receipts.filter(is_saved=True, expense_date__gte=month, expense_date__lt=next_month)
+        .order_by("-effective_total", "-id")
+        .values("id", "vendor", "expense_date", "effective_total", "uploaded_by", "category")[:limit]
+    )
+
+
+def build_insights(household: HouseholdSession, month: date, limit: int = INSIGHTS_DEFAULT_LIMIT):
+    """Insights for the month starting at ``month`` (a first-of-month date), ``limit`` entries per list."""
+    categories = _category_growth(household, month)
+    month_total = sum((category["total"] for category in categories), Decimal("0.00"))
+    previous_total = sum((category["previous_total"] for category in categories), Decimal("0.00"))
+    change, growth = _delta(month_total, previous_total)
+    return {
+        "month": month,
+        "previous_month": _previous_month(month),
+        "total": month_total,
+        "previous_total": previous_total,
+        "change": change,
+        "growth": growth,
+        "top_vendors": _top_vendors(household, month, limit),
+        "biggest_receipts": [
+            {
+                **receipt,
+                "vendor": receipt["vendor"] or UNKNOWN_VENDOR_LABEL,
+                "uploaded_by_name": household.name_for_code(receipt["uploaded_by"]),
+            }
+            for receipt in _biggest_receipts(household, month, limit)
+        ],
+        "category_growth": categories,
+    }
@@ -0,0 +1,132 @@
+"""Receipt split arithmetic in integer minor units (cents).
+
+Same rounding as the Decimal reference in ``receipts.money``: amounts are quantized to the
+cent half-up (ties away from zero), shared items and the uncovered remainder are halved with
+the odd cent going to user 1. ``receipts.tests.test_ledger`` checks the two agree.
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from .money import ASSIGNED_SHARED, CENT, USER_1, USER_2
+
+# Amounts with more integer digits than this take the Decimal path, which keeps quantity *
+# unit_price within the 28 significant digits ``money.item_amount`` multiplies at.
+_MAX_WHOLE_DIGITS = 12
+
+
+def _round_half_up(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return -quotient if numerator < 0 else quotient
+
+
+def _decimal_to_minor(text: str) -> int | None:
+    try:
+        quantized = Decimal(text).quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+    # ``to_decimal`` lets "NaN" through, which no DecimalField column can store anyway.
+    return int(quantized.scaleb(2)) if quantized.is_finite() else None
+
+
+def to_minor(value) -> int | None:
+    """Cents for ``value`` rounded half-up, or ``None`` where ``money.to_decimal`` gives ``None`` or NaN."""
+    if value is None or value == "":
+        return None
+    if type(value) is int:
+        return value * 100
+
+    text = str(value)
+    whole, _, fraction = text.partition(".")
+    negative = whole.startswith("-")
+    if negative:
+        whole = whole[1:]
+    # Plain ASCII decimal literals are parsed here; exponents, whitespace, NaN and huge amounts
+    # go through Decimal so they round exactly as ``money.to_decimal`` does.
+    if not (
+        whole.isascii()
+        and whole.isdigit()
+        and len(whole) <= _MAX_WHOLE_DIGITS
+        and (not fraction or (fraction.isascii() and fraction.isdigit()))
+    ):
+        return _decimal_to_minor(text)
+
+    cents = int(whole) * 100
+    if fraction:
+        cents += int(fraction[:2]) * (10 if len(fraction) == 1 else 1)
+        # Half-up on the third decimal; later digits cannot turn a tie into a non-tie.
+        if len(fraction) > 2 and fraction[2] >= "5":
+            cents += 1
+    return -cents if negative else cents
+
+
+def from_minor(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def item_minor(item) -> int:
+    total_price = to_minor(item.get("total_price"))
+    if total_price is not None:
+        return total_price
+
+    quantity = to_minor(item.get("quantity"))
+    unit_price = to_minor(item.get("unit_price"))
+    if quantity is not None and unit_price is not None:
+        return _round_half_up(quantity * unit_price, 100)
+    return 0
+
+
+def split_half(amount: int) -> tuple[int, int]:
+    half = _round_half_up(amount, 2)
+    return half, amount - half
+
+
+def split_minor(total, subtotal, tax, tip, items) -> tuple[int, int, int]:
+    """``(effective_total, owed_user_1, owed_user_2)`` in cents for one receipt."""
+    amounts = [(item_minor(item), item.get("assigned_to", ASSIGNED_SHARED)) for item in items] if items else ()
+
+    effective_total = to_minor(total)
+    if effective_total is None:
+        items_total = sum(amount for amount, _ in amounts)
+        if items_total > 0:
+            effective_total = items_total
+        else:
+            effective_total = (to_minor(subtotal) or 0) + (to_minor(tax) or 0) + (to_minor(tip) or 0)
+
+    owed_user_1 = 0
+    owed_user_2 = 0
+    covered_by_items = 0
+    for amount, assigned_to in amounts:
+        if amount <= 0:
+            continue
+        covered_by_items += amount
+        if assigned_to == USER_1:
+            owed_user_1 += amount
+        elif assigned_to == USER_2:
+            owed_user_2 += amount
+        else:
+            # ``split_half`` for a positive amount, inlined for the hot loop.
+            half = (amount + 1) // 2
+            owed_user_1 += half
+            owed_user_2 += amount - half
+
+    half_1, half_2 = split_half(effective_total - covered_by_items)
+    return effective_total, owed_user_1 + half_1, owed_user_2 + half_2
+
+
+def split_receipts(rows):
+    """Batch form of ``split_minor`` over ``(total, subtotal, tax, tip, items)`` rows."""
+    return [split_minor(*row) for row in rows]
+
+
+def assign_split_totals(receipts):
+    """Set ``effective_total``/``owed_user_1``/``owed_user_2`` on many unsaved receipts, e.g. before ``bulk_create``."""
+    splits = split_receipts(
+        (receipt.total, receipt.subtotal, receipt.tax, receipt.tip, receipt.items) for receipt in receipts
+    )
+    for receipt, (effective_total, owed_user_1, owed_user_2) in zip(receipts, splits):
+        receipt.effective_total = from_minor(effective_total)
+        receipt.owed_user_1 = from_minor(owed_user_1)
+        receipt.owed_user_2 = from_minor(owed_user_2)
+    return receipts
@@ -0,0 +1,105 @@
+"""``ReceiptLineItem`` rows: the items of saved receipts, projected out of ``Receipt.items``.
+
+``sync_line_items`` rewrites the rows of the receipts a write touched, inside the write's
+transaction, so price history never disagrees with the receipts it was read from.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db.models import Avg, Count, Max, Min, Q, Sum
+
+from .ledger import from_minor, item_minor
+from .models import Receipt, ReceiptLineItem
+from .money import ASSIGNED_SHARED, CENT, to_decimal
+from .vendors import name_key, resolve_vendor_key
+
+SYNC_BATCH_SIZE = 500
+# ``ReceiptLineItem`` amounts have 10 integer digits; larger model output is stored as unknown.
+_MAX_AMOUNT = Decimal("1e10")
+# ``Receipt`` columns the projection reads; ``raw_text`` and the image stay behind.
+LINE_ITEM_SOURCE_FIELDS = ("id", "household", "is_saved", "items", "expense_date", "vendor", "vendor_key")
+
+
+def _bounded(value):
+    return value if value is not None and abs(value) < _MAX_AMOUNT else None
+
+
+def _unit_price(item, quantity, amount):
+    unit_price = to_decimal(item.get("unit_price"))
+    if unit_price is None and quantity and amount:
+        unit_price = (amount / quantity).quantize(CENT, rounding=ROUND_HALF_UP)
+    return unit_price
+
+
+def line_item_values(receipt):
+    """Field values of one receipt's line items; none for drafts or receipts outside a household.
+
+    Reads only plain attributes, so migrations can project their historical receipts with it.
+    """
+    if not receipt.is_saved or not receipt.household_id:
+        return []
+
+    rows = []
+    for position, item in enumerate(receipt.items or []):
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get("name") or "")[:255]
+        quantity = _bounded(to_decimal(item.get("quantity")))
+        amount = _bounded(from_minor(item_minor(item))) or Decimal("0.00")
+        rows.append(
+            {
+                "receipt_id": receipt.id,
+                "household_id": receipt.household_id,
+                "position": position,
+                "name": name,
+                "name_key": name_key(name),
+                "quantity": quantity,
+                "unit_price": _bounded(_unit_price(item, quantity, amount)),
+                "amount": amount,
+                "assigned_to": item.get("assigned_to") or ASSIGNED_SHARED,
+                "expense_date": receipt.expense_date,
+                "vendor": receipt.vendor,
+                "vendor_key": receipt.vendor_key,
+            }
+        )
+    return rows
+
+
+def sync_line_items(receipt_ids):
+    """Rewrite the line items of ``receipt_ids``; deleted receipts lose theirs through the cascade."""
+    receipt_ids = list(receipt_ids)
+    if not receipt_ids:
+        return
+    ReceiptLineItem.objects.filter(receipt_id__in=receipt_ids).delete()
+    receipts = Receipt.objects.filter(id__in=receipt_ids, is_saved=True).only(*LINE_ITEM_SOURCE_FIELDS)
+    rows = [ReceiptLineItem(**values) for receipt in receipts for values in line_item_values(receipt)]
+    ReceiptLineItem.objects.bulk_create(rows, batch_size=SYNC_BATCH_SIZE)
+
+
+def price_history(household, item_name: str, vendor: str | None = None, position=None):
+    """The household's line items named like ``item_name``, newest first, over ``line_item_history_idx``.
+
+    ``position`` is the ``(expense_date, id)`` of the last row already returned.
+    """
+    line_items = household.line_items.filter(name_key=name_key(item_name))
+    if vendor:
+        line_items = line_items.filter(vendor_key=resolve_vendor_key(household.id, vendor, create=False))
+    if position:
+        expense_date, line_item_id = position
+        line_items = line_items.filter(
+            Q(expense_date__lt=expense_date) | Q(expense_date=expense_date, id__lt=line_item_id)
+        )
+    return line_items.order_by("-expense_date", "-id")
+
+
+def price_summary(line_items):
+    """Count and unit price range of ``line_items``, ignoring items without a unit price."""
+    return line_items.order_by().aggregate(
+        purchases=Count("id"),
+        total_spent=Sum("amount"),
+        min_unit_price=Min("unit_price"),
+        max_unit_price=Max("unit_price"),
+        average_unit_price=Avg("unit_price"),
+        first_purchased=Min("expense_date"),
+        last_purchased=Max("expense_date"),
+    )
@@ -0,0 +1,70 @@
+"""Throwaway data and timing helpers shared by the ``bench_*`` management commands."""
+
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from receipts.ledger import assign_split_totals
+from receipts.models import HouseholdSession, Receipt
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back, leaving the database untouched."""
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def create_bench_household(name: str) -> HouseholdSession:
+    household = HouseholdSession(household_name=name, member_1_name="Alex", member_2_name="Jamie")
+    household.set_passcode("0000")
+    household.save()
+    return household
+
+
+def create_bench_receipts(household: HouseholdSession, count: int):
+    today = timezone.localdate()
+    receipts = []
+    for index in range(max(count, 0)):
+        total = Decimal(index % 9000) / 100 + Decimal("1.00")
+        receipts.append(
+            Receipt(
+                household=household,
+                uploaded_by=Receipt.USER_1 if index % 2 else Receipt.USER_2,
+                expense_date=today - timedelta(days=index % 365),
+                vendor=f"Vendor {index % 50}",
+                currency="USD",
+                category=Receipt.CATEGORY_CHOICES[index % len(Receipt.CATEGORY_CHOICES)][0],
+                subtotal=total,
+                tax=Decimal("0.00"),
+                total=total,
+                items=[
+                    {"name": "Item A", "quantity": 1, "unit_price": float(total), "total_price": float(total)},
+                    {"name": "Item B", "quantity": 2, "unit_price": 0.5, "total_price": 1.0, "assigned_to": "user_1"},
+                ],
+                is_saved=True,
+            )
+        )
+    Receipt.objects.bulk_create(assign_split_totals(receipts), batch_size=1000)
+
+
+def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
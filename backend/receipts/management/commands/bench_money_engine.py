@@ -0,0 +1,59 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from receipts.ledger import from_minor, split_receipts
+from receipts.management.bench import median_ms
+from receipts.models import Receipt
+from receipts.money import receipt_split
+
+
+def _bench_rows(count: int, seed: int = 41):
+    """``(total, subtotal, tax, tip, items)`` rows shaped like analyzed receipts (strings, floats, mixed owners)."""
+    rng = random.Random(seed)
+    owners = [Receipt.USER_1, Receipt.USER_2, "shared", "shared"]
+    rows = []
+    for _ in range(count):
+        items = []
+        for _ in range(rng.randrange(1, 9)):
+            unit_price = round(rng.uniform(0.5, 40), 2)
+            quantity = rng.randrange(1, 4)
+            items.append(
+                {
+                    "name": "Item",
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "total_price": f"{unit_price * quantity:.2f}" if rng.random() < 0.8 else None,
+                    "assigned_to": rng.choice(owners),
+                }
+            )
+        subtotal = f"{sum(item['unit_price'] * item['quantity'] for item in items):.2f}"
+        tax = f"{float(subtotal) * 0.0825:.3f}"
+        total = None if rng.random() < 0.3 else f"{float(subtotal) + float(tax):.2f}"
+        rows.append((total, subtotal, tax, "0", items))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Compare the Decimal receipt split with the integer-cent ledger over in-memory receipts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10000,100000", help="Comma-separated receipt counts.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per size; the median is reported.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError as exc:
+            raise CommandError("--sizes must be comma-separated integers.") from exc
+
+        self.stdout.write(f"{'receipts':>9}  {'decimal ms':>10}  {'ledger ms':>10}  {'speedup':>7}")
+        for size in sizes:
+            rows = _bench_rows(size)
+            expected = [receipt_split(*row) for row in rows]
+            if [tuple(map(from_minor, split)) for split in split_receipts(rows)] != expected:
+                raise CommandError(f"Ledger split differs from the Decimal reference at {size} receipts.")
+
+            decimal_ms = median_ms(lambda: [receipt_split(*row) for row in rows], options["repeat"])
+            ledger_ms = median_ms(lambda: split_receipts(rows), options["repeat"])
+            self.stdout.write(f"{size:>9}  {decimal_ms:>10.1f}  {ledger_ms:>10.1f}  {decimal_ms / ledger_ms:>6.1f}x")
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from receipts.management.bench import create_bench_household, create_bench_receipts, median_ms, rolled_back
+from receipts.serializers import ReceiptRecordSerializer, receipt_record_rows
+
+
+class Command(BaseCommand):
+    help = "Compare ReceiptRecordSerializer with the values_list fast path on throwaway receipts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated row counts.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per size; the median is reported.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError as exc:
+            raise CommandError("--sizes must be comma-separated integers.") from exc
+
+        self.stdout.write(f"{'rows':>7}  {'serializer ms':>14}  {'fast path ms':>13}  {'speedup':>8}")
+        with rolled_back():
+            household = create_bench_household("Serialization Bench")
+            created = 0
+            for size in sorted(sizes):
+                create_bench_receipts(household, size - created)
+                created = max(created, size)
+                receipts = household.receipts.order_by("-expense_date", "-uploaded_at", "-id")[:size]
+                self._report(size, receipts, household, options["repeat"])
+
+    def _report(self, size, receipts, household, repeat):
+        renderer = JSONRenderer()
+
+        # Both paths get a fresh queryset each run so neither reuses the other's result cache.
+        def serializer_path():
+            return renderer.render(ReceiptRecordSerializer(receipts.all(), many=True).data)
+
+        def fast_path():
+            return renderer.render(receipt_record_rows(receipts.all(), household))
+
+        if serializer_path() != fast_path():
+            raise CommandError(f"Fast path output differs from ReceiptRecordSerializer at {size} rows.")
+
+        serializer_ms = median_ms(serializer_path, repeat)
+        fast_ms = median_ms(fast_path, repeat)
+        self.stdout.write(f"{size:>7}  {serializer_ms:>14.1f}  {fast_ms:>13.1f}  {serializer_ms / fast_ms:>7.1f}x")
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.text import compress_string
+from rest_framework.renderers import JSONRenderer
+
+from receipts.management.bench import create_bench_household, create_bench_receipts, median_ms, rolled_back
+from receipts.middleware import BROTLI_QUALITY, brotli
+from receipts.renderers import FastJSONRenderer, orjson
+from receipts.rollups import rebuild_rollups
+from receipts.serializers import receipt_record_rows
+from receipts.views import ANALYSES_ORDERING, _expenses_overview_data
+
+
+class Command(BaseCommand):
+    help = "Compare JSON encode time and response size, stock renderer versus orjson and gzip/brotli."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated household receipt counts.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per payload; the median is reported.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError as exc:
+            raise CommandError("--sizes must be comma-separated integers.") from exc
+        if orjson is None:
+            self.stderr.write("orjson is not installed; FastJSONRenderer falls back to the stock encoder.")
+        if brotli is None:
+            self.stderr.write("brotli is not installed; only gzip sizes are reported.")
+
+        self.stdout.write(
+            f"{'payload':<10} {'rows':>7}  {'stock ms':>9}  {'orjson ms':>9}  {'raw KB':>8}  {'gzip KB':>8}  {'br KB':>8}"
+        )
+        with rolled_back():
+            household = create_bench_household("Encoding Bench")
+            created = 0
+            for size in sorted(sizes):
+                create_bench_receipts(household, size - created)
+                created = max(created, size)
+                rebuild_rollups([household.id])
+                receipts = household.receipts.order_by(*ANALYSES_ORDERING)
+                payloads = {
+                    "analyses": {"analyses": receipt_record_rows(receipts, household)},
+                    "expenses": _expenses_overview_data(household, timezone.localdate()),
+                }
+                for name, data in payloads.items():
+                    self._report(name, size, data, options["repeat"])
+
+    def _report(self, name, size, data, repeat):
+        stock = JSONRenderer()
+        fast = FastJSONRenderer()
+        body = stock.render(data)
+        if fast.render(data) != body:
+            raise CommandError(f"FastJSONRenderer output differs from JSONRenderer for {name} at {size} rows.")
+
+        stock_ms = median_ms(lambda: stock.render(data), repeat)
+        fast_ms = median_ms(lambda: fast.render(data), repeat)
+        gzip_kb = len(compress_string(body)) / 1024
+        br_kb = f"{len(brotli.compress(body, quality=BROTLI_QUALITY)) / 1024:>8.1f}" if brotli else f"{'n/a':>8}"
+        self.stdout.write(
+            f"{name:<10} {size:>7}  {stock_ms:>9.2f}  {fast_ms:>9.2f}  {len(body) / 1024:>8.1f}  {gzip_kb:>8.1f}  {br_kb}"
+        )
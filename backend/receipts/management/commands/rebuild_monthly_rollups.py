@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from receipts.models import HouseholdSession
+from receipts.rollups import rebuild_rollups, rollup_drift, vendor_rollup_drift
+
+HOUSEHOLD_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly and vendor rollup rows from saved receipts, or report drift with --verify."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only compare stored rollups with the receipts; exit non-zero when they drift.",
+        )
+        parser.add_argument("--household", help="Limit to one household code.")
+
+    def handle(self, *args, **options):
+        households = HouseholdSession.objects.order_by("id")
+        if options["household"]:
+            households = households.filter(code=options["household"].strip().upper())
+            if not households.exists():
+                raise CommandError(f"Household {options['household']} not found.")
+
+        household_ids = list(households.values_list("id", flat=True))
+        batches = [
+            household_ids[start : start + HOUSEHOLD_BATCH_SIZE]
+            for start in range(0, len(household_ids), HOUSEHOLD_BATCH_SIZE)
+        ]
+
+        if options["verify"]:
+            drift_count = 0
+            for batch in batches:
+                for key, stored, expected in rollup_drift(batch):
+                    drift_count += 1
+                    household_id, month, category, member, is_settled = key
+                    self.stdout.write(
+                        f"household={household_id} month={month:%Y-%m} category={category} member={member} "
+                        f"settled={is_settled} stored={stored} expected={expected}"
+                    )
+                for key, stored, expected in vendor_rollup_drift(batch):
+                    drift_count += 1
+                    household_id, month, vendor_key = key
+                    self.stdout.write(
+                        f"household={household_id} month={month:%Y-%m} vendor={vendor_key!r} "
+                        f"stored={stored} expected={expected}"
+                    )
+            if drift_count:
+                raise CommandError(f"{drift_count} rollup rows drifted from the receipts.")
+            self.stdout.write(self.style.SUCCESS(f"Rollups match receipts for {len(household_ids)} households."))
+            return
+
+        row_count = sum(rebuild_rollups(batch) for batch in batches)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {row_count} rollup rows for {len(household_ids)} households.")
+        )
@@ -0,0 +1,77 @@
+import os
+
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def _negotiate_encoding(header: str) -> str | None:
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    ranked = [(accepted.get(name, wildcard), -index, name) for index, name in enumerate(candidates)]
+    quality, _, name = max(ranked)
+    return name if quality > 0 else None
+
+
+class JSONCompressionMiddleware(MiddlewareMixin):
+    """Compress JSON API responses with the best encoding the client accepts.
+
+    Brotli is used when the ``brotli`` package is installed, gzip otherwise. Responses below
+    ``RESPONSE_COMPRESSION_MIN_BYTES`` and streamed responses (NDJSON progress) are left alone.
+    """
+
+    max_random_bytes = 100
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith("application/json"):
+            return response
+        if len(response.content) < RESPONSE_COMPRESSION_MIN_BYTES:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = _negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding == "br":
+            compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        elif encoding == "gzip":
+            # Random gzip header padding, as in Django's GZipMiddleware, against BREACH.
+            compressed = compress_string(response.content, max_random_bytes=self.max_random_bytes)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,32 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0006_receipt_category"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ModelCallGovernorState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=64, unique=True)),
+                ("window_started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("window_request_count", models.PositiveIntegerField(default=0)),
+                ("remaining_requests", models.IntegerField(blank=True, null=True)),
+                ("blocked_until", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ModelCallLease",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(db_index=True, max_length=64)),
+                ("acquired_at", models.DateTimeField(auto_now_add=True)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
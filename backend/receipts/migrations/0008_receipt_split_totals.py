@@ -0,0 +1,27 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0007_modelcallgovernorstate_modelcalllease"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receipt",
+            name="effective_total",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), editable=False, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name="receipt",
+            name="owed_user_1",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), editable=False, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name="receipt",
+            name="owed_user_2",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), editable=False, max_digits=12),
+        ),
+    ]
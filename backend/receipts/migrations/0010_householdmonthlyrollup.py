@@ -0,0 +1,103 @@
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q, Sum
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+
+
+def build_monthly_rollups(apps, schema_editor):
+    Receipt = apps.get_model("receipts", "Receipt")
+    HouseholdMonthlyRollup = apps.get_model("receipts", "HouseholdMonthlyRollup")
+    rows = (
+        Receipt.objects.filter(is_saved=True, household__isnull=False)
+        .annotate(month=TruncMonth("expense_date"))
+        .order_by()
+        .values(
+            "household_id",
+            "month",
+            "category",
+            "uploaded_by",
+            settled=ExpressionWrapper(Q(settled_at__isnull=False), output_field=BooleanField()),
+        )
+        .annotate(
+            rollup_total=Sum("effective_total"),
+            rollup_owed_user_1=Sum("owed_user_1"),
+            rollup_owed_user_2=Sum("owed_user_2"),
+            rollup_count=Count("id"),
+        )
+    )
+
+    rollups = []
+    for row in rows.iterator():
+        month = row["month"]
+        if isinstance(month, datetime):
+            month = month.date()
+        rollups.append(
+            HouseholdMonthlyRollup(
+                household_id=row["household_id"],
+                month=month,
+                category=row["category"],
+                member=row["uploaded_by"],
+                is_settled=bool(row["settled"]),
+                total=row["rollup_total"] or Decimal("0.00"),
+                owed_user_1=row["rollup_owed_user_1"] or Decimal("0.00"),
+                owed_user_2=row["rollup_owed_user_2"] or Decimal("0.00"),
+                receipt_count=row["rollup_count"],
+            )
+        )
+    HouseholdMonthlyRollup.objects.bulk_create(rollups, batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0009_backfill_receipt_split_totals"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HouseholdMonthlyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField()),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("supermarket", "Supermarket"),
+                            ("bills", "Bills"),
+                            ("taxes", "Taxes"),
+                            ("entertainment", "Entertainment"),
+                            ("other", "Other"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("member", models.CharField(choices=[("user_1", "User 1"), ("user_2", "User 2")], max_length=16)),
+                ("is_settled", models.BooleanField(default=False)),
+                ("total", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14)),
+                ("owed_user_1", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14)),
+                ("owed_user_2", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14)),
+                ("receipt_count", models.PositiveIntegerField(default=0)),
+                (
+                    "household",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to="receipts.householdsession",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["household", "month", "category", "member"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("household", "month", "category", "member", "is_settled"),
+                        name="unique_household_monthly_rollup",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_monthly_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0010_householdmonthlyrollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="householdsession",
+            name="data_version",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0011_householdsession_data_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(fields=["household", "-expense_date", "-uploaded_at", "-id"], name="receipt_history_idx"),
+        ),
+    ]
@@ -0,0 +1,53 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Existing receipts have never been edited as far as we know, so their upload time is the best guess.
+    Receipt = apps.get_model("receipts", "Receipt")
+    Receipt.objects.update(updated_at=models.F("uploaded_at"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0012_receipt_history_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receipt",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="receipt",
+            name="change_version",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(fields=["household", "change_version"], name="receipt_change_idx"),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="ReceiptTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("receipt_id", models.PositiveBigIntegerField()),
+                ("change_version", models.PositiveBigIntegerField()),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "household",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="receipt_tombstones",
+                        to="receipts.householdsession",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["change_version"],
+                "indexes": [models.Index(fields=["household", "change_version"], name="tombstone_change_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def backfill_unread_counters(apps, schema_editor):
+    HouseholdNotification = apps.get_model("receipts", "HouseholdNotification")
+    HouseholdSession = apps.get_model("receipts", "HouseholdSession")
+    counter_fields = {"user_1": "member_1_unread_notifications", "user_2": "member_2_unread_notifications"}
+    unread = (
+        HouseholdNotification.objects.filter(read=False)
+        .values("household_id", "user_code")
+        .annotate(total=models.Count("id"))
+        .order_by()
+    )
+    for row in unread:
+        field = counter_fields.get(row["user_code"])
+        if field:
+            HouseholdSession.objects.filter(id=row["household_id"]).update(**{field: row["total"]})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0013_receipt_changes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="householdsession",
+            name="member_1_unread_notifications",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="householdsession",
+            name="member_2_unread_notifications",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="householdnotification",
+            index=models.Index(fields=["household", "user_code", "-created_at"], name="notification_inbox_idx"),
+        ),
+        migrations.RunPython(backfill_unread_counters, migrations.RunPython.noop),
+    ]
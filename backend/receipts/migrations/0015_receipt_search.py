@@ -0,0 +1,74 @@
+import django.contrib.postgres.search
+from django.db import migrations
+from django.db.models import Max, Min
+
+BATCH_SIZE = 500
+
+# Vendor outranks item names, which outrank the OCR text. The "simple" configuration skips
+# stemming and stop words: receipts mix languages and vendor names are not dictionary words.
+CREATE_SEARCH_VECTOR_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION receipts_receipt_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.vendor, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(jsonb_path_query_array(NEW.items, '$[*].name'), '[]'::jsonb)), 'B')
+            || setweight(to_tsvector('simple', coalesce(NEW.raw_text, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER receipts_receipt_search_vector_update
+        BEFORE INSERT OR UPDATE OF vendor, items, raw_text ON receipts_receipt
+        FOR EACH ROW EXECUTE FUNCTION receipts_receipt_search_vector()
+    """,
+]
+# Fires the trigger once for every existing row in one id range.
+BACKFILL_SEARCH_VECTOR_SQL = "UPDATE receipts_receipt SET vendor = vendor WHERE id >= %s AND id < %s"
+CREATE_SEARCH_INDEX_SQL = "CREATE INDEX receipt_search_idx ON receipts_receipt USING gin (search_vector)"
+
+DROP_SEARCH_VECTOR_SQL = [
+    "DROP INDEX IF EXISTS receipt_search_idx",
+    "DROP TRIGGER IF EXISTS receipts_receipt_search_vector_update ON receipts_receipt",
+    "DROP FUNCTION IF EXISTS receipts_receipt_search_vector()",
+]
+
+
+def create_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for statement in CREATE_SEARCH_VECTOR_SQL:
+        schema_editor.execute(statement, params=None)
+    # Each id range commits on its own, so existing receipts are never all rewritten and locked at once.
+    Receipt = apps.get_model("receipts", "Receipt")
+    bounds = Receipt.objects.aggregate(first_id=Min("id"), last_id=Max("id"))
+    if bounds["first_id"] is not None:
+        for start in range(bounds["first_id"], bounds["last_id"] + 1, BATCH_SIZE):
+            schema_editor.execute(BACKFILL_SEARCH_VECTOR_SQL, params=[start, start + BATCH_SIZE])
+    # Built once over the filled column rather than updated row by row during the backfill.
+    schema_editor.execute(CREATE_SEARCH_INDEX_SQL, params=None)
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in DROP_SEARCH_VECTOR_SQL:
+            schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("receipts", "0014_notification_inbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receipt",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0015_receipt_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="receipt",
+            name="vendor_key",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.CreateModel(
+            name="HouseholdVendorRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField()),
+                ("vendor_key", models.CharField(blank=True, max_length=255)),
+                ("vendor", models.CharField(blank=True, max_length=255)),
+                ("total", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14)),
+                ("receipt_count", models.PositiveIntegerField(default=0)),
+                (
+                    "household",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vendor_rollups",
+                        to="receipts.householdsession",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["household", "month", "-total"],
+                "indexes": [models.Index(fields=["household", "month", "-total"], name="vendor_rollup_top_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("household", "month", "vendor_key"),
+                        name="unique_household_vendor_rollup",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+from datetime import datetime
+from decimal import Decimal
+import re
+import unicodedata
+
+from django.db import migrations
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncMonth
+
+BATCH_SIZE = 500
+
+# A frozen copy of ``receipts.vendors.vendor_key`` as of this migration.
+_STORE_NUMBER_RE = re.compile(r"(?:#|\bno\.?\s*|\bstore\s+)\d+\b")
+_APOSTROPHE_RE = re.compile(r"['’`]")
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z&]+")
+
+
+def vendor_key(name):
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = _APOSTROPHE_RE.sub("", text)
+    text = _STORE_NUMBER_RE.sub(" ", text)
+    return " ".join(_NON_ALNUM_RE.sub(" ", text).split())[:255]
+
+
+def backfill_vendor_keys(apps, schema_editor):
+    Receipt = apps.get_model("receipts", "Receipt")
+    batch = []
+    for receipt in Receipt.objects.only("id", "vendor").order_by("id").iterator(chunk_size=BATCH_SIZE):
+        receipt.vendor_key = vendor_key(receipt.vendor)
+        batch.append(receipt)
+        if len(batch) >= BATCH_SIZE:
+            Receipt.objects.bulk_update(batch, ["vendor_key"])
+            batch = []
+
+    if batch:
+        Receipt.objects.bulk_update(batch, ["vendor_key"])
+
+
+def build_vendor_rollups(apps, schema_editor):
+    Receipt = apps.get_model("receipts", "Receipt")
+    HouseholdVendorRollup = apps.get_model("receipts", "HouseholdVendorRollup")
+    rows = (
+        Receipt.objects.filter(is_saved=True, household__isnull=False)
+        .annotate(month=TruncMonth("expense_date"))
+        .order_by()
+        .values("household_id", "month", "vendor_key")
+        .annotate(rollup_vendor=Max("vendor"), rollup_total=Sum("effective_total"), rollup_count=Count("id"))
+    )
+
+    rollups = []
+    for row in rows.iterator():
+        month = row["month"]
+        if isinstance(month, datetime):
+            month = month.date()
+        rollups.append(
+            HouseholdVendorRollup(
+                household_id=row["household_id"],
+                month=month,
+                vendor_key=row["vendor_key"],
+                vendor=row["rollup_vendor"] or "",
+                total=row["rollup_total"] or Decimal("0.00"),
+                receipt_count=row["rollup_count"],
+            )
+        )
+    HouseholdVendorRollup.objects.bulk_create(rollups, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+    # Each vendor key batch commits on its own so large tables are not rewritten in one transaction.
+    atomic = False
+
+    dependencies = [
+        ("receipts", "0016_vendor_rollups"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_vendor_keys, migrations.RunPython.noop),
+        migrations.RunPython(build_vendor_rollups, migrations.RunPython.noop),
+    ]
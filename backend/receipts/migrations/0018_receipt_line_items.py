@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0017_backfill_vendor_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReceiptLineItem",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("position", models.PositiveIntegerField()),
+                ("name", models.CharField(blank=True, max_length=255)),
+                ("name_key", models.CharField(blank=True, max_length=255)),
+                ("quantity", models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ("unit_price", models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ("amount", models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=12)),
+                ("assigned_to", models.CharField(max_length=16)),
+                ("expense_date", models.DateField()),
+                ("vendor", models.CharField(blank=True, max_length=255)),
+                ("vendor_key", models.CharField(blank=True, max_length=255)),
+                (
+                    "household",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="line_items",
+                        to="receipts.householdsession",
+                    ),
+                ),
+                (
+                    "receipt",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="line_items",
+                        to="receipts.receipt",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["receipt_id", "position"],
+                "indexes": [
+                    models.Index(fields=["household", "name_key", "-expense_date"], name="line_item_history_idx")
+                ],
+                "constraints": [models.UniqueConstraint(fields=("receipt", "position"), name="unique_receipt_line_item")],
+            },
+        ),
+    ]
@@ -0,0 +1,126 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import re
+import unicodedata
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+_MAX_AMOUNT = Decimal("1e10")
+CENT = Decimal("0.01")
+ASSIGNED_SHARED = "shared"
+
+# Frozen copies of the ``receipts.vendors`` key normalizers and ``receipts.money`` amounts as of
+# this migration, so later changes to them cannot change what it writes.
+_STORE_NUMBER_RE = re.compile(r"(?:#|\bno\.?\s*|\bstore\s+)\d+\b")
+_APOSTROPHE_RE = re.compile(r"['’`]")
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z&]+")
+
+
+def _fold(text):
+    text = unicodedata.normalize("NFKD", text)
+    return _APOSTROPHE_RE.sub("", "".join(char for char in text if not unicodedata.combining(char)).casefold())
+
+
+def _key(text):
+    return " ".join(_NON_ALNUM_RE.sub(" ", text).split())[:255]
+
+
+def name_key(name):
+    return _key(_fold(name)) if name else ""
+
+
+def vendor_key(name):
+    return _key(_STORE_NUMBER_RE.sub(" ", _fold(name))) if name else ""
+
+
+def to_decimal(value):
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+
+
+def item_amount(item):
+    total_price = to_decimal(item.get("total_price"))
+    if total_price is not None:
+        return total_price
+    quantity = to_decimal(item.get("quantity"))
+    unit_price = to_decimal(item.get("unit_price"))
+    if quantity is not None and unit_price is not None:
+        return (quantity * unit_price).quantize(CENT, rounding=ROUND_HALF_UP)
+    return Decimal("0.00")
+
+
+def _bounded(value):
+    return value if value is not None and abs(value) < _MAX_AMOUNT else None
+
+
+def _unit_price(item, quantity, amount):
+    unit_price = to_decimal(item.get("unit_price"))
+    if unit_price is None and quantity and amount:
+        unit_price = (amount / quantity).quantize(CENT, rounding=ROUND_HALF_UP)
+    return unit_price
+
+
+def _line_item_values(receipt):
+    # ``receipts.line_items.line_item_values`` as of this migration; line items carry the
+    # normalized key of the receipt's vendor.
+    rows = []
+    for position, item in enumerate(receipt.items or []):
+        if not isinstance(item, dict):
+            continue
+        name = str(item.get("name") or "")[:255]
+        quantity = _bounded(to_decimal(item.get("quantity")))
+        amount = _bounded(item_amount(item)) or Decimal("0.00")
+        rows.append(
+            {
+                "receipt_id": receipt.id,
+                "household_id": receipt.household_id,
+                "position": position,
+                "name": name,
+                "name_key": name_key(name),
+                "quantity": quantity,
+                "unit_price": _bounded(_unit_price(item, quantity, amount)),
+                "amount": amount,
+                "assigned_to": item.get("assigned_to") or ASSIGNED_SHARED,
+                "expense_date": receipt.expense_date,
+                "vendor": receipt.vendor,
+                "vendor_key": vendor_key(receipt.vendor),
+            }
+        )
+    return rows
+
+
+def backfill_line_items(apps, schema_editor):
+    Receipt = apps.get_model("receipts", "Receipt")
+    ReceiptLineItem = apps.get_model("receipts", "ReceiptLineItem")
+    receipts = (
+        # Receipts that already have rows were projected by an earlier, interrupted run.
+        Receipt.objects.filter(is_saved=True, household__isnull=False, line_items__isnull=True)
+        .only("id", "household", "items", "expense_date", "vendor")
+        .order_by("id")
+    )
+    batch = []
+    for receipt in receipts.iterator(chunk_size=BATCH_SIZE):
+        batch.extend(ReceiptLineItem(**values) for values in _line_item_values(receipt))
+        if len(batch) >= BATCH_SIZE:
+            ReceiptLineItem.objects.bulk_create(batch)
+            batch = []
+
+    if batch:
+        ReceiptLineItem.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own so large tables are not projected in one transaction.
+    atomic = False
+
+    dependencies = [
+        ("receipts", "0018_receipt_line_items"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_line_items, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.db.models import Max
+import django.db.models.deletion
+
+# gin_trgm_ops serves both the ``%`` similarity matching on ingest and the LIKE autocomplete.
+CREATE_VENDOR_TRGM_INDEX_SQL = "CREATE INDEX vendor_key_trgm_idx ON receipts_vendor USING gin (key gin_trgm_ops)"
+DROP_VENDOR_TRGM_INDEX_SQL = "DROP INDEX IF EXISTS vendor_key_trgm_idx"
+
+
+def create_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_VENDOR_TRGM_INDEX_SQL, params=None)
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_VENDOR_TRGM_INDEX_SQL, params=None)
+
+
+def backfill_vendors(apps, schema_editor):
+    # One vendor per existing key; 0023 merges the keys that name the same vendor.
+    Receipt = apps.get_model("receipts", "Receipt")
+    Vendor = apps.get_model("receipts", "Vendor")
+    rows = (
+        Receipt.objects.filter(household__isnull=False)
+        .exclude(vendor_key="")
+        .order_by()
+        .values("household_id", "vendor_key")
+        .annotate(vendor_name=Max("vendor"))
+    )
+    Vendor.objects.bulk_create(
+        (
+            Vendor(household_id=row["household_id"], key=row["vendor_key"], name=row["vendor_name"].strip()[:255])
+            for row in rows.iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0019_backfill_receipt_line_items"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name="Vendor",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=255)),
+                ("name", models.CharField(max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "household",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vendors",
+                        to="receipts.householdsession",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["household", "key"],
+                "constraints": [models.UniqueConstraint(fields=("household", "key"), name="unique_household_vendor")],
+            },
+        ),
+        migrations.RunPython(create_trgm_index, drop_trgm_index),
+        migrations.RunPython(backfill_vendors, migrations.RunPython.noop),
+    ]
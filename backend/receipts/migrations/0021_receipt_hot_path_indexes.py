@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0020_vendor"),
+    ]
+
+    operations = [
+        # The partial indexes below replace these: a boolean or a mostly-null column alone selects
+        # most of the table, and Postgres rarely combines them with the household and date indexes.
+        migrations.AlterField(
+            model_name="receipt",
+            name="is_saved",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name="receipt",
+            name="settled_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                condition=models.Q(("is_saved", True)),
+                fields=["household", "expense_date"],
+                name="receipt_saved_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                condition=models.Q(("is_saved", True), ("settled_at__isnull", True)),
+                fields=["household", "expense_date"],
+                name="receipt_open_date_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0021_receipt_hot_path_indexes"),
+    ]
+
+    operations = [
+        # Open receipts are read in the model's default ordering; carry it in the index so
+        # settling and the open-currency lookup walk it instead of sorting the month.
+        migrations.RemoveIndex(
+            model_name="receipt",
+            name="receipt_open_date_idx",
+        ),
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                condition=models.Q(("is_saved", True), ("settled_at__isnull", True)),
+                fields=["household", "-expense_date", "-uploaded_at"],
+                name="receipt_open_date_idx",
+            ),
+        ),
+    ]
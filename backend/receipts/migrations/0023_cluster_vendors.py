@@ -0,0 +1,117 @@
+from datetime import datetime
+from decimal import Decimal
+from difflib import SequenceMatcher
+
+from django.db import migrations, transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncMonth
+
+BATCH_SIZE = 500
+# Frozen copies of ``receipts.vendors.same_vendor`` and ``closest_vendor`` as of this migration.
+VENDOR_MATCH_SIMILARITY = 0.6
+
+
+def _same_vendor(key, candidate, similarity):
+    if not key or not candidate:
+        return False
+    if similarity >= VENDOR_MATCH_SIMILARITY:
+        return True
+    shorter, longer = sorted((key, candidate), key=len)
+    return longer.startswith(f"{shorter} ") or key.replace(" ", "") == candidate.replace(" ", "")
+
+
+def _closest_vendor(key, candidates):
+    scored = sorted(
+        ((SequenceMatcher(None, key, candidate).ratio(), candidate) for candidate in candidates),
+        reverse=True,
+    )
+    return next((candidate for similarity, candidate in scored if _same_vendor(key, candidate, similarity)), None)
+
+
+def _canonical_keys(keys):
+    # Replays ingest: each key, in the order it was first seen, joins the first vendor it matches.
+    vendors = []
+    canonical = {}
+    for key in keys:
+        match = _closest_vendor(key, vendors)
+        if match is None:
+            vendors.append(key)
+        canonical[key] = match or key
+    return canonical
+
+
+def _household_keys(Receipt, Vendor, household_id):
+    receipt_keys = list(
+        Receipt.objects.filter(household_id=household_id)
+        .exclude(vendor_key="")
+        .order_by()
+        .values("vendor_key")
+        .annotate(first_id=Min("id"))
+        .order_by("first_id")
+        .values_list("vendor_key", flat=True)
+    )
+    # Vendors whose receipts were all deleted still match new ones.
+    seen = set(receipt_keys)
+    vendor_keys = Vendor.objects.filter(household_id=household_id).exclude(key__in=seen).order_by("key")
+    return receipt_keys + list(vendor_keys.values_list("key", flat=True))
+
+
+def _rebuild_vendor_rollups(Receipt, HouseholdVendorRollup, household_id):
+    rows = (
+        Receipt.objects.filter(is_saved=True, household_id=household_id)
+        .annotate(month=TruncMonth("expense_date"))
+        .order_by()
+        .values("month", "vendor_key")
+        .annotate(rollup_vendor=Max("vendor"), rollup_total=Sum("effective_total"), rollup_count=Count("id"))
+    )
+    rollups = []
+    for row in rows:
+        month = row["month"]
+        if isinstance(month, datetime):
+            month = month.date()
+        rollups.append(
+            HouseholdVendorRollup(
+                household_id=household_id,
+                month=month,
+                vendor_key=row["vendor_key"],
+                vendor=row["rollup_vendor"] or "",
+                total=row["rollup_total"] or Decimal("0.00"),
+                receipt_count=row["rollup_count"],
+            )
+        )
+    HouseholdVendorRollup.objects.filter(household_id=household_id).delete()
+    HouseholdVendorRollup.objects.bulk_create(rollups, batch_size=BATCH_SIZE)
+
+
+def cluster_vendors(apps, schema_editor):
+    # 0020 seeded one vendor per stored key; merge the keys that name one vendor, as ingest does.
+    Receipt = apps.get_model("receipts", "Receipt")
+    Vendor = apps.get_model("receipts", "Vendor")
+    ReceiptLineItem = apps.get_model("receipts", "ReceiptLineItem")
+    HouseholdVendorRollup = apps.get_model("receipts", "HouseholdVendorRollup")
+
+    household_ids = Vendor.objects.order_by("household_id").values_list("household_id", flat=True).distinct()
+    for household_id in list(household_ids):
+        canonical = _canonical_keys(_household_keys(Receipt, Vendor, household_id))
+        renamed = {key: vendor for key, vendor in canonical.items() if key != vendor}
+        if not renamed:
+            continue
+        # Each household commits on its own so large tables are not re-keyed in one transaction.
+        with transaction.atomic():
+            for key, vendor in renamed.items():
+                Receipt.objects.filter(household_id=household_id, vendor_key=key).update(vendor_key=vendor)
+                ReceiptLineItem.objects.filter(household_id=household_id, vendor_key=key).update(vendor_key=vendor)
+            Vendor.objects.filter(household_id=household_id, key__in=list(renamed)).delete()
+            _rebuild_vendor_rollups(Receipt, HouseholdVendorRollup, household_id)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("receipts", "0022_receipt_open_date_idx_ordering"),
+    ]
+
+    operations = [
+        migrations.RunPython(cluster_vendors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.contrib.postgres.operations import BtreeGinExtension
+from django.db import migrations
+
+# Search is always scoped to one household; with btree_gin the household id is a key of the same
+# GIN index, so a household's matches come straight out of it instead of every household's being
+# fetched and filtered. GIN serves any subset of its columns, so admin's unscoped search still
+# uses it and the search_vector-only index can go.
+CREATE_HOUSEHOLD_SEARCH_INDEX_SQL = [
+    "CREATE INDEX receipt_household_search_idx ON receipts_receipt USING gin (household_id, search_vector)",
+    "DROP INDEX IF EXISTS receipt_search_idx",
+]
+DROP_HOUSEHOLD_SEARCH_INDEX_SQL = [
+    "CREATE INDEX receipt_search_idx ON receipts_receipt USING gin (search_vector)",
+    "DROP INDEX IF EXISTS receipt_household_search_idx",
+]
+
+
+def create_household_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in CREATE_HOUSEHOLD_SEARCH_INDEX_SQL:
+            schema_editor.execute(statement, params=None)
+
+
+def drop_household_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for statement in DROP_HOUSEHOLD_SEARCH_INDEX_SQL:
+            schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("receipts", "0023_cluster_vendors"),
+    ]
+
+    operations = [
+        BtreeGinExtension(),
+        migrations.RunPython(create_household_search_index, drop_household_search_index),
+    ]
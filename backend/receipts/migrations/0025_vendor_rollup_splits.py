@@ -0,0 +1,90 @@
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import migrations, models, transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncMonth
+
+BATCH_SIZE = 500
+
+
+def _rebuild_vendor_rollups(Receipt, HouseholdVendorRollup, household_id):
+    rows = (
+        Receipt.objects.filter(is_saved=True, household_id=household_id)
+        .annotate(month=TruncMonth("expense_date"))
+        .order_by()
+        .values("month", "vendor_key")
+        .annotate(
+            rollup_vendor=Max("vendor"),
+            rollup_total=Sum("effective_total"),
+            rollup_owed_user_1=Sum("owed_user_1"),
+            rollup_owed_user_2=Sum("owed_user_2"),
+            rollup_paid_user_1=Sum("effective_total", filter=Q(uploaded_by="user_1")),
+            rollup_paid_user_2=Sum("effective_total", filter=Q(uploaded_by="user_2")),
+            rollup_count=Count("id"),
+        )
+    )
+    rollups = []
+    for row in rows:
+        month = row["month"]
+        if isinstance(month, datetime):
+            month = month.date()
+        rollups.append(
+            HouseholdVendorRollup(
+                household_id=household_id,
+                month=month,
+                vendor_key=row["vendor_key"],
+                vendor=row["rollup_vendor"] or "",
+                total=row["rollup_total"] or Decimal("0.00"),
+                owed_user_1=row["rollup_owed_user_1"] or Decimal("0.00"),
+                owed_user_2=row["rollup_owed_user_2"] or Decimal("0.00"),
+                paid_user_1=row["rollup_paid_user_1"] or Decimal("0.00"),
+                paid_user_2=row["rollup_paid_user_2"] or Decimal("0.00"),
+                receipt_count=row["rollup_count"],
+            )
+        )
+    HouseholdVendorRollup.objects.filter(household_id=household_id).delete()
+    HouseholdVendorRollup.objects.bulk_create(rollups, batch_size=BATCH_SIZE)
+
+
+def backfill_vendor_rollup_splits(apps, schema_editor):
+    Receipt = apps.get_model("receipts", "Receipt")
+    HouseholdVendorRollup = apps.get_model("receipts", "HouseholdVendorRollup")
+
+    household_ids = HouseholdVendorRollup.objects.order_by("household_id").values_list("household_id", flat=True)
+    for household_id in list(household_ids.distinct()):
+        with transaction.atomic():
+            _rebuild_vendor_rollups(Receipt, HouseholdVendorRollup, household_id)
+
+
+class Migration(migrations.Migration):
+    # Each household's rollups commit on their own so large tables are not rebuilt in one transaction.
+    atomic = False
+
+    dependencies = [
+        ("receipts", "0024_receipt_household_search_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="householdvendorrollup",
+            name="owed_user_1",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name="householdvendorrollup",
+            name="owed_user_2",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name="householdvendorrollup",
+            name="paid_user_1",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name="householdvendorrollup",
+            name="paid_user_2",
+            field=models.DecimalField(decimal_places=2, default=Decimal("0.00"), max_digits=14),
+        ),
+        migrations.RunPython(backfill_vendor_rollup_splits, migrations.RunPython.noop),
+    ]
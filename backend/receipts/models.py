@@ -1,10 +1,15 @@
+from decimal import Decimal
 import secrets
 import string
 
 from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 
+from .ledger import assign_split_totals
+
 
 class HouseholdSession(models.Model):
     code = models.CharField(max_length=8, unique=True, db_index=True)
@@ -13,6 +18,11 @@ class HouseholdSession(models.Model):
     member_2_name = models.CharField(max_length=64)
     passcode_hash = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every write to the household's receipts or notifications; read endpoints derive ETags from it.
+    data_version = models.PositiveBigIntegerField(default=0)
+    # Unread notification counts per member, maintained by ``receipts.notifications``.
+    member_1_unread_notifications = models.PositiveIntegerField(default=0)
+    member_2_unread_notifications = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-created_at"]
@@ -34,6 +44,16 @@ class HouseholdSession(models.Model):
             self.code = self._generate_code()
         super().save(*args, **kwargs)
 
+    def bump_data_version(self) -> int:
+        HouseholdSession.objects.filter(pk=self.pk).update(data_version=models.F("data_version") + 1)
+        self.refresh_from_db(fields=["data_version"])
+        return self.data_version
+
+    async def abump_data_version(self) -> int:
+        await HouseholdSession.objects.filter(pk=self.pk).aupdate(data_version=models.F("data_version") + 1)
+        await self.arefresh_from_db(fields=["data_version"])
+        return self.data_version
+
     def set_passcode(self, raw_passcode: str):
         self.passcode_hash = make_password(raw_passcode)
 
@@ -94,6 +114,9 @@ class Receipt(models.Model):
 
     expense_date = models.DateField(default=timezone.localdate, db_index=True)
     vendor = models.CharField(max_length=255, blank=True)
+    # Canonical key of the household's ``Vendor`` for ``vendor``, set by the writers through
+    # ``vendors.resolve_vendor_key``; vendor insights and reports group on it.
+    vendor_key = models.CharField(max_length=255, blank=True, default="", editable=False)
     currency = models.CharField(max_length=8, blank=True, default="USD")
     category = models.CharField(max_length=32, choices=CATEGORY_CHOICES, default=CATEGORY_OTHER, db_index=True)
 
@@ -104,18 +127,55 @@ class Receipt(models.Model):
 
     items = models.JSONField(default=list, blank=True)
     raw_text = models.TextField(blank=True)
-    is_saved = models.BooleanField(default=False, db_index=True)
-    settled_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Weighted tsvector over vendor, item names and raw_text. On Postgres a trigger keeps it current
+    # (migration 0015); on other databases it stays NULL and search falls back to ``icontains``.
+    search_vector = SearchVectorField(null=True, editable=False)
+    is_saved = models.BooleanField(default=False)
+    settled_at = models.DateTimeField(null=True, blank=True)
+
+    # Derived from total/items on every save so balances can be summed in SQL.
+    effective_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"), editable=False)
+    owed_user_1 = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"), editable=False)
+    owed_user_2 = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"), editable=False)
 
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Household data version of the last write to this receipt; delta sync reads past a client's cursor.
+    change_version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    SPLIT_FIELDS = ("effective_total", "owed_user_1", "owed_user_2")
 
     class Meta:
         ordering = ["-expense_date", "-uploaded_at"]
+        indexes = [
+            # Keyset pagination of the receipt history walks this index in order.
+            models.Index(fields=["household", "-expense_date", "-uploaded_at", "-id"], name="receipt_history_idx"),
+            models.Index(fields=["household", "change_version"], name="receipt_change_idx"),
+            # Dashboard, report, insight and rollup reads: a household's saved receipts in a date range.
+            models.Index(fields=["household", "expense_date"], condition=Q(is_saved=True), name="receipt_saved_date_idx"),
+            # Settling and the dashboard's open-balance reads: saved receipts not yet settled, walked
+            # in the default ordering so the first open currency and the settled ids need no sort.
+            models.Index(
+                fields=["household", "-expense_date", "-uploaded_at"],
+                condition=Q(is_saved=True, settled_at__isnull=True),
+                name="receipt_open_date_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         household_label = self.household.household_name if self.household else "No Household"
         return f"{household_label}: {self.get_uploaded_by_display()} - {self.vendor or 'Receipt'} ({self.expense_date})"
 
+    def refresh_split_totals(self):
+        assign_split_totals([self])
+
+    def save(self, *args, **kwargs):
+        self.refresh_split_totals()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *self.SPLIT_FIELDS}
+        super().save(*args, **kwargs)
+
 
 class HouseholdNotification(models.Model):
     household = models.ForeignKey(
@@ -130,7 +190,185 @@ class HouseholdNotification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Latest-per-member lookups and the keyset-paginated inbox.
+            models.Index(fields=["household", "user_code", "-created_at"], name="notification_inbox_idx"),
+        ]
 
     def __str__(self) -> str:
         user_name = self.household.name_for_code(self.user_code)
         return f"{self.household.code} -> {user_name}: {self.message[:60]}"
+
+
+class ReceiptTombstone(models.Model):
+    """A deleted (or moved) receipt, kept so delta sync clients can drop it from their cache."""
+
+    household = models.ForeignKey(
+        HouseholdSession,
+        on_delete=models.CASCADE,
+        related_name="receipt_tombstones",
+    )
+    receipt_id = models.PositiveBigIntegerField()
+    change_version = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["change_version"]
+        indexes = [
+            models.Index(fields=["household", "change_version"], name="tombstone_change_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.household.code} receipt {self.receipt_id} deleted at v{self.change_version}"
+
+
+class Vendor(models.Model):
+    """A household's canonical vendor; every spelling that matches it shares its ``key``.
+
+    On Postgres, ``vendor_key_trgm_idx`` (migration 0020) is a trigram GIN index on ``key``
+    that backs both matching on ingest and autocomplete.
+    """
+
+    household = models.ForeignKey(HouseholdSession, on_delete=models.CASCADE, related_name="vendors")
+    key = models.CharField(max_length=255)
+    # The first spelling seen, for display.
+    name = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["household", "key"]
+        constraints = [
+            models.UniqueConstraint(fields=["household", "key"], name="unique_household_vendor"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.household.code} {self.name}"
+
+
+class ReceiptLineItem(models.Model):
+    """One item of a saved receipt, projected out of ``Receipt.items`` for price history queries.
+
+    Rewritten by ``receipts.line_items`` whenever its receipt is written; drafts have no rows.
+    """
+
+    receipt = models.ForeignKey(Receipt, on_delete=models.CASCADE, related_name="line_items")
+    household = models.ForeignKey(HouseholdSession, on_delete=models.CASCADE, related_name="line_items")
+    position = models.PositiveIntegerField()
+    name = models.CharField(max_length=255, blank=True)
+    # ``vendors.name_key(name)``; price history looks items up by it.
+    name_key = models.CharField(max_length=255, blank=True)
+    quantity = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    unit_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+    assigned_to = models.CharField(max_length=16)
+    expense_date = models.DateField()
+    vendor = models.CharField(max_length=255, blank=True)
+    vendor_key = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ["receipt_id", "position"]
+        constraints = [
+            models.UniqueConstraint(fields=["receipt", "position"], name="unique_receipt_line_item"),
+        ]
+        indexes = [
+            # Price history for one item walks this index newest first.
+            models.Index(fields=["household", "name_key", "-expense_date"], name="line_item_history_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name or 'Item'} on receipt {self.receipt_id} ({self.expense_date})"
+
+
+class HouseholdMonthlyRollup(models.Model):
+    """Saved receipt totals per household, month, category, uploader and settled state.
+
+    Rows are rebuilt by ``receipts.rollups`` whenever a write touches their month.
+    """
+
+    household = models.ForeignKey(
+        HouseholdSession,
+        on_delete=models.CASCADE,
+        related_name="monthly_rollups",
+    )
+    month = models.DateField()
+    category = models.CharField(max_length=32, choices=Receipt.CATEGORY_CHOICES)
+    member = models.CharField(max_length=16, choices=Receipt.USER_CHOICES)
+    is_settled = models.BooleanField(default=False)
+
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    owed_user_1 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    owed_user_2 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    receipt_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["household", "month", "category", "member"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["household", "month", "category", "member", "is_settled"],
+                name="unique_household_monthly_rollup",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.household.code} {self.month:%Y-%m} {self.category}/{self.member}: {self.total}"
+
+
+class HouseholdVendorRollup(models.Model):
+    """Saved receipt totals per household, month and normalized vendor key.
+
+    Rebuilt by ``receipts.rollups`` alongside ``HouseholdMonthlyRollup``, so vendor leaderboards
+    and vendor reports read a few rows per month instead of the receipts.
+    """
+
+    household = models.ForeignKey(
+        HouseholdSession,
+        on_delete=models.CASCADE,
+        related_name="vendor_rollups",
+    )
+    month = models.DateField()
+    vendor_key = models.CharField(max_length=255, blank=True)
+    # One of the vendor's spellings that month, for display.
+    vendor = models.CharField(max_length=255, blank=True)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    owed_user_1 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    owed_user_2 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    paid_user_1 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    paid_user_2 = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    receipt_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["household", "month", "-total"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["household", "month", "vendor_key"],
+                name="unique_household_vendor_rollup",
+            ),
+        ]
+        indexes = [
+            # Top-K vendors for a month read this index in order and stop after K rows.
+            models.Index(fields=["household", "month", "-total"], name="vendor_rollup_top_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.household.code} {self.month:%Y-%m} {self.vendor_key or '-'}: {self.total}"
+
+
+class ModelCallGovernorState(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    window_started_at = models.DateTimeField(default=timezone.now)
+    window_request_count = models.PositiveIntegerField(default=0)
+    remaining_requests = models.IntegerField(null=True, blank=True)
+    blocked_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.window_request_count} calls this window"
+
+
+class ModelCallLease(models.Model):
+    key = models.CharField(max_length=64, db_index=True)
+    acquired_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"{self.key} lease until {self.expires_at}"
@@ -0,0 +1,89 @@
+"""Decimal receipt arithmetic.
+
+``receipt_split`` is the reference for ``receipts.ledger``, which does the same split in integer
+cents and is what ``Receipt`` uses; migration 0009 carries a frozen copy of it.
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+ASSIGNED_SHARED = "shared"
+USER_1 = "user_1"
+USER_2 = "user_2"
+
+
+def to_decimal(value):
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+
+
+def item_amount(item):
+    total_price = to_decimal(item.get("total_price"))
+    if total_price is not None:
+        return total_price
+
+    quantity = to_decimal(item.get("quantity"))
+    unit_price = to_decimal(item.get("unit_price"))
+    if quantity is not None and unit_price is not None:
+        return (quantity * unit_price).quantize(CENT, rounding=ROUND_HALF_UP)
+
+    return ZERO
+
+
+def receipt_effective_total(total, subtotal, tax, tip, items) -> Decimal:
+    total = to_decimal(total)
+    if total is not None:
+        return total
+
+    items_total = sum((item_amount(item) for item in (items or [])), ZERO)
+    if items_total > ZERO:
+        return items_total.quantize(CENT, rounding=ROUND_HALF_UP)
+
+    computed = (to_decimal(subtotal) or ZERO) + (to_decimal(tax) or ZERO) + (to_decimal(tip) or ZERO)
+    return computed.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _split_half(amount: Decimal) -> tuple[Decimal, Decimal]:
+    half = (amount / 2).quantize(CENT, rounding=ROUND_HALF_UP)
+    return half, amount - half
+
+
+def receipt_split(total, subtotal, tax, tip, items) -> tuple[Decimal, Decimal, Decimal]:
+    """Return ``(effective_total, owed_user_1, owed_user_2)`` for one receipt.
+
+    Items assigned to a member are owed in full by that member, shared items and whatever
+    the items do not cover are split in half, with the odd cent going to user 1.
+    """
+    effective_total = receipt_effective_total(total, subtotal, tax, tip, items)
+    owed_user_1 = ZERO
+    owed_user_2 = ZERO
+    covered_by_items = ZERO
+
+    for item in items or []:
+        amount = item_amount(item)
+        if amount <= ZERO:
+            continue
+
+        covered_by_items += amount
+        assigned_to = item.get("assigned_to", ASSIGNED_SHARED)
+        if assigned_to == USER_1:
+            owed_user_1 += amount
+        elif assigned_to == USER_2:
+            owed_user_2 += amount
+        else:
+            half_1, half_2 = _split_half(amount)
+            owed_user_1 += half_1
+            owed_user_2 += half_2
+
+    remainder = effective_total - covered_by_items
+    if remainder != ZERO:
+        half_1, half_2 = _split_half(remainder)
+        owed_user_1 += half_1
+        owed_user_2 += half_2
+
+    return effective_total, owed_user_1, owed_user_2
@@ -0,0 +1,85 @@
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import HouseholdNotification, HouseholdSession, Receipt
+
+# Per-member unread counters on ``HouseholdSession``, kept in step with every notification write
+# so the inbox badge is a column read instead of a COUNT over the household's history.
+UNREAD_COUNTER_FIELDS = {
+    Receipt.USER_1: "member_1_unread_notifications",
+    Receipt.USER_2: "member_2_unread_notifications",
+}
+INBOX_ORDERING = ("-created_at", "-id")
+
+
+def unread_notification_count(household: HouseholdSession, user_code: str) -> int:
+    return getattr(household, UNREAD_COUNTER_FIELDS[user_code])
+
+
+def _adjust_unread_counters(household: HouseholdSession, deltas):
+    fields = {UNREAD_COUNTER_FIELDS[user_code]: delta for user_code, delta in deltas.items() if delta}
+    if not fields:
+        return
+    HouseholdSession.objects.filter(pk=household.pk).update(**{field: F(field) + delta for field, delta in fields.items()})
+    household.refresh_from_db(fields=list(fields))
+
+
+def notify_members(household: HouseholdSession, messages):
+    """Store one unread notification per ``{user_code: message}`` entry and bump the unread counters."""
+    with transaction.atomic():
+        HouseholdNotification.objects.bulk_create(
+            HouseholdNotification(household=household, user_code=user_code, message=message)
+            for user_code, message in messages.items()
+        )
+        _adjust_unread_counters(household, {user_code: 1 for user_code in messages})
+
+
+def mark_notifications_read(household: HouseholdSession, user_code: str, ids=None) -> int:
+    """Mark the member's unread notifications (all of them, or only ``ids``) read; returns how many changed."""
+    unread = household.notifications.filter(user_code=user_code, read=False)
+    if ids is not None:
+        unread = unread.filter(id__in=ids)
+    with transaction.atomic():
+        updated = unread.update(read=True)
+        _adjust_unread_counters(household, {user_code: -updated})
+    return updated
+
+
+def latest_notifications(household: HouseholdSession):
+    """Each member's newest notification in one query, in member order.
+
+    On Postgres each member's row is a ``LIMIT 1`` read from the top of the
+    ``(household, user_code, -created_at)`` index, joined with ``UNION ALL``, so the query never
+    touches older notifications. SQLite cannot limit the parts of a compound query; there rows are
+    ranked per member with a window and the first kept.
+    """
+    if connection.vendor == "postgresql":
+        newest = [
+            household.notifications.filter(user_code=user_code).order_by(*INBOX_ORDERING)[:1]
+            for user_code, _ in Receipt.USER_CHOICES
+        ]
+        return newest[0].union(*newest[1:], all=True).order_by("user_code")
+
+    return (
+        household.notifications.annotate(
+            recency=Window(
+                RowNumber(),
+                partition_by=[F("user_code")],
+                order_by=[F("created_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(recency=1)
+        .order_by("user_code")
+    )
+
+
+def notification_summaries(household: HouseholdSession, records):
+    return [
+        {
+            "user": household.name_for_code(record.user_code),
+            "message": record.message,
+            "read": record.read,
+        }
+        for record in records
+    ]
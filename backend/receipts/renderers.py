@@ -0,0 +1,57 @@
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` encoded with orjson when it is installed.
+
+    Dates and datetimes are handed back to DRF's encoder so the output stays byte-identical
+    to the stock renderer; anything orjson refuses (huge ints, indented output for the
+    browsable API) falls back to the stock path.
+    """
+
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self._encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output stays a strict JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Render one JSON document per line.
+
+    Views that stream use ``render`` per event; plain ``Response`` objects (errors, auth
+    failures) come out as a single line so NDJSON clients can parse every reply the same way.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
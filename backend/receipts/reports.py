@@ -0,0 +1,287 @@
+"""Period reports: totals, counts and owed splits of saved receipts over any date range.
+
+Each report is one grouped query over the household's receipts. Month, category, vendor and
+member reports take every whole month inside the range from ``HouseholdMonthlyRollup`` (vendors
+from ``HouseholdVendorRollup``) and aggregate only the partial months at either end live, so a
+multi-year report reads about as many rows as a one-month one.
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+from .models import HouseholdSession, Receipt
+from .rollups import month_start
+
+GROUP_DAY = "day"
+GROUP_WEEK = "week"
+GROUP_MONTH = "month"
+GROUP_CATEGORY = "category"
+GROUP_VENDOR = "vendor"
+GROUP_MEMBER = "member"
+REPORT_GROUPINGS = (GROUP_DAY, GROUP_WEEK, GROUP_MONTH, GROUP_CATEGORY, GROUP_VENDOR, GROUP_MEMBER)
+TIME_GROUPINGS = (GROUP_DAY, GROUP_WEEK, GROUP_MONTH)
+# Rollup column each grouping reads when whole months can come from the rollup table.
+ROLLUP_GROUP_FIELDS = {
+    GROUP_MONTH: "month",
+    GROUP_CATEGORY: "category",
+    GROUP_VENDOR: "vendor_key",
+    GROUP_MEMBER: "member",
+}
+# Time reports past this many buckets are rejected; vendor reports keep the largest this many.
+MAX_REPORT_BUCKETS = int(os.getenv("MAX_REPORT_BUCKETS", "366"))
+UNKNOWN_VENDOR_LABEL = "Unknown vendor"
+
+
+def _add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    year, month_zero_index = divmod(month_index, 12)
+    return date(year, month_zero_index + 1, 1)
+
+
+def _week_start(value: date) -> date:
+    # Weeks start on Monday, like TruncWeek.
+    return value - timedelta(days=value.weekday())
+
+
+def report_bucket_count(group_by: str, date_from: date, date_to: date) -> int | None:
+    """How many buckets a time report spans; ``None`` for groupings not bounded by the range."""
+    if group_by == GROUP_DAY:
+        return (date_to - date_from).days + 1
+    if group_by == GROUP_WEEK:
+        return (_week_start(date_to) - _week_start(date_from)).days // 7 + 1
+    if group_by == GROUP_MONTH:
+        return (date_to.year - date_from.year) * 12 + date_to.month - date_from.month + 1
+    return None
+
+
+def _bucket_starts(group_by: str, date_from: date, date_to: date):
+    if group_by == GROUP_DAY:
+        return [date_from + timedelta(days=offset) for offset in range(report_bucket_count(group_by, date_from, date_to))]
+    if group_by == GROUP_WEEK:
+        first = _week_start(date_from)
+        return [first + timedelta(weeks=offset) for offset in range(report_bucket_count(group_by, date_from, date_to))]
+    first = month_start(date_from)
+    return [_add_months(first, offset) for offset in range(report_bucket_count(group_by, date_from, date_to))]
+
+
+def _bucket_end(group_by: str, start: date) -> date:
+    if group_by == GROUP_DAY:
+        return start
+    if group_by == GROUP_WEEK:
+        return start + timedelta(days=6)
+    return _add_months(start, 1) - timedelta(days=1)
+
+
+def _bucket_sums(total_field: str, member_field: str, count):
+    return {
+        "bucket_total": Sum(total_field),
+        "bucket_owed_user_1": Sum("owed_user_1"),
+        "bucket_owed_user_2": Sum("owed_user_2"),
+        "bucket_paid_user_1": Sum(total_field, filter=Q(**{member_field: Receipt.USER_1})),
+        "bucket_paid_user_2": Sum(total_field, filter=Q(**{member_field: Receipt.USER_2})),
+        "bucket_count": count,
+    }
+
+
+def _live_bucket(group_by: str):
+    if group_by == GROUP_WEEK:
+        return TruncWeek("expense_date")
+    if group_by == GROUP_MONTH:
+        return TruncMonth("expense_date")
+    return F(
+        {
+            GROUP_DAY: "expense_date",
+            GROUP_CATEGORY: "category",
+            GROUP_VENDOR: "vendor_key",
+            GROUP_MEMBER: "uploaded_by",
+        }[group_by]
+    )
+
+
+def _live_rows(household: HouseholdSession, group_by: str, date_filter: Q):
+    rows = (
+        household.receipts.filter(date_filter, is_saved=True)
+        .order_by()
+        .values(bucket=_live_bucket(group_by))
+        .annotate(**_bucket_sums("effective_total", "uploaded_by", Count("id")))
+    )
+    if group_by == GROUP_VENDOR:
+        # Vendors group on their normalized key; one of the spellings labels the bucket.
+        rows = rows.annotate(bucket_label=Max("vendor"))
+    return rows
+
+
+def _rollup_rows(household: HouseholdSession, group_by: str, first_month: date, last_month: date):
+    if group_by == GROUP_VENDOR:
+        # Vendor rollups carry each member's paid share, since they are not split by member.
+        return (
+            household.vendor_rollups.filter(month__range=(first_month, last_month))
+            .order_by()
+            .values(bucket=F("vendor_key"))
+            .annotate(
+                bucket_total=Sum("total"),
+                bucket_owed_user_1=Sum("owed_user_1"),
+                bucket_owed_user_2=Sum("owed_user_2"),
+                bucket_paid_user_1=Sum("paid_user_1"),
+                bucket_paid_user_2=Sum("paid_user_2"),
+                bucket_count=Sum("receipt_count"),
+                bucket_label=Max("vendor"),
+            )
+        )
+    return (
+        household.monthly_rollups.filter(month__range=(first_month, last_month))
+        .order_by()
+        .values(bucket=F(ROLLUP_GROUP_FIELDS[group_by]))
+        .annotate(**_bucket_sums("total", "member", Sum("receipt_count")))
+    )
+
+
+def _whole_months(date_from: date, date_to: date):
+    """First and last month lying entirely inside the range, or ``None`` when there is none."""
+    first_month = month_start(date_from) if date_from.day == 1 else _add_months(date_from, 1)
+    after_range = date_to + timedelta(days=1)
+    last_month = _add_months(month_start(after_range), -1) if after_range.day == 1 else _add_months(date_to, -1)
+    if first_month > last_month:
+        return None
+    return first_month, last_month
+
+
+def _report_rows(household: HouseholdSession, group_by: str, date_from: date, date_to: date):
+    whole_months = _whole_months(date_from, date_to) if group_by in ROLLUP_GROUP_FIELDS else None
+    if whole_months is None:
+        rows = _live_rows(household, group_by, Q(expense_date__range=(date_from, date_to)))
+        if group_by == GROUP_VENDOR:
+            # One extra row tells a complete vendor list from a truncated one.
+            rows = rows.order_by("-bucket_total", "bucket")[: MAX_REPORT_BUCKETS + 1]
+        return list(rows)
+
+    first_month, last_month = whole_months
+    rows = list(_rollup_rows(household, group_by, first_month, last_month))
+    edges = Q()
+    if date_from < first_month:
+        edges |= Q(expense_date__range=(date_from, first_month - timedelta(days=1)))
+    months_end = _add_months(last_month, 1)
+    if months_end <= date_to:
+        edges |= Q(expense_date__range=(months_end, date_to))
+    if edges:
+        rows.extend(_live_rows(household, group_by, edges))
+    return rows
+
+
+def _empty_bucket_values():
+    return {
+        "total": Decimal("0.00"),
+        "paid_user_1": Decimal("0.00"),
+        "paid_user_2": Decimal("0.00"),
+        "owed_user_1": Decimal("0.00"),
+        "owed_user_2": Decimal("0.00"),
+        "receipt_count": 0,
+    }
+
+
+def _fold_rows(rows, group_by: str):
+    values_by_key = {}
+    valid_categories = {value for value, _ in Receipt.CATEGORY_CHOICES}
+    for row in rows:
+        key = row["bucket"]
+        if isinstance(key, datetime):
+            key = key.date()
+        if group_by == GROUP_CATEGORY and key not in valid_categories:
+            key = Receipt.CATEGORY_OTHER
+        if group_by == GROUP_VENDOR:
+            key = key or ""
+        values = values_by_key.setdefault(key, _empty_bucket_values())
+        for field in ("total", "paid_user_1", "paid_user_2", "owed_user_1", "owed_user_2"):
+            values[field] += row[f"bucket_{field}"] or Decimal("0.00")
+        values["receipt_count"] += row["bucket_count"] or 0
+    return values_by_key
+
+
+def _time_label(group_by: str, start: date) -> str:
+    if group_by == GROUP_DAY:
+        return start.strftime("%b %d, %Y")
+    if group_by == GROUP_WEEK:
+        return f"Week of {start.strftime('%b %d, %Y')}"
+    return start.strftime("%B %Y")
+
+
+def _report_buckets(
+    household: HouseholdSession,
+    group_by: str,
+    date_from: date,
+    date_to: date,
+    values_by_key,
+    vendor_labels,
+):
+    if group_by in TIME_GROUPINGS:
+        return [
+            {
+                "key": start.isoformat(),
+                "label": _time_label(group_by, start),
+                # Buckets cut by the range report the part of them that was counted.
+                "start_date": max(start, date_from),
+                "end_date": min(_bucket_end(group_by, start), date_to),
+                **values_by_key.get(start, _empty_bucket_values()),
+            }
+            for start in _bucket_starts(group_by, date_from, date_to)
+        ]
+
+    if group_by == GROUP_CATEGORY:
+        keys = [(value, label) for value, label in Receipt.CATEGORY_CHOICES]
+    elif group_by == GROUP_MEMBER:
+        keys = [(code, household.name_for_code(code)) for code in (Receipt.USER_1, Receipt.USER_2)]
+    else:
+        keys = [
+            (vendor, vendor_labels.get(vendor) or UNKNOWN_VENDOR_LABEL)
+            for vendor in sorted(values_by_key, key=lambda vendor: (-values_by_key[vendor]["total"], vendor))
+        ]
+    return [
+        {
+            "key": key,
+            "label": label,
+            "start_date": None,
+            "end_date": None,
+            **values_by_key.get(key, _empty_bucket_values()),
+        }
+        for key, label in keys
+    ]
+
+
+def _report_totals(household: HouseholdSession, date_from: date, date_to: date, buckets, truncated: bool):
+    if truncated:
+        # The listed vendors are only part of the range, so total the range by month instead,
+        # which reads the whole months from the rollups too.
+        buckets = _fold_rows(_report_rows(household, GROUP_MONTH, date_from, date_to), GROUP_MONTH).values()
+
+    totals = _empty_bucket_values()
+    for bucket in buckets:
+        for field in totals:
+            totals[field] += bucket[field]
+    return totals
+
+
+def build_report(household: HouseholdSession, date_from: date, date_to: date, group_by: str):
+    """Report the household's saved receipts between two dates (inclusive), one bucket per ``group_by`` value.
+
+    Time buckets cover the whole range, including empty ones; category and member reports list
+    every category or member; vendor reports group on ``Receipt.vendor_key``, list the
+    ``MAX_REPORT_BUCKETS`` largest vendors and set ``truncated`` when there are more.
+    """
+    rows = _report_rows(household, group_by, date_from, date_to)
+    values_by_key = _fold_rows(rows, group_by)
+    vendor_labels = {row["bucket"] or "": row["bucket_label"] for row in rows} if group_by == GROUP_VENDOR else {}
+    buckets = _report_buckets(household, group_by, date_from, date_to, values_by_key, vendor_labels)
+    truncated = group_by == GROUP_VENDOR and len(buckets) > MAX_REPORT_BUCKETS
+    buckets = buckets[:MAX_REPORT_BUCKETS]
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        "buckets": buckets,
+        "totals": _report_totals(household, date_from, date_to, buckets, truncated),
+        "truncated": truncated,
+    }
@@ -0,0 +1,187 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Max, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import HouseholdMonthlyRollup, HouseholdSession, HouseholdVendorRollup, Receipt
+
+ROLLUP_VALUE_FIELDS = ("total", "owed_user_1", "owed_user_2", "receipt_count")
+VENDOR_ROLLUP_VALUE_FIELDS = ("total", "owed_user_1", "owed_user_2", "paid_user_1", "paid_user_2", "receipt_count")
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def _month_range(month: date):
+    next_month = (month + timedelta(days=32)).replace(day=1)
+    return month, next_month - timedelta(days=1)
+
+
+def _saved_receipts(household_ids, months=None):
+    receipts = Receipt.objects.filter(is_saved=True, household_id__in=household_ids)
+    if months is not None:
+        month_filter = Q()
+        for month in months:
+            month_filter |= Q(expense_date__range=_month_range(month))
+        # The overall span lets one range of the saved-receipt index serve every month at once.
+        span = Q(expense_date__range=(_month_range(min(months))[0], _month_range(max(months))[1])) if months else Q()
+        receipts = receipts.filter(span, month_filter)
+    return receipts
+
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _receipt_rollup_rows(household_ids, months=None):
+    return (
+        _saved_receipts(household_ids, months)
+        .annotate(month=TruncMonth("expense_date"))
+        .order_by()
+        .values(
+            "household_id",
+            "month",
+            "category",
+            "uploaded_by",
+            settled=ExpressionWrapper(Q(settled_at__isnull=False), output_field=BooleanField()),
+        )
+        .annotate(
+            rollup_total=Sum("effective_total"),
+            rollup_owed_user_1=Sum("owed_user_1"),
+            rollup_owed_user_2=Sum("owed_user_2"),
+            rollup_count=Count("id"),
+        )
+    )
+
+
+def _expected_rollups(household_ids, months=None):
+    expected = {}
+    for row in _receipt_rollup_rows(household_ids, months):
+        month = _as_date(row["month"])
+        key = (row["household_id"], month, row["category"], row["uploaded_by"], bool(row["settled"]))
+        expected[key] = HouseholdMonthlyRollup(
+            household_id=row["household_id"],
+            month=month,
+            category=row["category"],
+            member=row["uploaded_by"],
+            is_settled=bool(row["settled"]),
+            total=row["rollup_total"] or Decimal("0.00"),
+            owed_user_1=row["rollup_owed_user_1"] or Decimal("0.00"),
+            owed_user_2=row["rollup_owed_user_2"] or Decimal("0.00"),
+            receipt_count=row["rollup_count"],
+        )
+    return expected
+
+
+def _expected_vendor_rollups(household_ids, months=None):
+    rows = (
+        _saved_receipts(household_ids, months)
+        .annotate(month=TruncMonth("expense_date"))
+        .order_by()
+        .values("household_id", "month", "vendor_key")
+        .annotate(
+            rollup_vendor=Max("vendor"),
+            rollup_total=Sum("effective_total"),
+            rollup_owed_user_1=Sum("owed_user_1"),
+            rollup_owed_user_2=Sum("owed_user_2"),
+            rollup_paid_user_1=Sum("effective_total", filter=Q(uploaded_by=Receipt.USER_1)),
+            rollup_paid_user_2=Sum("effective_total", filter=Q(uploaded_by=Receipt.USER_2)),
+            rollup_count=Count("id"),
+        )
+    )
+    expected = {}
+    for row in rows:
+        month = _as_date(row["month"])
+        expected[(row["household_id"], month, row["vendor_key"])] = HouseholdVendorRollup(
+            household_id=row["household_id"],
+            month=month,
+            vendor_key=row["vendor_key"],
+            vendor=row["rollup_vendor"] or "",
+            total=row["rollup_total"] or Decimal("0.00"),
+            owed_user_1=row["rollup_owed_user_1"] or Decimal("0.00"),
+            owed_user_2=row["rollup_owed_user_2"] or Decimal("0.00"),
+            paid_user_1=row["rollup_paid_user_1"] or Decimal("0.00"),
+            paid_user_2=row["rollup_paid_user_2"] or Decimal("0.00"),
+            receipt_count=row["rollup_count"],
+        )
+    return expected
+
+
+def _lock_households(household_ids):
+    # Rebuilds of the same household queue up behind this row lock, so two writers
+    # cannot interleave their delete/insert of the same months.
+    list(HouseholdSession.objects.select_for_update().filter(id__in=household_ids).values_list("id", flat=True))
+
+
+def refresh_household_months(household_id: int, dates):
+    """Recompute the rollup rows of every month touched by ``dates`` for one household.
+
+    Call inside the transaction that wrote the receipts so readers never see the two disagree.
+    """
+    months = {month_start(value) for value in dates if value}
+    if not household_id or not months:
+        return
+
+    with transaction.atomic():
+        _lock_households([household_id])
+        HouseholdMonthlyRollup.objects.filter(household_id=household_id, month__in=months).delete()
+        HouseholdMonthlyRollup.objects.bulk_create(_expected_rollups([household_id], months).values())
+        HouseholdVendorRollup.objects.filter(household_id=household_id, month__in=months).delete()
+        HouseholdVendorRollup.objects.bulk_create(_expected_vendor_rollups([household_id], months).values())
+
+
+def rebuild_rollups(household_ids) -> int:
+    with transaction.atomic():
+        _lock_households(household_ids)
+        HouseholdMonthlyRollup.objects.filter(household_id__in=household_ids).delete()
+        rows = HouseholdMonthlyRollup.objects.bulk_create(_expected_rollups(household_ids).values())
+        HouseholdVendorRollup.objects.filter(household_id__in=household_ids).delete()
+        vendor_rows = HouseholdVendorRollup.objects.bulk_create(_expected_vendor_rollups(household_ids).values())
+    return len(rows) + len(vendor_rows)
+
+
+def _drift(expected, stored, value_fields):
+    drift = []
+    for key in sorted(expected.keys() | stored.keys(), key=str):
+        stored_values = _rollup_values(stored.get(key), value_fields)
+        expected_values = _rollup_values(expected.get(key), value_fields)
+        if stored_values != expected_values:
+            drift.append((key, stored_values, expected_values))
+    return drift
+
+
+def rollup_drift(household_ids):
+    """Return ``(key, stored, expected)`` tuples for every rollup row that disagrees with the receipts."""
+    stored = {
+        (row.household_id, row.month, row.category, row.member, row.is_settled): row
+        for row in HouseholdMonthlyRollup.objects.filter(household_id__in=household_ids)
+    }
+    return _drift(_expected_rollups(household_ids), stored, ROLLUP_VALUE_FIELDS)
+
+
+def vendor_rollup_drift(household_ids):
+    """Like ``rollup_drift`` for the vendor rollups; keys are ``(household_id, month, vendor_key)``."""
+    stored = {
+        (row.household_id, row.month, row.vendor_key): row
+        for row in HouseholdVendorRollup.objects.filter(household_id__in=household_ids)
+    }
+    return _drift(_expected_vendor_rollups(household_ids), stored, VENDOR_ROLLUP_VALUE_FIELDS)
+
+
+def _rollup_values(row, value_fields):
+    if row is None:
+        return None
+    return tuple(getattr(row, field) for field in value_fields)
+
+
+def closed_month_rows(household: HouseholdSession, first_month: date, last_month: date):
+    """Per month, category and uploader totals for whole months, shaped like the live overview rows."""
+    return (
+        household.monthly_rollups.filter(month__range=(first_month, last_month))
+        .order_by()
+        .values("month", "category", uploaded_by=F("member"))
+        .annotate(member_total=Sum("total"), row_count=Sum("receipt_count"))
+    )
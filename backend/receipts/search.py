@@ -0,0 +1,106 @@
+import json
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import BigIntegerField, Case, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Cast
+
+from .models import HouseholdSession, Receipt
+from .vendors import vendor_key
+
+SEARCH_CONFIG = "simple"
+# Fallback weights, matching ts_rank's defaults for the vendor (A), item (B) and raw_text (C) weights.
+FALLBACK_WEIGHTS = (1.0, 0.4, 0.2)
+
+
+def _uses_search_vector() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def _search_query(text: str) -> SearchQuery:
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+
+
+def _item_name_contains(term: str) -> Q:
+    # ``items`` is stored as JSON text, with non-ASCII escaped; escape the term the same way and
+    # match it only inside a "name" value, never in other keys ("shared", "total_price") or values.
+    escaped = json.dumps(term)[1:-1]
+    return Q(items__iregex=rf'"name":\s*"(?:[^"\\]|\\.)*{re.escape(escaped)}')
+
+
+def _fallback_matches(term: str):
+    return (
+        Q(vendor__icontains=term),
+        _item_name_contains(term),
+        Q(raw_text__icontains=term),
+    )
+
+
+def receipt_text_match(text: str) -> Q:
+    """Receipts whose vendor, item names or raw_text match ``text``.
+
+    On Postgres this is a ``websearch_to_tsquery`` match on the trigger-maintained, GIN-indexed
+    ``search_vector``; elsewhere every term must appear (case-insensitively) in one of the fields.
+    """
+    if _uses_search_vector():
+        return Q(search_vector=_search_query(text))
+
+    match = Q()
+    for term in text.split():
+        vendor_match, item_match, text_match = _fallback_matches(term)
+        match &= vendor_match | item_match | text_match
+    return match
+
+
+def _rank(text: str):
+    if _uses_search_vector():
+        return SearchRank(F("search_vector"), _search_query(text))
+
+    rank = Value(0.0, output_field=FloatField())
+    for term in text.split():
+        rank = rank + Case(
+            *(When(match, then=Value(weight)) for match, weight in zip(_fallback_matches(term), FALLBACK_WEIGHTS)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    return rank
+
+
+def search_receipts(household: HouseholdSession, text: str, position=None):
+    """The household's receipts matching ``text``, annotated with ``rank`` and ordered best first.
+
+    ``position`` is the ``(rank, id)`` of the last row already returned.
+    """
+    # ``receipt_household_search_idx`` keys on a bigint household id, and btree_gin only compares it
+    # with a bigint; a bare id is sent as a plain integer, which would leave the household to a filter.
+    receipts = Receipt.objects.filter(household_id=Cast(Value(household.id), BigIntegerField()))
+    receipts = receipts.filter(receipt_text_match(text)).annotate(rank=_rank(text))
+    if position:
+        rank, receipt_id = position
+        receipts = receipts.filter(Q(rank__lt=rank) | Q(rank=rank, id__lt=receipt_id))
+    return receipts.order_by("-rank", "-id")
+
+
+def vendor_suggestions(household: HouseholdSession, text: str, limit: int):
+    """The household's canonical vendors for an autocomplete box, best match first.
+
+    Key prefixes rank first, then substring and (on Postgres) trigram matches; all three are
+    served by the ``vendor_key_trgm_idx`` trigram index.
+    """
+    key = vendor_key(text)
+    if not key:
+        return household.vendors.none()
+
+    match = Q(key__contains=key)
+    ordering = ["-prefix", "key"]
+    vendors = household.vendors.all()
+    if _uses_search_vector():
+        match |= Q(key__trigram_similar=key)
+        vendors = vendors.annotate(similarity=TrigramSimilarity("key", key))
+        ordering = ["-prefix", "-similarity", "key"]
+    return (
+        vendors.filter(match)
+        .annotate(prefix=Case(When(key__startswith=key, then=Value(1)), default=Value(0), output_field=IntegerField()))
+        .order_by(*ordering)[:limit]
+    )
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .models import HouseholdSession, Receipt
+from .reports import GROUP_MONTH, REPORT_GROUPINGS
 
 
 class ReceiptUploadSerializer(serializers.Serializer):
@@ -15,6 +16,10 @@ class ReceiptBulkUploadSerializer(serializers.Serializer):
     )
 
 
+class ReceiptArchiveUploadSerializer(serializers.Serializer):
+    archive = serializers.FileField(allow_empty_file=False)
+
+
 class ReceiptItemSerializer(serializers.Serializer):
     name = serializers.CharField()
     quantity = serializers.FloatField(required=False, allow_null=True)
@@ -101,6 +106,108 @@ class ReceiptRecordSerializer(serializers.ModelSerializer):
         return "Member" if obj.uploaded_by not in (Receipt.USER_1, Receipt.USER_2) else obj.get_uploaded_by_display()
 
 
+class ReceiptDetailSerializer(ReceiptRecordSerializer):
+    class Meta(ReceiptRecordSerializer.Meta):
+        fields = [*ReceiptRecordSerializer.Meta.fields, "raw_text"]
+
+
+RECEIPT_RECORD_VALUE_FIELDS = (
+    "id",
+    "uploaded_by",
+    "expense_date",
+    "vendor",
+    "currency",
+    "category",
+    "subtotal",
+    "tax",
+    "tip",
+    "total",
+    "items",
+    "is_saved",
+    "uploaded_at",
+)
+RECEIPT_RECORD_FIELDS = tuple(ReceiptRecordSerializer.Meta.fields)
+# Output fields rendered from a differently named column.
+RECEIPT_RECORD_FIELD_SOURCES = {"uploaded_by_name": "uploaded_by"}
+
+
+def receipt_record_rows(receipts, household: HouseholdSession, fields=None):
+    """Render one household's receipts like ``ReceiptRecordSerializer(many=True).data``, from ``values_list``.
+
+    Skips per-row serializer instantiation; member names are resolved once for the household.
+    Output must stay byte-identical to the serializer (see ``receipts.tests.test_serializers``).
+    ``fields`` narrows both the selected columns and the rendered keys to a subset of
+    ``RECEIPT_RECORD_FIELDS``.
+    """
+    if fields is not None:
+        return _sparse_receipt_record_rows(receipts, household, fields)
+
+    member_names = household.member_names()
+    date_field = serializers.DateField()
+    datetime_field = serializers.DateTimeField()
+    to_float = ReceiptRecordSerializer._to_float
+
+    rows = []
+    for (
+        receipt_id,
+        uploaded_by,
+        expense_date,
+        vendor,
+        currency,
+        category,
+        subtotal,
+        tax,
+        tip,
+        total,
+        items,
+        is_saved,
+        uploaded_at,
+    ) in receipts.values_list(*RECEIPT_RECORD_VALUE_FIELDS):
+        rows.append(
+            {
+                "id": receipt_id,
+                "uploaded_by": uploaded_by,
+                "uploaded_by_name": member_names.get(uploaded_by, uploaded_by),
+                "expense_date": date_field.to_representation(expense_date),
+                "vendor": vendor,
+                "currency": currency,
+                "category": category,
+                "subtotal": to_float(subtotal),
+                "tax": to_float(tax),
+                "tip": to_float(tip),
+                "total": to_float(total),
+                "items": items,
+                "is_saved": is_saved,
+                "uploaded_at": datetime_field.to_representation(uploaded_at),
+            }
+        )
+    return rows
+
+
+def _sparse_receipt_record_rows(receipts, household: HouseholdSession, fields):
+    member_names = household.member_names()
+    to_float = ReceiptRecordSerializer._to_float
+    formatters = {
+        "uploaded_by_name": lambda uploaded_by: member_names.get(uploaded_by, uploaded_by),
+        "expense_date": serializers.DateField().to_representation,
+        "subtotal": to_float,
+        "tax": to_float,
+        "tip": to_float,
+        "total": to_float,
+        "uploaded_at": serializers.DateTimeField().to_representation,
+    }
+
+    columns = list(dict.fromkeys(RECEIPT_RECORD_FIELD_SOURCES.get(field, field) for field in fields))
+    plan = [
+        (field, columns.index(RECEIPT_RECORD_FIELD_SOURCES.get(field, field)), formatters.get(field))
+        for field in fields
+    ]
+    return [
+        {field: formatter(values[index]) if formatter else values[index] for field, index, formatter in plan}
+        for values in receipts.values_list(*columns)
+    ]
+
+
 class MonthTotalsSerializer(serializers.Serializer):
     user_1 = serializers.FloatField()
     user_2 = serializers.FloatField()
@@ -162,6 +269,7 @@ class DashboardSerializer(serializers.Serializer):
     last_month = MonthSummarySerializer()
     settlement = SettlementSerializer()
     notifications = NotificationSerializer(many=True)
+    unread_notifications = serializers.IntegerField(min_value=0)
     recent_receipts = ReceiptRecordSerializer(many=True)
 
 
@@ -180,6 +288,261 @@ class ExpensesOverviewSerializer(serializers.Serializer):
 
 class ReceiptAnalysesSerializer(serializers.Serializer):
     analyses = ReceiptRecordSerializer(many=True)
+    next_cursor = serializers.CharField(required=False, allow_null=True)
+    count = serializers.IntegerField(required=False)
+
+
+class ReceiptFieldsQuerySerializer(serializers.Serializer):
+    """``?fields=`` / ``?exclude=`` selection of receipt record keys.
+
+    Validated data carries ``receipt_fields``: the selected keys in ``RECEIPT_RECORD_FIELDS``
+    order, or ``None`` when the full record was asked for.
+    """
+
+    fields = serializers.CharField(required=False)
+    exclude = serializers.CharField(required=False)
+
+    def _parse_field_names(self, value: str, param: str):
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = sorted(set(names) - set(RECEIPT_RECORD_FIELDS))
+        if unknown:
+            raise serializers.ValidationError(
+                {param: f"Unknown receipt field(s): {', '.join(unknown)}. Choose from {', '.join(RECEIPT_RECORD_FIELDS)}."}
+            )
+        return set(names)
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if "fields" not in attrs and "exclude" not in attrs:
+            attrs["receipt_fields"] = None
+            return attrs
+
+        selected = set(RECEIPT_RECORD_FIELDS)
+        if "fields" in attrs:
+            selected = self._parse_field_names(attrs["fields"], "fields")
+        if "exclude" in attrs:
+            selected -= self._parse_field_names(attrs["exclude"], "exclude")
+        if not selected:
+            raise serializers.ValidationError({"fields": "Select at least one receipt field."})
+        attrs["receipt_fields"] = tuple(field for field in RECEIPT_RECORD_FIELDS if field in selected)
+        return attrs
+
+
+class ReceiptHistoryQuerySerializer(ReceiptFieldsQuerySerializer):
+    STATUS_SAVED = "saved"
+    STATUS_DRAFT = "draft"
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    category = serializers.ChoiceField(choices=[value for value, _ in Receipt.CATEGORY_CHOICES], required=False)
+    member = serializers.ChoiceField(choices=[Receipt.USER_1, Receipt.USER_2], required=False)
+    status = serializers.ChoiceField(choices=[STATUS_SAVED, STATUS_DRAFT], required=False)
+    # Query-string booleans as explicit choices: DRF treats a missing BooleanField in form data as False.
+    settled = serializers.ChoiceField(choices=["true", "false"], required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=200)
+    cursor = serializers.CharField(required=False)
+    include_count = serializers.ChoiceField(choices=["true", "false"], required=False)
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        date_from = attrs.get("date_from")
+        date_to = attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError({"date_to": "date_to must be on or after date_from."})
+        return attrs
+
+
+class ReceiptChangesQuerySerializer(ReceiptFieldsQuerySerializer):
+    since = serializers.IntegerField(required=False, min_value=0)
+
+
+class ReceiptSearchQuerySerializer(ReceiptFieldsQuerySerializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100)
+    cursor = serializers.CharField(required=False)
+
+
+class ReportQuerySerializer(serializers.Serializer):
+    """``?from=&to=&group_by=`` for period reports; the dates arrive as ``date_from``/``date_to``."""
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    group_by = serializers.ChoiceField(choices=REPORT_GROUPINGS, default=GROUP_MONTH)
+
+    def get_fields(self):
+        # ``from`` is a keyword, so the query parameter names cannot be declared as attributes.
+        fields = super().get_fields()
+        fields["from"] = fields.pop("date_from")
+        fields["to"] = fields.pop("date_to")
+        for name in ("from", "to"):
+            fields[name].source = f"date_{name}"
+        return fields
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        date_from = attrs.get("date_from")
+        date_to = attrs.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError({"to": "to must be on or after from."})
+        return attrs
+
+
+class ReportBucketSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    label = serializers.CharField()
+    start_date = serializers.DateField(allow_null=True)
+    end_date = serializers.DateField(allow_null=True)
+    total = serializers.FloatField()
+    paid_user_1 = serializers.FloatField()
+    paid_user_2 = serializers.FloatField()
+    owed_user_1 = serializers.FloatField()
+    owed_user_2 = serializers.FloatField()
+    receipt_count = serializers.IntegerField()
+
+
+class ReportTotalsSerializer(serializers.Serializer):
+    total = serializers.FloatField()
+    paid_user_1 = serializers.FloatField()
+    paid_user_2 = serializers.FloatField()
+    owed_user_1 = serializers.FloatField()
+    owed_user_2 = serializers.FloatField()
+    receipt_count = serializers.IntegerField()
+
+
+class ReportSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    group_by = serializers.CharField()
+    members = MemberNamesSerializer()
+    buckets = ReportBucketSerializer(many=True)
+    totals = ReportTotalsSerializer()
+    truncated = serializers.BooleanField()
+
+
+class InsightsQuerySerializer(serializers.Serializer):
+    month = serializers.DateField(required=False, input_formats=["%Y-%m"])
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=20)
+
+
+class VendorInsightSerializer(serializers.Serializer):
+    vendor_key = serializers.CharField(allow_blank=True)
+    vendor = serializers.CharField()
+    total = serializers.FloatField()
+    receipt_count = serializers.IntegerField()
+    previous_total = serializers.FloatField()
+    change = serializers.FloatField()
+    growth = serializers.FloatField(allow_null=True)
+
+
+class ReceiptInsightSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    vendor = serializers.CharField()
+    expense_date = serializers.DateField()
+    effective_total = serializers.FloatField()
+    category = serializers.CharField()
+    uploaded_by = serializers.CharField()
+    uploaded_by_name = serializers.CharField()
+
+
+class CategoryInsightSerializer(serializers.Serializer):
+    category = serializers.CharField()
+    label = serializers.CharField()
+    total = serializers.FloatField()
+    previous_total = serializers.FloatField()
+    change = serializers.FloatField()
+    growth = serializers.FloatField(allow_null=True)
+
+
+class InsightsSerializer(serializers.Serializer):
+    month = serializers.DateField()
+    previous_month = serializers.DateField()
+    total = serializers.FloatField()
+    previous_total = serializers.FloatField()
+    change = serializers.FloatField()
+    growth = serializers.FloatField(allow_null=True)
+    top_vendors = VendorInsightSerializer(many=True)
+    biggest_receipts = ReceiptInsightSerializer(many=True)
+    category_growth = CategoryInsightSerializer(many=True)
+
+
+class PriceHistoryQuerySerializer(serializers.Serializer):
+    item = serializers.CharField(max_length=255)
+    vendor = serializers.CharField(max_length=255, required=False)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=200)
+    cursor = serializers.CharField(required=False)
+
+
+class PriceHistoryEntrySerializer(serializers.Serializer):
+    receipt_id = serializers.IntegerField()
+    expense_date = serializers.DateField()
+    vendor = serializers.CharField(allow_blank=True)
+    name = serializers.CharField(allow_blank=True)
+    quantity = serializers.FloatField(allow_null=True)
+    unit_price = serializers.FloatField(allow_null=True)
+    amount = serializers.FloatField()
+    assigned_to = serializers.CharField()
+
+
+class PriceSummarySerializer(serializers.Serializer):
+    purchases = serializers.IntegerField()
+    total_spent = serializers.FloatField(allow_null=True)
+    min_unit_price = serializers.FloatField(allow_null=True)
+    max_unit_price = serializers.FloatField(allow_null=True)
+    average_unit_price = serializers.FloatField(allow_null=True)
+    first_purchased = serializers.DateField(allow_null=True)
+    last_purchased = serializers.DateField(allow_null=True)
+
+
+class PriceHistorySerializer(serializers.Serializer):
+    item_key = serializers.CharField(allow_blank=True)
+    summary = PriceSummarySerializer()
+    history = PriceHistoryEntrySerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+
+
+class VendorAutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=20)
+
+
+class VendorSuggestionSerializer(serializers.Serializer):
+    key = serializers.CharField()
+    name = serializers.CharField()
+
+
+class VendorAutocompleteSerializer(serializers.Serializer):
+    vendors = VendorSuggestionSerializer(many=True)
+
+
+class NotificationInboxQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100)
+    cursor = serializers.CharField(required=False)
+
+
+class NotificationInboxEntrySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    message = serializers.CharField()
+    read = serializers.BooleanField()
+    created_at = serializers.DateTimeField()
+
+
+class NotificationInboxSerializer(serializers.Serializer):
+    notifications = NotificationInboxEntrySerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    unread_count = serializers.IntegerField(min_value=0)
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=500)
+    all = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if "ids" in attrs and attrs["all"]:
+            raise serializers.ValidationError("Send either ids or all, not both.")
+        if "ids" not in attrs and not attrs["all"]:
+            raise serializers.ValidationError("Send the notification ids to mark read, or all=true.")
+        return attrs
 
 
 class SettleHouseholdResponseSerializer(serializers.Serializer):
@@ -223,6 +586,11 @@ class SessionLoginSerializer(serializers.Serializer):
     passcode = serializers.CharField(max_length=128)
 
 
+class EventTicketSerializer(serializers.Serializer):
+    ticket = serializers.CharField()
+    expires_in = serializers.IntegerField()
+
+
 class SessionStateSerializer(serializers.Serializer):
     user = serializers.CharField(allow_null=True)
     user_name = serializers.CharField(allow_null=True)
@@ -5,10 +5,19 @@ import os
 import re
 from typing import Any
 
+import httpx
 import requests
+from asgiref.sync import sync_to_async
 from PIL import Image, ImageOps
 
-OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+from .governor import (
+    ModelCallGovernorTimeout,
+    async_model_call_slot,
+    model_call_slot,
+    record_model_call_response,
+)
+
+OPENAI_CHAT_COMPLETIONS_URL = os.getenv("OPENAI_CHAT_COMPLETIONS_URL", "https://api.openai.com/v1/chat/completions")
 CATEGORY_SUPERMARKET = "supermarket"
 CATEGORY_BILLS = "bills"
 CATEGORY_TAXES = "taxes"
@@ -24,6 +33,7 @@ ALLOWED_CATEGORIES = {
 DEFAULT_OPENAI_IMAGE_MAX_DIMENSION = 1600
 DEFAULT_OPENAI_IMAGE_MAX_BYTES = 4 * 1024 * 1024
 DEFAULT_OPENAI_IMAGE_JPEG_QUALITY = 80
+DEFAULT_OPENAI_RATE_LIMIT_RETRIES = 2
 
 
 class ReceiptAnalysisError(Exception):
@@ -170,13 +180,13 @@ def _infer_category_from_text(parsed: dict[str, Any]) -> str:
     return CATEGORY_OTHER
 
 
-def analyze_receipt_image(
+def _openai_request(
     image_bytes: bytes,
     mime_type: str,
     *,
     bulk_index: int | None = None,
     bulk_total: int | None = None,
-) -> dict[str, Any]:
+) -> tuple[dict[str, str], dict[str, Any]]:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ReceiptAnalysisError("OPENAI_API_KEY is not set")
@@ -231,20 +241,18 @@ def analyze_receipt_image(
             }
         ],
     }
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    return headers, payload
 
-    try:
-        response = requests.post(
-            OPENAI_CHAT_COMPLETIONS_URL,
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-            timeout=60,
-        )
-    except requests.RequestException as exc:
-        raise ReceiptAnalysisError("Could not reach OpenAI receipt service.") from exc
 
+def _rate_limit_retries() -> int:
+    return int(os.getenv("OPENAI_RATE_LIMIT_RETRIES", str(DEFAULT_OPENAI_RATE_LIMIT_RETRIES)))
+
+
+def _parse_openai_response(response) -> dict[str, Any]:
     if response.status_code >= 400:
         raise ReceiptAnalysisError(f"OpenAI request failed: {response.status_code} {response.text}")
 
@@ -263,3 +271,74 @@ def analyze_receipt_image(
     if parsed["category"] == CATEGORY_OTHER:
         parsed["category"] = _infer_category_from_text(parsed)
     return parsed
+
+
+def analyze_receipt_image(
+    image_bytes: bytes,
+    mime_type: str,
+    *,
+    bulk_index: int | None = None,
+    bulk_total: int | None = None,
+) -> dict[str, Any]:
+    headers, payload = _openai_request(image_bytes, mime_type, bulk_index=bulk_index, bulk_total=bulk_total)
+
+    rate_limit_retries = _rate_limit_retries()
+    for attempt in range(rate_limit_retries + 1):
+        try:
+            with model_call_slot():
+                response = requests.post(
+                    OPENAI_CHAT_COMPLETIONS_URL,
+                    headers=headers,
+                    json=payload,
+                    timeout=60,
+                )
+                record_model_call_response(response.status_code, getattr(response, "headers", None))
+        except ModelCallGovernorTimeout as exc:
+            raise ReceiptAnalysisError("Receipt analysis is busy right now. Please try again shortly.") from exc
+        except requests.RequestException as exc:
+            raise ReceiptAnalysisError("Could not reach OpenAI receipt service.") from exc
+
+        # A 429 pauses the governor for every worker, so the retry queues behind it.
+        if response.status_code != 429 or attempt == rate_limit_retries:
+            break
+
+    return _parse_openai_response(response)
+
+
+async def analyze_receipt_image_async(
+    image_bytes: bytes,
+    mime_type: str,
+    *,
+    bulk_index: int | None = None,
+    bulk_total: int | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    headers, payload = await sync_to_async(_openai_request, thread_sensitive=False)(
+        image_bytes,
+        mime_type,
+        bulk_index=bulk_index,
+        bulk_total=bulk_total,
+    )
+
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(timeout=60)
+    try:
+        rate_limit_retries = _rate_limit_retries()
+        for attempt in range(rate_limit_retries + 1):
+            try:
+                async with async_model_call_slot():
+                    response = await client.post(OPENAI_CHAT_COMPLETIONS_URL, headers=headers, json=payload)
+                    await sync_to_async(record_model_call_response)(response.status_code, response.headers)
+            except ModelCallGovernorTimeout as exc:
+                raise ReceiptAnalysisError("Receipt analysis is busy right now. Please try again shortly.") from exc
+            except httpx.HTTPError as exc:
+                raise ReceiptAnalysisError("Could not reach OpenAI receipt service.") from exc
+
+            if response.status_code != 429 or attempt == rate_limit_retries:
+                break
+    finally:
+        if owns_client:
+            await client.aclose()
+
+    return _parse_openai_response(response)
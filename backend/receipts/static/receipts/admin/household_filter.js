@@ -0,0 +1,19 @@
+"use strict";
+// Applies the household autocomplete list filter by reloading the changelist with the picked id.
+window.addEventListener("load", function () {
+  const $ = window.django && window.django.jQuery;
+  if (!$) {
+    return;
+  }
+  $(".household-autocomplete-filter").on("change", function () {
+    const url = new URL(window.location.href);
+    const param = this.dataset.queryParam;
+    if (this.value) {
+      url.searchParams.set(param, this.value);
+    } else {
+      url.searchParams.delete(param);
+    }
+    url.searchParams.delete("p");
+    window.location.assign(url.toString());
+  });
+});
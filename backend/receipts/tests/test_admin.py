@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from receipts.models import HouseholdSession, Receipt
+
+
+class ReceiptAdminTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+        self.households = []
+        for name in ("Brick House", "Glass House", "Straw House"):
+            household = HouseholdSession(household_name=name, member_1_name="Alex", member_2_name="Jamie")
+            household.set_passcode("1234")
+            household.save()
+            self.households.append(household)
+        today = timezone.localdate()
+        for index, household in enumerate(self.households):
+            for offset in range(3):
+                Receipt.objects.create(
+                    household=household,
+                    uploaded_by=Receipt.USER_1,
+                    vendor=f"Vendor {index}-{offset}",
+                    total="10.00",
+                    expense_date=today - timedelta(days=offset),
+                    items=[{"name": "Oat milk" if offset == 0 else "Bread", "total_price": "10.00"}],
+                    is_saved=True,
+                )
+        self.url = reverse("admin:receipts_receipt_changelist")
+
+    def _result_ids(self, response):
+        return sorted(receipt.id for receipt in response.context["cl"].result_list)
+
+    def test_changelist_joins_households_instead_of_fetching_per_row(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["cl"].result_list), 9)
+        household_queries = [
+            query["sql"] for query in queries.captured_queries if 'FROM "receipts_householdsession"' in query["sql"]
+        ]
+        self.assertEqual(household_queries, [])
+        self.assertContains(response, "household-autocomplete-filter")
+
+    def test_household_filter_lists_only_the_selected_household(self):
+        household = self.households[1]
+
+        response = self.client.get(self.url, {"household__id__exact": household.id})
+
+        self.assertEqual(self._result_ids(response), sorted(household.receipts.values_list("id", flat=True)))
+        self.assertContains(response, f'<option value="{household.id}" selected>{household}</option>', html=True)
+        self.assertNotContains(response, str(self.households[2]))
+        self.assertEqual(self._result_ids(self.client.get(self.url, {"household__id__exact": "abc"})), [])
+
+    def test_search_matches_text_household_code_and_id(self):
+        household = self.households[0]
+        receipt = household.receipts.order_by("id").first()
+
+        by_text = self.client.get(self.url, {"q": "oat milk"})
+        by_code = self.client.get(self.url, {"q": household.code.lower()})
+        by_id = self.client.get(self.url, {"q": str(receipt.id)})
+
+        self.assertEqual(
+            self._result_ids(by_text),
+            sorted(Receipt.objects.filter(items__icontains="oat milk").values_list("id", flat=True)),
+        )
+        self.assertEqual(self._result_ids(by_code), sorted(household.receipts.values_list("id", flat=True)))
+        self.assertIn(receipt.id, self._result_ids(by_id))
+
+    def test_receipts_without_a_household_save_and_delete(self):
+        model_admin = admin.site._registry[Receipt]
+        request = RequestFactory().post(self.url)
+        form = type("Form", (), {"changed_data": ["vendor"]})()
+        orphan = Receipt(uploaded_by=Receipt.USER_1, vendor="Market", total="5.00", is_saved=True)
+        versions = {household.id: household.data_version for household in self.households}
+
+        model_admin.save_model(request, orphan, form, change=False)
+        orphan.total = "6.00"
+        model_admin.save_model(request, orphan, form, change=True)
+        model_admin.delete_model(request, orphan)
+        others = [
+            Receipt.objects.create(uploaded_by=Receipt.USER_1, vendor="Market", total="5.00", is_saved=True),
+            self.households[0].receipts.order_by("id").first(),
+        ]
+        model_admin.delete_queryset(request, Receipt.objects.filter(id__in=[receipt.id for receipt in others]))
+
+        self.assertFalse(Receipt.objects.filter(id__in=[orphan.id, *(receipt.id for receipt in others)]).exists())
+        self.households[0].refresh_from_db()
+        self.assertEqual(self.households[0].data_version, versions[self.households[0].id] + 1)
@@ -1,16 +1,41 @@
 from datetime import timedelta
+import io
+import json
+import tempfile
 from unittest.mock import patch
+import zipfile
 
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from receipts.models import HouseholdNotification, HouseholdSession, Receipt
+from receipts.rollups import refresh_household_months
 from receipts.services import ReceiptAnalysisError
 
 
+def _png_upload(name: str) -> SimpleUploadedFile:
+    output = io.BytesIO()
+    Image.new("RGB", (4, 4), "white").save(output, format="PNG")
+    return SimpleUploadedFile(name, output.getvalue(), content_type="image/png")
+
+
+def _zip_upload(name: str, entries: dict[str, bytes]) -> SimpleUploadedFile:
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, "w") as archive:
+        for entry_name, data in entries.items():
+            archive.writestr(entry_name, data)
+    return SimpleUploadedFile(name, output.getvalue(), content_type="application/zip")
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
 class ReceiptApiTests(APITestCase):
     def setUp(self):
         self.client = APIClient()
@@ -31,6 +56,10 @@ class ReceiptApiTests(APITestCase):
         self.expenses_url = reverse("receipt-expenses-overview")
         self.manual_url = reverse("expense-manual-create")
         self.settle_url = reverse("household-settle")
+        self.bootstrap_url = reverse("receipt-bootstrap")
+        self.changes_url = reverse("receipt-changes")
+        self.notifications_url = reverse("notification-inbox")
+        self.mark_read_url = reverse("notification-mark-read")
 
     def _set_session(self, client: APIClient, user_code: str):
         session = client.session
@@ -47,7 +76,7 @@ class ReceiptApiTests(APITestCase):
         expense_date=None,
         category="other",
     ):
-        return Receipt.objects.create(
+        receipt = Receipt.objects.create(
             household=self.household,
             uploaded_by=uploaded_by,
             expense_date=expense_date or timezone.localdate(),
@@ -58,6 +87,8 @@ class ReceiptApiTests(APITestCase):
             items=items or [],
             is_saved=is_saved,
         )
+        refresh_household_months(self.household.id, [receipt.expense_date])
+        return receipt
 
     def test_login_returns_session_token(self):
         response = self.client.post(
@@ -129,6 +160,78 @@ class ReceiptApiTests(APITestCase):
         self.assertEqual(len(response.data["recent_receipts"]), 4)
         self.assertTrue(all(entry.get("id") for entry in response.data["recent_receipts"]))
 
+    def test_dashboard_answers_matching_etag_with_304_until_a_write(self):
+        self._set_session(self.client, Receipt.USER_1)
+        self._create_receipt(uploaded_by=Receipt.USER_1, total="10.00")
+
+        response = self.client.get(self.dashboard_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.dashboard_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(any("receipts_receipt" in query["sql"] for query in queries.captured_queries))
+
+        self.client.post(self.manual_url, {"vendor": "Cafe", "total": 5, "currency": "USD"}, format="json")
+        response = self.client.get(self.dashboard_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["current_month"]["receipt_count"], 2)
+
+    @patch("receipts.views.READ_CACHE_SECONDS", 60)
+    def test_expenses_overview_serves_cached_body_for_same_data_version(self):
+        cache.clear()
+        self._set_session(self.client, Receipt.USER_1)
+        self._create_receipt(uploaded_by=Receipt.USER_1, total="10.00")
+
+        first = self.client.get(self.expenses_url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.expenses_url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertFalse(any("receipts_receipt" in query["sql"] for query in queries.captured_queries))
+
+    def test_bootstrap_matches_separate_reads_in_fewer_queries(self):
+        self._set_session(self.client, Receipt.USER_1)
+        last_month_day = timezone.localdate().replace(day=1) - timedelta(days=1)
+        for amount in ["10.00", "20.00", "30.00", "40.00", "50.00"]:
+            self._create_receipt(uploaded_by=Receipt.USER_1, total=amount)
+        self._create_receipt(uploaded_by=Receipt.USER_2, total="15.00", expense_date=last_month_day)
+        self._create_receipt(uploaded_by=Receipt.USER_2, total="5.00", is_saved=False)
+
+        separate = {}
+        separate_queries = 0
+        for key, url in (
+            ("session", self.me_url),
+            ("dashboard", self.dashboard_url),
+            ("expenses", self.expenses_url),
+            ("analyses", self.analyses_url),
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                separate[key] = self.client.get(url).json()
+            separate_queries += len(queries.captured_queries)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.bootstrap_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payload = response.json()
+        self.assertEqual(payload["dashboard"], separate["dashboard"])
+        self.assertEqual(payload["expenses"], separate["expenses"])
+        self.assertEqual(payload["analyses"], separate["analyses"])
+        self.assertEqual(payload["session"]["household_code"], separate["session"]["household_code"])
+        self.assertLess(len(queries.captured_queries), separate_queries)
+
+    def test_bootstrap_without_session_returns_empty_session_only(self):
+        response = self.client.get(self.bootstrap_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ["session"])
+        self.assertIsNone(response.data["session"]["user"])
+
     def test_analyses_response_includes_receipt_ids(self):
         self._set_session(self.client, Receipt.USER_1)
         self._create_receipt(uploaded_by=Receipt.USER_1, total="12.00", is_saved=True)
@@ -138,6 +241,86 @@ class ReceiptApiTests(APITestCase):
         self.assertEqual(len(response.data["analyses"]), 1)
         self.assertTrue(response.data["analyses"][0].get("id"))
 
+    @patch("receipts.views.ANALYSES_DEFAULT_PAGE_SIZE", 2)
+    def test_analyses_without_paging_parameters_return_the_first_page(self):
+        self._set_session(self.client, Receipt.USER_1)
+        for total in ("1.00", "2.00", "3.00"):
+            self._create_receipt(uploaded_by=Receipt.USER_1, total=total, is_saved=True)
+
+        first = self.client.get(self.analyses_url)
+        second = self.client.get(self.analyses_url, {"cursor": first.data["next_cursor"]})
+
+        self.assertEqual(len(first.data["analyses"]), 2)
+        self.assertEqual(len(second.data["analyses"]), 1)
+        self.assertIsNone(second.data["next_cursor"])
+
+    def test_analyses_keyset_pages_cover_filtered_history_once(self):
+        self._set_session(self.client, Receipt.USER_1)
+        today = timezone.localdate()
+        expected_ids = []
+        for offset in range(7):
+            receipt = self._create_receipt(
+                uploaded_by=Receipt.USER_1,
+                total="5.00",
+                expense_date=today - timedelta(days=offset // 2),
+                category="bills",
+            )
+            expected_ids.append(receipt.id)
+        self._create_receipt(uploaded_by=Receipt.USER_2, total="5.00", category="bills")
+        self._create_receipt(uploaded_by=Receipt.USER_1, total="5.00", category="other")
+
+        seen_ids = []
+        params = {"limit": 3, "category": "bills", "member": Receipt.USER_1, "include_count": "true"}
+        while True:
+            response = self.client.get(self.analyses_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 7)
+            seen_ids.extend(entry["id"] for entry in response.data["analyses"])
+            if not response.data["next_cursor"]:
+                break
+            params["cursor"] = response.data["next_cursor"]
+
+        self.assertEqual(len(seen_ids), 7)
+        self.assertEqual(set(seen_ids), set(expected_ids))
+        expense_dates = [Receipt.objects.get(id=receipt_id).expense_date for receipt_id in seen_ids]
+        self.assertEqual(expense_dates, sorted(expense_dates, reverse=True))
+
+    def test_sparse_fields_narrow_selected_columns_and_response_keys(self):
+        self._set_session(self.client, Receipt.USER_1)
+        for amount in ["10.00", "20.00", "30.00"]:
+            self._create_receipt(
+                uploaded_by=Receipt.USER_1,
+                total=amount,
+                items=[{"name": "Milk", "total_price": float(amount), "assigned_to": "shared"}],
+            )
+        list_fields = {"id", "vendor", "expense_date", "total", "uploaded_by_name"}
+
+        for url in (self.analyses_url, self.dashboard_url):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {"fields": ",".join(sorted(list_fields))})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            rows = response.data.get("analyses") or response.data["recent_receipts"]
+            self.assertTrue(rows)
+            self.assertTrue(all(set(row) == list_fields for row in rows))
+            self.assertFalse(any('"items"' in query["sql"] for query in queries.captured_queries), url)
+
+        first = self.client.get(self.analyses_url, {"fields": "vendor", "limit": 2})
+        second = self.client.get(self.analyses_url, {"fields": "vendor", "limit": 2, "cursor": first.data["next_cursor"]})
+        self.assertEqual([list(row) for row in first.data["analyses"]], [["vendor"], ["vendor"]])
+        self.assertEqual(len(second.data["analyses"]), 1)
+        self.assertIsNone(second.data["next_cursor"])
+
+        response = self.client.get(self.analyses_url, {"exclude": "items,raw_text"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("exclude", response.data)
+
+    def test_analyses_rejects_tampered_cursor(self):
+        self._set_session(self.client, Receipt.USER_1)
+
+        response = self.client.get(self.analyses_url, {"limit": 2, "cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", response.data)
+
     @patch("receipts.views.analyze_receipt_image")
     def test_single_analyze_creates_receipt(self, mock_analyze):
         self._set_session(self.client, Receipt.USER_1)
@@ -207,6 +390,51 @@ class ReceiptApiTests(APITestCase):
         self.assertEqual(response.data["current_month_categories"]["combined"], 30.0)
         self.assertEqual(response.data["last_month_categories"]["combined"], 20.0)
 
+    def test_expenses_overview_query_count_does_not_grow_with_history(self):
+        self._set_session(self.client, Receipt.USER_1)
+        current_start = timezone.localdate().replace(day=1)
+        self._create_receipt(uploaded_by=Receipt.USER_1, total="10.00", category="bills")
+
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(self.expenses_url)
+
+        for month_offset in range(1, 6):
+            month_day = current_start - timedelta(days=28 * month_offset)
+            self._create_receipt(uploaded_by=Receipt.USER_2, total="5.00", expense_date=month_day)
+            self._create_receipt(uploaded_by=Receipt.USER_1, total="7.50", expense_date=month_day, category="bills")
+
+        with CaptureQueriesContext(connection) as grown:
+            response = self.client.get(self.expenses_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(grown.captured_queries), len(baseline.captured_queries))
+        trend_combined = sum(month["totals"]["combined"] for month in response.data["six_month_trend"])
+        self.assertEqual(trend_combined, 72.5)
+        self.assertEqual(response.data["current_month_categories"]["bills"], 10.0)
+
+    def test_list_and_aggregate_reads_do_not_load_raw_text(self):
+        self._set_session(self.client, Receipt.USER_1)
+        self._create_receipt(uploaded_by=Receipt.USER_1, total="10.00")
+
+        for url in (self.dashboard_url, self.expenses_url, self.analyses_url):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(any("raw_text" in query["sql"] for query in queries.captured_queries), url)
+
+    def test_receipt_detail_returns_raw_text(self):
+        self._set_session(self.client, Receipt.USER_1)
+        receipt = self._create_receipt(uploaded_by=Receipt.USER_1, total="10.00")
+        Receipt.objects.filter(id=receipt.id).update(raw_text="MILK 10.00")
+
+        response = self.client.get(reverse("receipt-detail", kwargs={"receipt_id": receipt.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["receipt"]["raw_text"], "MILK 10.00")
+        self.assertEqual(response.data["receipt"]["total"], 10.0)
+
+        response = self.client.get(reverse("receipt-detail", kwargs={"receipt_id": receipt.id + 999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_receipt_item_assignment_marks_receipt_saved(self):
         self._set_session(self.client, Receipt.USER_1)
         receipt = self._create_receipt(
@@ -252,7 +480,7 @@ class ReceiptApiTests(APITestCase):
         receipt = self._create_receipt(uploaded_by=Receipt.USER_1, total="25.00", is_saved=True)
 
         response = self.client.delete(
-            reverse("receipt-delete", kwargs={"receipt_id": receipt.id}),
+            reverse("receipt-detail", kwargs={"receipt_id": receipt.id}),
             format="json",
         )
 
@@ -274,6 +502,47 @@ class ReceiptApiTests(APITestCase):
         self.assertEqual(response.data["detail"], "Receipt deleted.")
         self.assertFalse(Receipt.objects.filter(id=receipt.id).exists())
 
+    def test_changes_returns_only_receipts_written_or_deleted_since_cursor(self):
+        self._set_session(self.client, Receipt.USER_1)
+        untouched = self._create_receipt(uploaded_by=Receipt.USER_1, total="10.00")
+        doomed = self._create_receipt(uploaded_by=Receipt.USER_2, total="20.00")
+
+        snapshot = self.client.get(self.changes_url)
+        self.assertEqual(snapshot.status_code, status.HTTP_200_OK)
+        self.assertTrue(snapshot.data["full"])
+        self.assertEqual({row["id"] for row in snapshot.data["changed"]}, {untouched.id, doomed.id})
+        cursor = snapshot.data["cursor"]
+
+        created = self.client.post(self.manual_url, {"vendor": "Cafe", "total": 5, "currency": "USD"}, format="json")
+        self.client.delete(reverse("receipt-detail", kwargs={"receipt_id": doomed.id}))
+        self.client.post(self.settle_url, {}, format="json")
+
+        delta = self.client.get(self.changes_url, {"since": cursor})
+        self.assertEqual(delta.status_code, status.HTTP_200_OK)
+        self.assertFalse(delta.data["full"])
+        # Settling rewrote every open receipt, including the one created before the cursor.
+        self.assertEqual({row["id"] for row in delta.data["changed"]}, {created.data["receipt"]["id"], untouched.id})
+        self.assertFalse(Receipt.objects.filter(settled_at__isnull=True).exists())
+        self.assertEqual(delta.data["deleted"], [doomed.id])
+
+        caught_up = self.client.get(self.changes_url, {"since": delta.data["cursor"]})
+        self.assertEqual(caught_up.data["changed"], [])
+        self.assertEqual(caught_up.data["deleted"], [])
+        not_modified = self.client.get(
+            self.changes_url,
+            {"since": delta.data["cursor"]},
+            HTTP_IF_NONE_MATCH=caught_up["ETag"],
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_rejects_cursor_ahead_of_household(self):
+        self._set_session(self.client, Receipt.USER_1)
+
+        response = self.client.get(self.changes_url, {"since": 999})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("since", response.data)
+
     @patch("receipts.views.analyze_receipt_image")
     def test_bulk_analyze_creates_multiple_receipts(self, mock_analyze):
         self._set_session(self.client, Receipt.USER_1)
@@ -378,3 +647,247 @@ class ReceiptApiTests(APITestCase):
         open_receipts = self.household.receipts.filter(settled_at__isnull=True, is_saved=True)
         self.assertEqual(open_receipts.count(), 0)
         self.assertEqual(HouseholdNotification.objects.filter(household=self.household).count(), 2)
+
+    def test_notification_inbox_pages_and_marks_read(self):
+        self._set_session(self.client, Receipt.USER_1)
+        for total in ("100.00", "50.00"):
+            self._create_receipt(uploaded_by=Receipt.USER_2, total=total)
+            self.assertEqual(self.client.post(self.settle_url, {}, format="json").status_code, status.HTTP_200_OK)
+
+        dashboard = self.client.get(self.dashboard_url).data
+        self.assertEqual(dashboard["unread_notifications"], 2)
+        self.assertEqual(
+            [entry["message"] for entry in dashboard["notifications"]],
+            [
+                "Settlement completed: You paid 25.00 USD to Jamie.",
+                "Settlement completed: You received 25.00 USD from Alex.",
+            ],
+        )
+
+        first_page = self.client.get(self.notifications_url, {"limit": 1}).data
+        self.assertEqual(first_page["unread_count"], 2)
+        self.assertIn("25.00", first_page["notifications"][0]["message"])
+        second_page = self.client.get(self.notifications_url, {"limit": 1, "cursor": first_page["next_cursor"]}).data
+        self.assertIn("50.00", second_page["notifications"][0]["message"])
+        self.assertIsNone(second_page["next_cursor"])
+
+        newest_id = first_page["notifications"][0]["id"]
+        response = self.client.post(self.mark_read_url, {"ids": [newest_id]}, format="json")
+        self.assertEqual(response.data, {"updated": 1, "unread_count": 1})
+        self.assertTrue(self.client.get(self.dashboard_url).data["notifications"][0]["read"])
+
+        response = self.client.post(self.mark_read_url, {"all": True}, format="json")
+        self.assertEqual(response.data, {"updated": 1, "unread_count": 0})
+        self.household.refresh_from_db()
+        self.assertEqual(self.household.member_1_unread_notifications, 0)
+        self.assertEqual(self.household.member_2_unread_notifications, 2)
+        self.assertEqual(self.client.post(self.mark_read_url, {}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_latest_notifications_load_in_one_query(self):
+        self._set_session(self.client, Receipt.USER_1)
+        for total in ("10.00", "30.00"):
+            self._create_receipt(uploaded_by=Receipt.USER_1, total=total)
+            self.client.post(self.settle_url, {}, format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.settle_url, {}, format="json")
+        notification_reads = [query for query in queries if 'FROM "receipts_householdnotification"' in query["sql"]]
+        self.assertEqual(len(notification_reads), 1)
+        self.assertEqual([entry["user"] for entry in response.data["notifications"]], ["Alex", "Jamie"])
+        self.assertEqual(response.data["notifications"][0]["message"], "Settlement completed: No payment was required.")
+
+    @patch("receipts.views.publish_household_event")
+    def test_writes_publish_household_events(self, mock_publish):
+        self._set_session(self.client, Receipt.USER_1)
+        receipt = self._create_receipt(uploaded_by=Receipt.USER_2, total="12.00")
+        kept = self._create_receipt(uploaded_by=Receipt.USER_1, total="8.00")
+
+        self.client.delete(reverse("receipt-detail", args=[receipt.id]))
+        self.client.post(self.settle_url, {}, format="json")
+        self.client.post(self.mark_read_url, {"all": True}, format="json")
+
+        self.household.refresh_from_db()
+        version = self.household.data_version
+        self.assertEqual(
+            [call.args for call in mock_publish.call_args_list],
+            [
+                (self.household.id, "receipt.deleted", version - 2, [receipt.id]),
+                (self.household.id, "household.settled", version - 1, [kept.id]),
+                (self.household.id, "notifications.read", version, None),
+            ],
+        )
+        self.assertEqual(mock_publish.call_args_list[-1].kwargs, {"user": Receipt.USER_1})
+
+    def test_search_ranks_vendor_then_items_then_raw_text_and_pages(self):
+        self._set_session(self.client, Receipt.USER_1)
+        by_vendor = self._create_receipt(uploaded_by=Receipt.USER_1, total="4.00")
+        by_item = self._create_receipt(
+            uploaded_by=Receipt.USER_1,
+            total="3.00",
+            items=[{"name": "Oat Milk", "total_price": 3}],
+        )
+        by_text = self._create_receipt(uploaded_by=Receipt.USER_2, total="2.00")
+        self._create_receipt(uploaded_by=Receipt.USER_2, total="1.00")
+        Receipt.objects.filter(id=by_vendor.id).update(vendor="Milk Bar")
+        Receipt.objects.filter(id=by_text.id).update(raw_text="WHOLE MILK 2.00")
+        other_household = HouseholdSession.objects.create(
+            household_name="Elsewhere",
+            member_1_name="A",
+            member_2_name="B",
+            passcode_hash="unused",
+        )
+        Receipt.objects.create(household=other_household, uploaded_by=Receipt.USER_1, vendor="Milk Bar", total="9.00")
+        search_url = reverse("receipt-search")
+
+        first_page = self.client.get(search_url, {"q": "milk", "limit": 2, "fields": "vendor"})
+        self.assertEqual(first_page.status_code, status.HTTP_200_OK)
+        self.assertEqual(first_page.data["results"], [{"vendor": "Milk Bar"}, {"vendor": "Store"}])
+        second_page = self.client.get(search_url, {"q": "milk", "limit": 2, "cursor": first_page.data["next_cursor"]})
+        self.assertEqual([row["id"] for row in second_page.data["results"]], [by_text.id])
+        self.assertIsNone(second_page.data["next_cursor"])
+
+        both_terms = self.client.get(search_url, {"q": "oat milk"})
+        self.assertEqual([row["id"] for row in both_terms.data["results"]], [by_item.id])
+        reused_cursor = self.client.get(search_url, {"q": "bread", "cursor": first_page.data["next_cursor"]})
+        self.assertEqual(reused_cursor.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(search_url).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_matches_item_names_not_other_item_fields(self):
+        self._set_session(self.client, Receipt.USER_1)
+        receipt = self._create_receipt(
+            uploaded_by=Receipt.USER_1,
+            total="6.00",
+            is_saved=False,
+            items=[
+                {"name": "Café Crème", "quantity": 1, "total_price": 4, "assigned_to": "shared"},
+                {"name": 'Bread "Sourdough"', "total_price": 2, "assigned_to": "user_1"},
+            ],
+        )
+        search_url = reverse("receipt-search")
+
+        for query in ("crème", "sourdough", "BREAD"):
+            response = self.client.get(search_url, {"q": query})
+            self.assertEqual([row["id"] for row in response.data["results"]], [receipt.id], query)
+        for query in ("shared", "total_price", "quantity", "user_1", "name"):
+            self.assertEqual(self.client.get(search_url, {"q": query}).data["results"], [], query)
+
+    def test_dashboard_settlement_sums_assigned_items(self):
+        self._set_session(self.client, Receipt.USER_1)
+        self._create_receipt(
+            uploaded_by=Receipt.USER_1,
+            total="30.00",
+            items=[
+                {"name": "Steak", "total_price": 20, "assigned_to": Receipt.USER_2},
+                {"name": "Bread", "total_price": 10, "assigned_to": "shared"},
+            ],
+        )
+        self._create_receipt(uploaded_by=Receipt.USER_2, total="10.00")
+        settled = self._create_receipt(uploaded_by=Receipt.USER_1, total="500.00")
+        Receipt.objects.filter(id=settled.id).update(settled_at=timezone.now())
+
+        response = self.client.get(self.dashboard_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["current_month"]["receipt_count"], 3)
+        self.assertEqual(response.data["current_month"]["totals"]["user_1"], 530.0)
+        self.assertEqual(response.data["settlement"]["payer"], Receipt.USER_2)
+        self.assertEqual(response.data["settlement"]["amount"], 20.0)
+
+    @patch("receipts.views.analyze_receipt_image")
+    def test_bulk_analyze_streams_ndjson_when_requested(self, mock_analyze):
+        self._set_session(self.client, Receipt.USER_1)
+        mock_analyze.side_effect = [
+            {
+                "vendor": "Market A",
+                "receipt_date": str(timezone.localdate()),
+                "currency": "USD",
+                "category": "supermarket",
+                "total": 13.0,
+                "items": [{"name": "Bread", "quantity": 1, "unit_price": 4.0, "total_price": 4.0}],
+                "raw_text": "Bread",
+            },
+            ReceiptAnalysisError("Could not parse ticket."),
+        ]
+
+        response = self.client.post(
+            self.bulk_analyze_url,
+            {"images": [_png_upload("a.png"), _png_upload("b.png")]},
+            format="multipart",
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([line["type"] for line in lines], ["receipt", "failed", "summary"])
+        self.assertEqual(lines[0]["receipt"]["vendor"], "Market A")
+        self.assertEqual(lines[1]["filename"], "b.png")
+        self.assertEqual(lines[2], {"type": "summary", "processed_count": 1, "failed_count": 1})
+
+    def test_bulk_analyze_ndjson_errors_are_single_lines(self):
+        response = self.client.post(
+            self.bulk_analyze_url,
+            {"images": [_png_upload("a.png")]},
+            format="multipart",
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(json.loads(response.content), {"detail": "Authentication required. Login first."})
+
+    @patch("receipts.views.analyze_receipt_image")
+    def test_archive_import_analyzes_each_image_entry(self, mock_analyze):
+        self._set_session(self.client, Receipt.USER_1)
+        mock_analyze.side_effect = lambda **kwargs: {
+            "vendor": f"Store {kwargs['bulk_index']}",
+            "receipt_date": str(timezone.localdate()),
+            "currency": "USD",
+            "total": 5.0,
+            "items": [],
+        }
+        archive = _zip_upload(
+            "receipts.zip",
+            {
+                "2025/jan.png": _png_upload("jan.png").read(),
+                "2025/notes.txt": b"not a receipt",
+                "__MACOSX/2025/._jan.png": b"resource fork",
+                "2025/feb.jpg": _png_upload("feb.png").read(),
+            },
+        )
+
+        response = self.client.post(reverse("receipt-analyze-archive"), {"archive": archive}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["processed_count"], 2)
+        self.assertEqual([receipt["vendor"] for receipt in response.data["receipts"]], ["Store 1", "Store 3"])
+        self.assertEqual(response.data["failed"][0]["filename"], "2025/notes.txt")
+        self.assertEqual(mock_analyze.call_count, 2)
+        self.assertEqual(mock_analyze.call_args.kwargs["bulk_total"], 3)
+        receipt = Receipt.objects.get(id=response.data["receipts"][0]["id"])
+        self.assertTrue(receipt.image.name.startswith("receipts/jan"))
+
+    @patch("receipts.views.MAX_ANALYZE_UPLOAD_BYTES", 10)
+    def test_archive_import_streams_progress_and_entry_failures(self):
+        self._set_session(self.client, Receipt.USER_1)
+        archive = _zip_upload("receipts.zip", {"big.png": b"x" * 64})
+
+        response = self.client.post(
+            reverse("receipt-analyze-archive"),
+            {"archive": archive},
+            format="multipart",
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(lines[0]["type"], "failed")
+        self.assertEqual(lines[0]["filename"], "big.png")
+        self.assertIn("too large", lines[0]["detail"])
+        self.assertEqual(lines[-1], {"type": "summary", "processed_count": 0, "failed_count": 1})
+
+    def test_archive_import_rejects_non_zip_upload(self):
+        self._set_session(self.client, Receipt.USER_1)
+        upload = SimpleUploadedFile("receipts.zip", b"definitely not a zip", content_type="application/zip")
+
+        response = self.client.post(reverse("receipt-analyze-archive"), {"archive": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["detail"], "Upload a valid ZIP archive.")
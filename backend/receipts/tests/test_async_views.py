@@ -0,0 +1,270 @@
+import asyncio
+import io
+import json
+import tempfile
+from unittest import skipUnless
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from receipts.events import (
+    EVENT_CHANNEL,
+    EVENT_RECEIPT_CREATED,
+    MAX_EVENT_IDS,
+    apublish_household_event,
+    encode_event,
+    household_event_hub,
+    listen_household_events,
+)
+from receipts.models import HouseholdSession, Receipt
+from receipts.services import ReceiptAnalysisError
+from receipts.views import EVENT_TICKET_SECONDS, _build_event_ticket, _build_session_token
+
+
+def _png_upload(name: str) -> SimpleUploadedFile:
+    output = io.BytesIO()
+    Image.new("RGB", (4, 4), "white").save(output, format="PNG")
+    return SimpleUploadedFile(name, output.getvalue(), content_type="image/png")
+
+
+def _analysis(vendor: str, total: float) -> dict:
+    return {
+        "vendor": vendor,
+        "receipt_date": str(timezone.localdate()),
+        "currency": "USD",
+        "category": "supermarket",
+        "subtotal": total,
+        "tax": 0.0,
+        "tip": 0.0,
+        "total": total,
+        "items": [{"name": "Bread", "quantity": 1, "unit_price": total, "total_price": total}],
+        "raw_text": "Bread",
+    }
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AsyncReceiptViewsTests(TestCase):
+    def setUp(self):
+        self.household = HouseholdSession(
+            household_name="Brick House",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+        )
+        self.household.set_passcode("1234")
+        self.household.save()
+        self.headers = {"Authorization": f"Bearer {_build_session_token(self.household, Receipt.USER_1)}"}
+
+    async def test_async_endpoints_require_authentication(self):
+        response = await self.async_client.get(reverse("receipt-dashboard-async"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @patch("receipts.async_views.analyze_receipt_image_async", new_callable=AsyncMock)
+    async def test_async_analyze_creates_draft_receipt(self, mock_analyze):
+        mock_analyze.return_value = _analysis("Market A", 13.0)
+
+        response = await self.async_client.post(
+            reverse("receipt-analyze-async"),
+            {"image": _png_upload("one.png")},
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        receipt = await Receipt.objects.aget(id=response.json()["receipt"]["id"])
+        self.assertFalse(receipt.is_saved)
+        self.assertEqual((receipt.vendor, receipt.vendor_key), ("Market A", "market a"))
+
+    @patch("receipts.async_views.analyze_receipt_image_async", new_callable=AsyncMock)
+    async def test_async_bulk_analyze_keeps_upload_order_and_reports_failures(self, mock_analyze):
+        mock_analyze.side_effect = [
+            _analysis("Market A", 10.0),
+            ReceiptAnalysisError("Could not parse ticket."),
+            _analysis("Market C", 30.0),
+        ]
+
+        response = await self.async_client.post(
+            reverse("receipt-analyze-bulk-async"),
+            {"images": [_png_upload("a.png"), _png_upload("b.png"), _png_upload("c.png")]},
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.json()
+        self.assertEqual(data["processed_count"], 2)
+        self.assertEqual([receipt["vendor"] for receipt in data["receipts"]], ["Market A", "Market C"])
+        self.assertEqual(data["failed"], [{"filename": "b.png", "detail": "Could not parse ticket."}])
+
+    def test_async_dashboard_matches_sync_dashboard(self):
+        for amount, user_code in (("40.00", Receipt.USER_1), ("10.00", Receipt.USER_2)):
+            Receipt.objects.create(
+                household=self.household,
+                uploaded_by=user_code,
+                vendor="Store",
+                total=amount,
+                is_saved=True,
+            )
+
+        client = APIClient()
+        sync_response = client.get(reverse("receipt-dashboard"), HTTP_AUTHORIZATION=self.headers["Authorization"])
+        async_response = self.client.get(reverse("receipt-dashboard-async"), headers=self.headers)
+
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+        self.assertEqual(async_response.json()["settlement"]["amount"], 15.0)
+
+    def test_async_dashboard_honours_receipt_field_selection(self):
+        Receipt.objects.create(
+            household=self.household,
+            uploaded_by=Receipt.USER_1,
+            vendor="Store",
+            total="40.00",
+            is_saved=True,
+        )
+        client = APIClient()
+        params = {"fields": "id,vendor,total"}
+
+        sync_response = client.get(
+            reverse("receipt-dashboard"), params, HTTP_AUTHORIZATION=self.headers["Authorization"]
+        )
+        async_response = self.client.get(reverse("receipt-dashboard-async"), params, headers=self.headers)
+        full_response = self.client.get(reverse("receipt-dashboard-async"), headers=self.headers)
+
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+        self.assertEqual(list(async_response.json()["recent_receipts"][0]), ["id", "vendor", "total"])
+        # A field selection is a different body, so it must not share the full dashboard's ETag.
+        self.assertNotEqual(async_response["ETag"], full_response["ETag"])
+        invalid = self.client.get(reverse("receipt-dashboard-async"), {"fields": "secret"}, headers=self.headers)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", invalid.json())
+
+    @patch("receipts.events.EVENT_STREAM_POLL_SECONDS", 0.01)
+    async def test_event_stream_reports_household_changes(self):
+        unauthenticated = await self.async_client.get(reverse("receipt-events"))
+        self.assertEqual(unauthenticated.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        token = _build_session_token(self.household, Receipt.USER_2)
+        # The long-lived session token never opens a stream; only a ticket minted with it does.
+        for params in ({"token": token}, {"ticket": token}):
+            rejected = await self.async_client.get(reverse("receipt-events"), params)
+            self.assertEqual(rejected.status_code, status.HTTP_401_UNAUTHORIZED)
+        ticket_response = await self.async_client.post(
+            reverse("receipt-events-ticket"), headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(ticket_response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ticket_response.json()["expires_in"], EVENT_TICKET_SECONDS)
+
+        response = await self.async_client.get(reverse("receipt-events"), {"ticket": ticket_response.json()["ticket"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        messages = aiter(response.streaming_content)
+        self.assertEqual(await anext(messages), b'retry: 3000\n\ndata: {"type":"stream.ready","version":0}\n\n')
+        await self.household.abump_data_version()
+        self.assertEqual(await anext(messages), b'data: {"type":"household.changed","version":1}\n\n')
+        await messages.aclose()
+
+    def test_event_stream_is_refused_under_wsgi(self):
+        ticket_response = self.client.post(reverse("receipt-events-ticket"), headers=self.headers)
+        self.assertEqual(ticket_response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        ticket = _build_event_ticket(self.household, Receipt.USER_1)
+        response = self.client.get(reverse("receipt-events"), {"ticket": ticket})
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(response.streaming)
+
+    def test_event_payloads_drop_ids_past_the_notify_limit(self):
+        self.assertEqual(encode_event("receipt.deleted", 3, [7]), '{"type":"receipt.deleted","version":3,"ids":[7]}')
+        oversized = encode_event("household.settled", 4, range(MAX_EVENT_IDS + 1))
+        self.assertEqual(oversized, '{"type":"household.settled","version":4,"ids":null}')
+
+class AsyncDashboardQueryTests(TestCase):
+    async def test_async_dashboard_uses_session_cookie(self):
+        household = await sync_to_async(HouseholdSession.objects.create)(
+            household_name="Cookie House",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+            passcode_hash="unused",
+        )
+        session = await sync_to_async(lambda: self.async_client.session)()
+        session["household_id"] = household.id
+        session["user_code"] = Receipt.USER_2
+        await session.asave()
+
+        response = await self.async_client.get(reverse("receipt-dashboard-async"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["current_user_name"], "Jamie")
+
+
+async def _next_event(events):
+    """The next event payload, skipping heartbeats."""
+    while (payload := await anext(events)) is None:
+        pass
+    return payload
+
+
+def _listen_connection_count() -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND query = %s",
+            [f"LISTEN {EVENT_CHANNEL}"],
+        )
+        return cursor.fetchone()[0]
+
+
+@skipUnless(connection.vendor == "postgresql", "LISTEN/NOTIFY needs Postgres.")
+@patch("receipts.events.EVENT_STREAM_HEARTBEAT_SECONDS", 0.2)
+class ListenNotifyTests(TransactionTestCase):
+    # NOTIFY is only delivered on commit, so these tests cannot run inside a test transaction.
+
+    async def _household(self, name: str):
+        return await HouseholdSession.objects.acreate(
+            household_name=name,
+            member_1_name="Alex",
+            member_2_name="Jamie",
+            passcode_hash="unused",
+        )
+
+    async def test_one_listen_connection_fans_out_to_every_stream(self):
+        household = await self._household("Brick House")
+        other = await self._household("Other House")
+        streams = [listen_household_events(household.id, 0) for _ in range(2)]
+        bystander = listen_household_events(other.id, 0)
+        pending = [asyncio.ensure_future(_next_event(events)) for events in (*streams, bystander)]
+        hub = household_event_hub()
+        try:
+            await asyncio.wait_for(hub._listening.wait(), 5)
+            await apublish_household_event(household.id, EVENT_RECEIPT_CREATED, 1, [7], user=Receipt.USER_1)
+
+            first, second = await asyncio.wait_for(asyncio.gather(*pending[:2]), 5)
+            self.assertEqual(json.loads(first), {"type": "receipt.created", "version": 1, "ids": [7], "user": "user_1"})
+            self.assertEqual(second, first)
+            self.assertFalse(pending[2].done())
+
+            self.assertEqual(await sync_to_async(_listen_connection_count)(), 1)
+        finally:
+            pending[2].cancel()
+            await asyncio.gather(pending[2], return_exceptions=True)
+            for events in (*streams, bystander):
+                await events.aclose()
+            await hub.aclose()
+
+    async def test_stream_reports_writes_that_landed_before_it_listened(self):
+        household = await self._household("Brick House")
+        await household.abump_data_version()
+        events = listen_household_events(household.id, 0)
+        try:
+            payload = await asyncio.wait_for(_next_event(events), 5)
+            self.assertEqual(json.loads(payload), {"type": "household.changed", "version": 1})
+        finally:
+            await events.aclose()
+            await household_event_hub().aclose()
+
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from receipts.governor import (
+    OPENAI_GOVERNOR_KEY,
+    ModelCallGovernorTimeout,
+    acquire_model_call_slot,
+    model_call_slot,
+    parse_rate_limit_duration,
+    record_model_call_response,
+)
+from receipts.models import ModelCallGovernorState, ModelCallLease
+
+
+@patch.dict("os.environ", {"OPENAI_GOVERNOR_MAX_WAIT_SECONDS": "0"}, clear=False)
+class ModelCallGovernorTests(TestCase):
+    def test_parse_rate_limit_duration_accepts_openai_formats(self):
+        self.assertEqual(parse_rate_limit_duration("1s"), 1.0)
+        self.assertEqual(parse_rate_limit_duration("6m0s"), 360.0)
+        self.assertAlmostEqual(parse_rate_limit_duration("20ms"), 0.02)
+        self.assertEqual(parse_rate_limit_duration("2.5"), 2.5)
+        self.assertIsNone(parse_rate_limit_duration("soon"))
+
+    @patch.dict("os.environ", {"OPENAI_MAX_IN_FLIGHT": "1"}, clear=False)
+    def test_in_flight_limit_blocks_until_slot_released(self):
+        with model_call_slot():
+            with self.assertRaises(ModelCallGovernorTimeout):
+                acquire_model_call_slot()
+
+        self.assertFalse(ModelCallLease.objects.exists())
+        lease = acquire_model_call_slot()
+        self.assertIsNotNone(lease)
+
+    @patch.dict("os.environ", {"OPENAI_MAX_IN_FLIGHT": "1"}, clear=False)
+    def test_expired_leases_are_reclaimed(self):
+        ModelCallLease.objects.create(key=OPENAI_GOVERNOR_KEY, expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertIsNotNone(acquire_model_call_slot())
+
+    @patch.dict("os.environ", {"OPENAI_MAX_REQUESTS_PER_MINUTE": "2"}, clear=False)
+    def test_requests_per_minute_limit(self):
+        with model_call_slot():
+            pass
+        with model_call_slot():
+            pass
+
+        with self.assertRaises(ModelCallGovernorTimeout):
+            acquire_model_call_slot()
+
+    def test_exhausted_rate_limit_headers_pause_calls(self):
+        record_model_call_response(
+            200,
+            {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "30s"},
+        )
+
+        state = ModelCallGovernorState.objects.get(key=OPENAI_GOVERNOR_KEY)
+        self.assertEqual(state.remaining_requests, 0)
+        self.assertGreater(state.blocked_until, timezone.now() + timedelta(seconds=25))
+        with self.assertRaises(ModelCallGovernorTimeout):
+            acquire_model_call_slot()
+
+    @patch.dict("os.environ", {"OPENAI_MAX_IN_FLIGHT": "4"}, clear=False)
+    def test_low_remaining_requests_hold_back_new_calls(self):
+        record_model_call_response(
+            200,
+            {"x-ratelimit-remaining-requests": "2", "x-ratelimit-reset-requests": "30s"},
+        )
+
+        first = acquire_model_call_slot()
+        acquire_model_call_slot()
+        # Both remaining requests belong to calls in flight.
+        with self.assertRaises(ModelCallGovernorTimeout):
+            acquire_model_call_slot()
+
+        record_model_call_response(200, {"x-ratelimit-remaining-requests": "5"})
+        self.assertIsNotNone(acquire_model_call_slot())
+
+        ModelCallLease.objects.exclude(id=first.id).delete()
+        record_model_call_response(200, {"x-ratelimit-remaining-requests": "1"})
+        with self.assertRaises(ModelCallGovernorTimeout):
+            acquire_model_call_slot()
+        ModelCallLease.objects.all().delete()
+        # With nothing in flight a call still goes out, and its response refreshes the count.
+        self.assertIsNotNone(acquire_model_call_slot())
@@ -0,0 +1,93 @@
+from datetime import date
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from receipts.models import HouseholdSession, HouseholdVendorRollup, Receipt
+from receipts.rollups import refresh_household_months, vendor_rollup_drift
+from receipts.vendors import resolve_vendor_key, vendor_key
+
+
+class VendorKeyTests(SimpleTestCase):
+    def test_spellings_of_one_vendor_share_a_key(self):
+        self.assertEqual(vendor_key("TRADER JOE'S #552"), "trader joes")
+        self.assertEqual(vendor_key("Trader Joes"), "trader joes")
+        self.assertEqual(vendor_key("Café  Nero"), "cafe nero")
+        self.assertEqual(vendor_key("Walmart Store 1234"), "walmart")
+        self.assertEqual(vendor_key(None), "")
+
+
+class ReceiptInsightsTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.household = HouseholdSession(
+            household_name="Brick House",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+        )
+        self.household.set_passcode("1234")
+        self.household.save()
+        session = self.client.session
+        session["household_id"] = self.household.id
+        session["user_code"] = Receipt.USER_1
+        session.save()
+
+        rows = [
+            (date(2025, 2, 3), "Trader Joe's #12", Receipt.CATEGORY_SUPERMARKET, "40.00"),
+            (date(2025, 2, 9), "Power Co", Receipt.CATEGORY_BILLS, "80.00"),
+            (date(2025, 3, 1), "TRADER JOES", Receipt.CATEGORY_SUPERMARKET, "55.00"),
+            (date(2025, 3, 8), "Trader Joe's #40", Receipt.CATEGORY_SUPERMARKET, "25.00"),
+            (date(2025, 3, 15), "Cinema", Receipt.CATEGORY_ENTERTAINMENT, "30.00"),
+            (date(2025, 3, 20), "Power Co", Receipt.CATEGORY_BILLS, "70.00"),
+            (date(2025, 3, 28), "", Receipt.CATEGORY_OTHER, "5.00"),
+        ]
+        for expense_date, vendor, category, total in rows:
+            Receipt.objects.create(
+                household=self.household,
+                uploaded_by=Receipt.USER_1,
+                vendor=vendor,
+                vendor_key=resolve_vendor_key(self.household.id, vendor),
+                category=category,
+                total=total,
+                expense_date=expense_date,
+                is_saved=True,
+            )
+        refresh_household_months(self.household.id, [row[0] for row in rows])
+        self.url = reverse("receipt-insights")
+
+    def test_insights_rank_vendors_receipts_and_category_growth(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"month": "2025-03", "limit": 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        payload = response.json()
+        self.assertEqual(payload["month"], "2025-03-01")
+        self.assertEqual((payload["total"], payload["previous_total"], payload["change"]), (185.0, 120.0, 65.0))
+        self.assertEqual(
+            [(vendor["vendor_key"], vendor["total"], vendor["previous_total"]) for vendor in payload["top_vendors"]],
+            [("trader joes", 80.0, 40.0), ("power co", 70.0, 80.0), ("cinema", 30.0, 0.0)],
+        )
+        self.assertEqual(payload["top_vendors"][0]["growth"], 1.0)
+        self.assertIsNone(payload["top_vendors"][2]["growth"])
+        self.assertEqual([receipt["effective_total"] for receipt in payload["biggest_receipts"]], [70.0, 55.0, 30.0])
+        self.assertEqual(payload["category_growth"][0]["category"], Receipt.CATEGORY_SUPERMARKET)
+        self.assertEqual(payload["category_growth"][0]["change"], 40.0)
+        self.assertEqual(payload["category_growth"][-1]["category"], Receipt.CATEGORY_BILLS)
+        receipt_queries = [query for query in queries.captured_queries if 'FROM "receipts_receipt"' in query["sql"]]
+        self.assertEqual(len(receipt_queries), 1)
+
+    def test_vendor_rollups_follow_receipt_edits(self):
+        receipt = self.household.receipts.get(vendor="Cinema")
+        receipt.vendor = "Power Co."
+        receipt.vendor_key = resolve_vendor_key(self.household.id, receipt.vendor)
+        receipt.save(update_fields=["vendor", "vendor_key"])
+        refresh_household_months(self.household.id, [receipt.expense_date])
+
+        rollup = HouseholdVendorRollup.objects.get(household=self.household, month=date(2025, 3, 1), vendor_key="power co")
+        self.assertEqual((rollup.total, rollup.receipt_count), (100, 2))
+        self.assertEqual(vendor_rollup_drift([self.household.id]), [])
+        self.assertEqual(self.client.get(self.url, {"month": "2025-13"}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,97 @@
+from decimal import Decimal
+import random
+
+from django.test import SimpleTestCase
+
+from receipts.ledger import assign_split_totals, from_minor, split_minor, split_receipts, to_minor
+from receipts.models import Receipt
+from receipts.money import receipt_split, to_decimal
+
+
+JUNK = [None, "", "abc", "inf", "1e3", "-2.5E-1", " 4.20 ", ".5", "12.", "1234567890123.456", True]
+
+
+def _random_amount(rng: random.Random):
+    """Inputs shaped like what receipts really carry, plus the junk the model sometimes returns."""
+    kind = rng.randrange(10)
+    if kind == 0:
+        return rng.choice(JUNK)
+    if kind == 1:
+        return rng.randint(-500, 5000)
+    if kind == 2:
+        return round(rng.uniform(-50, 500), rng.randrange(0, 5))
+    if kind == 3:
+        return Decimal(rng.randint(-10**6, 10**8)).scaleb(-rng.randrange(0, 4))
+    if kind == 4:
+        # Exact ties at the third decimal, where half-up rounding matters.
+        return f"{rng.choice(['', '-'])}{rng.randint(0, 999)}.{rng.randint(0, 99):02d}5"
+    return f"{rng.randint(0, 2000)}.{rng.randint(0, 10**rng.randrange(1, 6)):0{rng.randrange(1, 6)}d}"
+
+
+def _random_item(rng: random.Random):
+    item = {"name": "Item", "assigned_to": rng.choice(["shared", Receipt.USER_1, Receipt.USER_2, "nobody"])}
+    if rng.random() < 0.6:
+        item["total_price"] = _random_amount(rng)
+    if rng.random() < 0.6:
+        item["quantity"] = _random_amount(rng)
+        item["unit_price"] = _random_amount(rng)
+    if rng.random() < 0.2:
+        del item["assigned_to"]
+    return item
+
+
+def _random_receipt(rng: random.Random):
+    items = [_random_item(rng) for _ in range(rng.randrange(0, 6))]
+    return (
+        _random_amount(rng) if rng.random() < 0.7 else None,
+        _random_amount(rng),
+        _random_amount(rng),
+        _random_amount(rng),
+        items if rng.random() < 0.9 else None,
+    )
+
+
+class LedgerEquivalenceTests(SimpleTestCase):
+    def test_to_minor_matches_to_decimal(self):
+        rng = random.Random(41)
+        for _ in range(20000):
+            value = _random_amount(rng)
+            expected = to_decimal(value)
+            with self.subTest(value=value):
+                minor = to_minor(value)
+                self.assertEqual(None if minor is None else from_minor(minor), expected)
+
+    def test_nan_is_treated_as_missing(self):
+        # The Decimal path quantizes "NaN" to NaN, which cannot be compared or stored.
+        self.assertIsNone(to_minor("NaN"))
+        self.assertEqual(split_minor("NaN", "1.00", None, None, []), (100, 50, 50))
+
+    def test_split_matches_decimal_reference(self):
+        rng = random.Random(2041)
+        for _ in range(20000):
+            receipt = _random_receipt(rng)
+            with self.subTest(receipt=receipt):
+                self.assertEqual(tuple(map(from_minor, split_minor(*receipt))), receipt_split(*receipt))
+
+    def test_shared_odd_cents_go_to_user_1(self):
+        items = [
+            {"name": "Shared", "total_price": "0.03"},
+            {"name": "Mine", "total_price": "1.005", "assigned_to": Receipt.USER_2},
+        ]
+
+        self.assertEqual(split_minor("2.00", None, None, None, items), (200, 50, 150))
+        self.assertEqual(split_minor(None, None, None, None, [{"quantity": "3", "unit_price": "0.335"}]), (102, 51, 51))
+        self.assertEqual(split_minor("-0.05", None, None, None, []), (-5, -3, -2))
+
+    def test_batch_api_matches_single_receipts(self):
+        rng = random.Random(7)
+        receipts = [_random_receipt(rng) for _ in range(500)]
+
+        self.assertEqual(split_receipts(receipts), [split_minor(*receipt) for receipt in receipts])
+
+        instances = [Receipt(total=total, items=[{"name": "x", "total_price": "3.33"}]) for total in ("9.99", None)]
+        assign_split_totals(instances)
+        self.assertEqual(
+            [(receipt.effective_total, receipt.owed_user_1, receipt.owed_user_2) for receipt in instances],
+            [receipt_split(receipt.total, None, None, None, receipt.items) for receipt in instances],
+        )
@@ -0,0 +1,88 @@
+from datetime import date
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from receipts.models import HouseholdSession, Receipt, ReceiptLineItem
+
+
+class ReceiptLineItemTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.household = HouseholdSession(
+            household_name="Brick House",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+        )
+        self.household.set_passcode("1234")
+        self.household.save()
+        session = self.client.session
+        session["household_id"] = self.household.id
+        session["user_code"] = Receipt.USER_1
+        session.save()
+        self.history_url = reverse("item-price-history")
+
+    def _add_expense(self, expense_date: str, vendor: str, items):
+        response = self.client.post(
+            reverse("expense-manual-create"),
+            {"vendor": vendor, "expense_date": expense_date, "total": 20, "items": items},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        return response.json()["receipt"]["id"]
+
+    def test_writes_keep_line_items_in_sync(self):
+        receipt_id = self._add_expense(
+            "2025-03-01",
+            "Market",
+            [
+                {"name": "Oat Milk", "quantity": 2, "unit_price": 1.75, "total_price": 3.5},
+                {"name": "Bread", "total_price": 4.2},
+            ],
+        )
+
+        rows = list(ReceiptLineItem.objects.filter(receipt_id=receipt_id).values_list("name_key", "unit_price", "amount"))
+        self.assertEqual(rows, [("oat milk", Decimal("1.75"), Decimal("3.50")), ("bread", None, Decimal("4.20"))])
+
+        response = self.client.patch(
+            reverse("receipt-item-assignments", args=[receipt_id]),
+            {"assignments": [{"index": 1, "assigned_to": Receipt.USER_2}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(ReceiptLineItem.objects.get(receipt_id=receipt_id, position=1).assigned_to, Receipt.USER_2)
+
+        Receipt.objects.create(
+            household=self.household,
+            uploaded_by=Receipt.USER_1,
+            items=[{"name": "Oat Milk", "total_price": 9}],
+            expense_date=date(2025, 3, 2),
+        )
+        self.assertEqual(ReceiptLineItem.objects.count(), 2)
+
+        self.client.delete(reverse("receipt-detail", args=[receipt_id]))
+        self.assertFalse(ReceiptLineItem.objects.exists())
+
+    def test_price_history_pages_newest_first(self):
+        for day, price in ((1, 1.5), (8, 1.75), (15, 1.6)):
+            self._add_expense(f"2025-03-{day:02d}", "Market #12", [{"name": "Oat milk", "quantity": 1, "unit_price": price}])
+        self._add_expense("2025-03-20", "Corner Shop", [{"name": "OAT MILK", "quantity": 2, "total_price": 4}])
+
+        response = self.client.get(self.history_url, {"item": "oat-milk", "limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        payload = response.json()
+        self.assertEqual(payload["item_key"], "oat milk")
+        self.assertEqual([entry["unit_price"] for entry in payload["history"]], [2.0, 1.6])
+        self.assertEqual(payload["summary"]["purchases"], 4)
+        self.assertEqual((payload["summary"]["min_unit_price"], payload["summary"]["max_unit_price"]), (1.5, 2.0))
+
+        second = self.client.get(self.history_url, {"item": "oat-milk", "limit": 2, "cursor": payload["next_cursor"]}).json()
+        self.assertEqual([entry["expense_date"] for entry in second["history"]], ["2025-03-08", "2025-03-01"])
+        self.assertIsNone(second["next_cursor"])
+
+        by_vendor = self.client.get(self.history_url, {"item": "oat milk", "vendor": "market"}).json()
+        self.assertEqual(by_vendor["summary"]["purchases"], 3)
+        mismatched = self.client.get(self.history_url, {"item": "bread", "cursor": payload["next_cursor"]})
+        self.assertEqual(mismatched.status_code, status.HTTP_400_BAD_REQUEST)
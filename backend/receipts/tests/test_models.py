@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from django.test import TestCase
 
 from receipts.models import HouseholdSession, Receipt
@@ -43,3 +45,28 @@ class HouseholdSessionModelTests(TestCase):
             total="10.00",
         )
         self.assertEqual(receipt.category, Receipt.CATEGORY_OTHER)
+
+    def test_receipt_save_persists_split_totals(self):
+        household = HouseholdSession.objects.create(
+            household_name="Brick Home",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+            passcode_hash="unused",
+        )
+        receipt = Receipt.objects.create(
+            household=household,
+            uploaded_by=Receipt.USER_1,
+            vendor="Store",
+            total="10.01",
+            items=[{"name": "Wine", "total_price": 4, "assigned_to": Receipt.USER_2}],
+        )
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.effective_total, Decimal("10.01"))
+        self.assertEqual(receipt.owed_user_1, Decimal("3.01"))
+        self.assertEqual(receipt.owed_user_2, Decimal("7.00"))
+
+        receipt.items = [{"name": "Wine", "total_price": 4, "assigned_to": Receipt.USER_1}]
+        receipt.save(update_fields=["items"])
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.owed_user_1, Decimal("7.01"))
+        self.assertEqual(receipt.owed_user_2, Decimal("3.00"))
@@ -0,0 +1,243 @@
+import json
+import re
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from receipts.insights import _biggest_receipts
+from receipts.models import HouseholdSession, Receipt
+from receipts.reports import GROUP_DAY, GROUP_VENDOR, _live_rows
+from receipts.rollups import _receipt_rollup_rows
+from receipts.search import search_receipts
+from receipts.views import (
+    ANALYSES_CURSOR_FIELDS,
+    ANALYSES_ORDERING,
+    _after_cursor,
+    _current_month_rows,
+    _dashboard_currency_querysets,
+    _dashboard_querysets,
+    _filtered_receipt_history,
+    _open_receipts,
+)
+
+TODAY = date(2025, 6, 18)
+MONTH_START = TODAY.replace(day=1)
+SEED_DAYS = 730
+# Many small households, as in production: a date range alone spans every household's receipts.
+HOUSEHOLDS = 100
+RECEIPTS_PER_HOUSEHOLD = 200
+LARGE_HOUSEHOLD_RECEIPTS = 20000
+
+# The receipt reads behind the dashboard, settling, reports, insights and rollup refreshes, each
+# with the index it must be answered from.
+HOT_QUERIES = {
+    "dashboard current month": (
+        lambda household: _current_month_rows(household, TODAY),
+        "receipt_saved_date_idx",
+    ),
+    "dashboard recent receipts": (
+        lambda household: _dashboard_querysets(household, TODAY)[2],
+        "receipt_history_idx",
+    ),
+    "dashboard open currency": (
+        lambda household: _dashboard_currency_querysets(_dashboard_querysets(household, TODAY)[0])[0],
+        "receipt_open_date_idx",
+    ),
+    "settle open receipts": (
+        lambda household: _open_receipts(household, MONTH_START, TODAY).values_list("id", flat=True),
+        "receipt_open_date_idx",
+    ),
+    "report by day": (
+        lambda household: _live_rows(
+            household, GROUP_DAY, Q(expense_date__range=(date(2025, 1, 1), date(2025, 3, 31)))
+        ),
+        "receipt_saved_date_idx",
+    ),
+    "report by vendor": (
+        lambda household: _live_rows(
+            household, GROUP_VENDOR, Q(expense_date__range=(date(2025, 1, 15), date(2025, 2, 10)))
+        ),
+        "receipt_saved_date_idx",
+    ),
+    "insights biggest receipts": (
+        lambda household: _biggest_receipts(household, date(2025, 5, 1), 5),
+        "receipt_saved_date_idx",
+    ),
+    "rollup refresh": (
+        lambda household: _receipt_rollup_rows([household.id], [date(2025, 5, 1), date(2025, 6, 1)]),
+        "receipt_saved_date_idx",
+    ),
+}
+# Ranking a month's receipts by amount cannot come from a date index; the sort is bounded to that month.
+SORTING_QUERIES = {"insights biggest receipts"}
+
+# SQLite reports "SCAN" for a full walk of the table or of an index, "SEARCH" for an index range.
+SQLITE_RECEIPT_ACCESS = re.compile(r"\b(SCAN|SEARCH) receipts_receipt\b(?: USING (?:COVERING )?INDEX (\w+))?")
+# Grouping through a temporary b-tree is how SQLite aggregates; only ordering sorts are flagged.
+SQLITE_SORT = re.compile(r"TEMP B-TREE FOR (?:RIGHT PART OF |LAST TERM OF )?ORDER BY")
+
+
+class ReceiptPlan(NamedTuple):
+    text: str
+    indexes: set
+    full_scans: list
+    sorts: list
+    index_conditions: list
+
+
+def _postgres_plan(queryset):
+    indexes, full_scans, sorts, conditions = set(), [], [], []
+    nodes = [(json.loads(queryset.explain(format="json"))[0]["Plan"], None, None)]
+    while nodes:
+        node, parent_type, relation = nodes.pop()
+        node_type = node["Node Type"]
+        # Bitmap index scans name no relation; they feed the heap scan above them.
+        relation = node.get("Relation Name", relation)
+        nodes.extend((child, node_type, relation) for child in node.get("Plans", []))
+        # Sorting rows into groups for an aggregate is grouping, as SQLite's GROUP BY b-tree is.
+        if node_type.endswith("Sort") and parent_type != "Aggregate":
+            sorts.append(node_type)
+        if relation != "receipts_receipt" or node_type == "Bitmap Heap Scan":
+            continue
+        if "Index Name" in node:
+            indexes.add(node["Index Name"])
+            if "Index Cond" in node:
+                conditions.append(node["Index Cond"])
+            else:
+                full_scans.append(f"{node_type} using {node['Index Name']}")
+        elif node_type == "Seq Scan":
+            full_scans.append(node_type)
+    return ReceiptPlan(queryset.explain(), indexes, full_scans, sorts, conditions)
+
+
+def _sqlite_plan(queryset):
+    plan = queryset.explain()
+    indexes, full_scans, conditions = set(), [], []
+    for line in plan.splitlines():
+        access = SQLITE_RECEIPT_ACCESS.search(line)
+        if access is None:
+            continue
+        operation, index = access.groups()
+        if index:
+            indexes.add(index)
+        if operation == "SCAN":
+            full_scans.append(line.strip())
+        else:
+            conditions.append(line[access.end() :].strip())
+    return ReceiptPlan(plan, indexes, full_scans, SQLITE_SORT.findall(plan), conditions)
+
+
+RECEIPT_PLANS = {"postgresql": _postgres_plan, "sqlite": _sqlite_plan}
+
+
+class HotQueryPlanTests(TestCase):
+    """Each hot receipt query must be answered from its index range, never a full scan or a sort."""
+
+    @classmethod
+    def setUpTestData(cls):
+        passcode_hash = make_password("1234")
+        cls.households = HouseholdSession.objects.bulk_create(
+            HouseholdSession(
+                code=f"H{number:05d}",
+                household_name=f"House {number}",
+                member_1_name="Alex",
+                member_2_name="Jamie",
+                passcode_hash=passcode_hash,
+            )
+            for number in range(HOUSEHOLDS)
+        )
+
+        receipts = []
+        for household in cls.households:
+            for index in range(RECEIPTS_PER_HOUSEHOLD):
+                expense_date = TODAY - timedelta(days=index * SEED_DAYS // RECEIPTS_PER_HOUSEHOLD)
+                receipts.append(
+                    Receipt(
+                        household=household,
+                        uploaded_by=Receipt.USER_1 if index % 2 else Receipt.USER_2,
+                        vendor=f"Vendor {index % 40}",
+                        vendor_key=f"vendor {index % 40}",
+                        total=10 + index % 90,
+                        effective_total=10 + index % 90,
+                        expense_date=expense_date,
+                        # Most receipts are saved, and everything before this month is settled.
+                        is_saved=index % 10 != 0,
+                        settled_at=None if expense_date >= MONTH_START else household.created_at,
+                    )
+                )
+        # Receipts arrive day by day across all households, so no household's rows sit together on disk.
+        receipts.sort(key=lambda receipt: receipt.expense_date)
+        Receipt.objects.bulk_create(receipts, batch_size=500)
+
+    def setUp(self):
+        vendor = connection.vendor
+        if vendor not in RECEIPT_PLANS:
+            self.skipTest(f"No query plan check for {vendor}.")
+        self.receipt_plan = RECEIPT_PLANS[vendor]
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            if vendor == "postgresql":
+                # A seeded table is small enough that a sequential scan would win on cost alone. With
+                # sequential scans priced out, the planner still picks one only when no index applies.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def test_hot_queries_use_their_indexes(self):
+        household = self.households[1]
+        for name, (build_query, index) in HOT_QUERIES.items():
+            with self.subTest(query=name):
+                plan = self.receipt_plan(build_query(household))
+                self.assertEqual(plan.indexes, {index}, plan.text)
+                self.assertEqual(plan.full_scans, [], plan.text)
+                if name not in SORTING_QUERIES:
+                    self.assertEqual(plan.sorts, [], plan.text)
+
+    def test_deep_history_pages_walk_the_history_index(self):
+        household = self.households[1]
+        position = household.receipts.order_by(*ANALYSES_ORDERING).values_list(*ANALYSES_CURSOR_FIELDS)[50]
+        plan = self.receipt_plan(_after_cursor(_filtered_receipt_history(household, {}), position)[:51])
+
+        self.assertEqual(plan.indexes, {"receipt_history_idx"}, plan.text)
+        self.assertEqual(plan.full_scans, [], plan.text)
+        self.assertEqual(plan.sorts, [], plan.text)
+        # The cursor's date must bound the index walk itself, not just filter rows after it.
+        self.assertTrue(any("expense_date" in condition for condition in plan.index_conditions), plan.text)
+
+    def test_search_reads_one_households_matches_from_the_search_index(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("Full-text search runs on Postgres only.")
+        # Scanning a small household's receipts is cheap; the index matters once a household has many,
+        # and the term is common across other households.
+        household, neighbour = self.households[2], self.households[3]
+        Receipt.objects.bulk_create(
+            (
+                Receipt(
+                    household=owner,
+                    uploaded_by=Receipt.USER_1,
+                    vendor=vendor,
+                    total=10,
+                    effective_total=10,
+                    expense_date=TODAY - timedelta(days=index % SEED_DAYS),
+                )
+                for owner, vendor, count in (
+                    (household, "Vendor", LARGE_HOUSEHOLD_RECEIPTS),
+                    (household, "Corner Bakery", 20),
+                    (neighbour, "Corner Bakery", LARGE_HOUSEHOLD_RECEIPTS),
+                )
+                for index in range(count)
+            ),
+            batch_size=500,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE receipts_receipt")
+            # Move the bulk insert out of the GIN pending list, as autovacuum would.
+            cursor.execute("SELECT gin_clean_pending_list('receipt_household_search_idx')")
+        plan = self.receipt_plan(search_receipts(household, "bakery").values_list("id", "rank")[:51])
+
+        self.assertEqual(plan.indexes, {"receipt_household_search_idx"}, plan.text)
+        self.assertEqual(plan.full_scans, [], plan.text)
+        # The household id must bound the index lookup itself, not filter every household's matches.
+        self.assertTrue(any("household_id" in condition for condition in plan.index_conditions), plan.text)
@@ -0,0 +1,63 @@
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+import gzip
+import json
+
+from django.test import RequestFactory, SimpleTestCase
+from django.http import HttpResponse, JsonResponse
+from rest_framework.renderers import JSONRenderer
+
+from receipts.middleware import JSONCompressionMiddleware, _negotiate_encoding
+from receipts.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_matches_stock_json_renderer_byte_for_byte(self):
+        data = {
+            "current_date": date(2026, 2, 23),
+            "uploaded_at": datetime(2026, 2, 23, 10, 0, 0, 123456, tzinfo=dt_timezone.utc),
+            "total": Decimal("12.50"),
+            "vendor": "Caf\u00e9\u2028line",
+            "members": {1: "Alex"},
+            "items": [{"total_price": 1.25, "assigned_to": None}],
+        }
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_uses_stock_renderer(self):
+        rendered = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+
+        self.assertEqual(rendered, JSONRenderer().render({"a": 1}, "application/json; indent=2"))
+
+
+class JSONCompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.body = {"analyses": [{"vendor": f"Vendor {index}", "total": index} for index in range(200)]}
+
+    def _process(self, response, accept_encoding=None):
+        headers = {"HTTP_ACCEPT_ENCODING": accept_encoding} if accept_encoding else {}
+        request = self.factory.get("/api/receipts/analyses/", **headers)
+        return JSONCompressionMiddleware(lambda request: response).process_response(request, response)
+
+    def test_gzips_large_json_when_accepted(self):
+        response = self._process(JsonResponse(self.body), "gzip, deflate")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.body)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_leaves_small_unaccepted_and_non_json_responses_alone(self):
+        small = self._process(JsonResponse({"detail": "ok"}), "gzip")
+        unaccepted = self._process(JsonResponse(self.body))
+        html = self._process(HttpResponse("x" * 5000, content_type="text/html"), "gzip")
+
+        for response in (small, unaccepted, html):
+            self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_negotiation_honours_quality_values(self):
+        self.assertEqual(_negotiate_encoding("gzip;q=0.5, identity"), "gzip")
+        self.assertIsNone(_negotiate_encoding("gzip;q=0"))
+        self.assertEqual(_negotiate_encoding("*"), "gzip")
+        self.assertIsNone(_negotiate_encoding(""))
@@ -0,0 +1,145 @@
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from receipts.models import HouseholdSession, Receipt
+from receipts.reports import MAX_REPORT_BUCKETS
+from receipts.rollups import refresh_household_months
+from receipts.vendors import resolve_vendor_key
+
+
+class ReceiptReportTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.household = HouseholdSession(
+            household_name="Brick House",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+        )
+        self.household.set_passcode("1234")
+        self.household.save()
+        session = self.client.session
+        session["household_id"] = self.household.id
+        session["user_code"] = Receipt.USER_1
+        session.save()
+
+        rows = [
+            (date(2025, 1, 10), Receipt.USER_1, "Market", Receipt.CATEGORY_SUPERMARKET, "30.00"),
+            (date(2025, 1, 31), Receipt.USER_2, "Power Co", Receipt.CATEGORY_BILLS, "90.00"),
+            (date(2025, 2, 14), Receipt.USER_1, "Cinema", Receipt.CATEGORY_ENTERTAINMENT, "25.00"),
+            (date(2025, 3, 2), Receipt.USER_2, "Market", Receipt.CATEGORY_SUPERMARKET, "41.00"),
+            (date(2025, 4, 20), Receipt.USER_1, "Market", Receipt.CATEGORY_SUPERMARKET, "12.50"),
+        ]
+        for expense_date, uploaded_by, vendor, category, total in rows:
+            Receipt.objects.create(
+                household=self.household,
+                uploaded_by=uploaded_by,
+                vendor=vendor,
+                vendor_key=resolve_vendor_key(self.household.id, vendor),
+                category=category,
+                total=total,
+                expense_date=expense_date,
+                is_saved=True,
+            )
+        # Drafts never count.
+        Receipt.objects.create(
+            household=self.household,
+            uploaded_by=Receipt.USER_1,
+            vendor="Market",
+            total="999.00",
+            expense_date=date(2025, 2, 1),
+        )
+        refresh_household_months(self.household.id, [row[0] for row in rows])
+        self.url = reverse("receipt-report")
+
+    def _report(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.json()
+
+    def test_month_report_mixes_rollups_with_partial_edge_months(self):
+        with CaptureQueriesContext(connection) as queries:
+            report = self._report(**{"from": "2025-01-15", "to": "2025-03-31", "group_by": "month"})
+
+        self.assertEqual([bucket["key"] for bucket in report["buckets"]], ["2025-01-01", "2025-02-01", "2025-03-01"])
+        self.assertEqual([bucket["total"] for bucket in report["buckets"]], [90.0, 25.0, 41.0])
+        self.assertEqual(report["buckets"][0]["start_date"], "2025-01-15")
+        self.assertEqual(report["totals"]["total"], 156.0)
+        self.assertEqual(report["totals"]["receipt_count"], 3)
+        self.assertEqual(report["totals"]["paid_user_2"], 131.0)
+        self.assertAlmostEqual(report["totals"]["owed_user_1"] + report["totals"]["owed_user_2"], 156.0)
+        report_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if "receipts_receipt" in query["sql"] or "receipts_householdmonthlyrollup" in query["sql"]
+        ]
+        self.assertEqual(len(report_queries), 2)
+
+    def test_day_category_member_and_vendor_groupings(self):
+        span = {"from": "2025-01-01", "to": "2025-04-30"}
+
+        days = self._report(**span, group_by="day")
+        categories = self._report(**span, group_by="category")
+        members = self._report(**span, group_by="member")
+        vendors = self._report(**span, group_by="vendor")
+
+        self.assertEqual(len(days["buckets"]), 120)
+        self.assertEqual(sum(bucket["receipt_count"] for bucket in days["buckets"]), 5)
+        by_category = {bucket["key"]: bucket["total"] for bucket in categories["buckets"]}
+        self.assertEqual(by_category[Receipt.CATEGORY_SUPERMARKET], 83.5)
+        self.assertEqual(by_category[Receipt.CATEGORY_TAXES], 0.0)
+        self.assertEqual(
+            [(bucket["label"], bucket["total"]) for bucket in members["buckets"]],
+            [("Alex", 67.5), ("Jamie", 131.0)],
+        )
+        self.assertEqual(
+            [(bucket["key"], bucket["label"], bucket["receipt_count"]) for bucket in vendors["buckets"]],
+            [("power co", "Power Co", 1), ("market", "Market", 3), ("cinema", "Cinema", 1)],
+        )
+        for report in (days, categories, members, vendors):
+            self.assertEqual(report["totals"]["total"], 198.5)
+            self.assertFalse(report["truncated"])
+
+    def test_vendor_report_reads_whole_months_from_vendor_rollups(self):
+        span = {"from": "2025-01-15", "to": "2025-03-31", "group_by": "vendor"}
+        with CaptureQueriesContext(connection) as queries:
+            report = self._report(**span)
+
+        self.assertEqual(
+            [
+                (bucket["key"], bucket["total"], bucket["paid_user_1"], bucket["paid_user_2"])
+                for bucket in report["buckets"]
+            ],
+            [("power co", 90.0, 0.0, 90.0), ("market", 41.0, 0.0, 41.0), ("cinema", 25.0, 25.0, 0.0)],
+        )
+        for bucket in report["buckets"]:
+            self.assertAlmostEqual(bucket["owed_user_1"] + bucket["owed_user_2"], bucket["total"])
+        self.assertEqual(report["totals"]["total"], 156.0)
+        receipt_queries = [query["sql"] for query in queries.captured_queries if "receipts_receipt" in query["sql"]]
+        rollup_queries = [
+            query["sql"] for query in queries.captured_queries if "receipts_householdvendorrollup" in query["sql"]
+        ]
+        # Only the partial January is aggregated from receipts.
+        self.assertEqual(len(receipt_queries), 1)
+        self.assertEqual(len(rollup_queries), 1)
+
+        with mock.patch("receipts.reports.MAX_REPORT_BUCKETS", 1):
+            truncated = self._report(**span)
+        self.assertTrue(truncated["truncated"])
+        self.assertEqual([bucket["key"] for bucket in truncated["buckets"]], ["power co"])
+        self.assertEqual(truncated["totals"], report["totals"])
+
+    def test_rejects_reports_over_the_bucket_cap(self):
+        response = self.client.get(self.url, {"from": "2020-01-01", "to": "2025-01-01", "group_by": "day"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(MAX_REPORT_BUCKETS), response.json()["group_by"][0])
+        self.assertEqual(self.client.get(self.url, {"from": "2025-02-01", "to": "2025-01-01"}).status_code, 400)
+        self.assertEqual(
+            len(self._report(**{"from": "2020-01-01", "to": "2025-01-01", "group_by": "month"})["buckets"]), 61
+        )
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from receipts.models import HouseholdMonthlyRollup, HouseholdSession, Receipt
+from receipts.rollups import refresh_household_months
+
+
+class HouseholdMonthlyRollupTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.household = HouseholdSession(
+            household_name="Brick House",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+        )
+        self.household.set_passcode("1234")
+        self.household.save()
+        session = self.client.session
+        session["household_id"] = self.household.id
+        session["user_code"] = Receipt.USER_1
+        session.save()
+
+    def _rollup(self, **filters):
+        return HouseholdMonthlyRollup.objects.get(household=self.household, **filters)
+
+    def test_manual_create_settle_and_delete_keep_rollup_in_step(self):
+        response = self.client.post(
+            reverse("expense-manual-create"),
+            {"vendor": "Power Co", "total": 40, "currency": "USD", "category": "bills"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        receipt_id = response.data["receipt"]["id"]
+
+        rollup = self._rollup(category="bills", member=Receipt.USER_1, is_settled=False)
+        self.assertEqual(rollup.month, timezone.localdate().replace(day=1))
+        self.assertEqual(rollup.total, Decimal("40.00"))
+        self.assertEqual(rollup.owed_user_2, Decimal("20.00"))
+        self.assertEqual(rollup.receipt_count, 1)
+
+        response = self.client.post(reverse("household-settle"), {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._rollup(category="bills", is_settled=True).total, Decimal("40.00"))
+        self.assertFalse(HouseholdMonthlyRollup.objects.filter(is_settled=False).exists())
+
+        response = self.client.delete(reverse("receipt-detail", kwargs={"receipt_id": receipt_id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(HouseholdMonthlyRollup.objects.filter(household=self.household).exists())
+
+    def test_dashboard_reads_last_month_from_rollup(self):
+        last_month_day = timezone.localdate().replace(day=1) - timedelta(days=1)
+        receipt = Receipt.objects.create(
+            household=self.household,
+            uploaded_by=Receipt.USER_2,
+            expense_date=last_month_day,
+            total="15.00",
+            is_saved=True,
+        )
+
+        response = self.client.get(reverse("receipt-dashboard"))
+        self.assertEqual(response.data["last_month"]["receipt_count"], 0)
+
+        refresh_household_months(self.household.id, [receipt.expense_date])
+        response = self.client.get(reverse("receipt-dashboard"))
+        self.assertEqual(response.data["last_month"]["receipt_count"], 1)
+        self.assertEqual(response.data["last_month"]["totals"]["user_2"], 15.0)
+
+    def test_rebuild_command_reports_and_repairs_drift(self):
+        Receipt.objects.create(household=self.household, uploaded_by=Receipt.USER_1, total="9.99", is_saved=True)
+
+        output = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("rebuild_monthly_rollups", "--verify", stdout=output)
+        self.assertIn("stored=None", output.getvalue())
+
+        call_command("rebuild_monthly_rollups", stdout=StringIO())
+        call_command("rebuild_monthly_rollups", "--verify", stdout=StringIO())
+        self.assertEqual(self._rollup(member=Receipt.USER_1).total, Decimal("9.99"))
@@ -1,10 +1,16 @@
+from datetime import date
+
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
 
-from receipts.models import HouseholdSession
+from receipts.models import HouseholdSession, Receipt
 from receipts.serializers import (
     HouseholdCreateSerializer,
     ManualExpenseCreateSerializer,
+    ReceiptHistoryQuerySerializer,
     ReceiptItemAssignmentsUpdateSerializer,
+    ReceiptRecordSerializer,
+    receipt_record_rows,
 )
 
 
@@ -57,3 +63,62 @@ class ReceiptCategorySerializerTests(TestCase):
             data={"assignments": [{"index": 0, "assigned_to": "shared"}], "category": "bills"}
         )
         self.assertTrue(serializer.is_valid(), serializer.errors)
+
+
+class ReceiptRecordRowsTests(TestCase):
+    def test_matches_receipt_record_serializer_byte_for_byte(self):
+        household = HouseholdSession.objects.create(
+            household_name="Brick Home",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+            passcode_hash="unused",
+        )
+        Receipt.objects.create(
+            household=household,
+            uploaded_by=Receipt.USER_1,
+            expense_date=date(2025, 1, 31),
+            vendor="Market",
+            currency="EUR",
+            category=Receipt.CATEGORY_SUPERMARKET,
+            subtotal="10.10",
+            tax="0.99",
+            tip=None,
+            total="11.09",
+            items=[{"name": "Bread", "total_price": 11.09, "assigned_to": "shared"}],
+            is_saved=True,
+        )
+        Receipt.objects.create(household=household, uploaded_by=Receipt.USER_2, vendor="", currency="", total=None)
+
+        receipts = household.receipts.order_by("-expense_date", "-uploaded_at", "-id")
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(receipt_record_rows(receipts, household)),
+            renderer.render(ReceiptRecordSerializer(receipts, many=True).data),
+        )
+
+    def test_sparse_fields_project_the_full_rows(self):
+        household = HouseholdSession.objects.create(
+            household_name="Sparse Home",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+            passcode_hash="unused",
+        )
+        Receipt.objects.create(
+            household=household,
+            uploaded_by=Receipt.USER_2,
+            expense_date=date(2025, 2, 3),
+            vendor="Cafe",
+            total="4.50",
+            items=[{"name": "Coffee", "total_price": 4.5}],
+        )
+        query = ReceiptHistoryQuerySerializer(data={"fields": "total,uploaded_by_name,id,expense_date"})
+        query.is_valid(raise_exception=True)
+        fields = query.validated_data["receipt_fields"]
+
+        receipts = household.receipts.all()
+        full_rows = receipt_record_rows(receipts, household)
+        self.assertEqual(fields, ("id", "uploaded_by_name", "expense_date", "total"))
+        self.assertEqual(
+            receipt_record_rows(receipts, household, fields),
+            [{field: row[field] for field in fields} for row in full_rows],
+        )
@@ -1,22 +1,24 @@
 from unittest.mock import patch
 
-from django.test import SimpleTestCase
+from django.test import TestCase
+import httpx
 import requests
 
-from receipts.services import ReceiptAnalysisError, analyze_receipt_image
+from receipts.services import ReceiptAnalysisError, analyze_receipt_image, analyze_receipt_image_async
 
 
 class _MockResponse:
-    def __init__(self, status_code=200, payload=None, text=""):
+    def __init__(self, status_code=200, payload=None, text="", headers=None):
         self.status_code = status_code
         self._payload = payload or {}
         self.text = text
+        self.headers = headers or {}
 
     def json(self):
         return self._payload
 
 
-class ReceiptServicesTests(SimpleTestCase):
+class ReceiptServicesTests(TestCase):
     @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key", "OPENAI_MODEL": "gpt-4o-mini"}, clear=False)
     @patch("receipts.services.requests.post")
     def test_analyze_receipt_accepts_list_content_parts(self, mock_post):
@@ -78,3 +80,46 @@ class ReceiptServicesTests(SimpleTestCase):
     def test_analyze_receipt_rejects_extremely_large_image(self):
         with self.assertRaises(ReceiptAnalysisError):
             analyze_receipt_image(b"x" * 5000, "image/jpeg")
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}, clear=False)
+    @patch("receipts.governor.time.sleep")
+    @patch("receipts.services.requests.post")
+    def test_analyze_receipt_retries_after_rate_limit(self, mock_post, mock_sleep):
+        mock_post.side_effect = [
+            _MockResponse(status_code=429, text="slow down", headers={"retry-after": "0"}),
+            _MockResponse(
+                payload={
+                    "choices": [
+                        {"message": {"content": '{"vendor":"Store","items":[],"category":"other","raw_text":""}'}}
+                    ]
+                }
+            ),
+        ]
+
+        parsed = analyze_receipt_image(b"fake-image", "image/jpeg")
+
+        self.assertEqual(parsed["vendor"], "Store")
+        self.assertEqual(mock_post.call_count, 2)
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}, clear=False)
+    async def test_analyze_receipt_async_uses_shared_client(self):
+        def handler(request):
+            return httpx.Response(
+                200,
+                json={"choices": [{"message": {"content": '{"vendor":"Cafe","items":[],"raw_text":"coffee"}'}}]},
+            )
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            parsed = await analyze_receipt_image_async(b"fake-image", "image/jpeg", client=client)
+
+        self.assertEqual(parsed["vendor"], "Cafe")
+        self.assertEqual(parsed["items"], [])
+
+    @patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}, clear=False)
+    async def test_analyze_receipt_async_wraps_network_error(self):
+        def handler(request):
+            raise httpx.ConnectError("network unreachable")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with self.assertRaises(ReceiptAnalysisError):
+                await analyze_receipt_image_async(b"fake-image", "image/jpeg", client=client)
@@ -0,0 +1,122 @@
+from datetime import date
+from importlib import import_module
+
+from django.apps import apps
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from receipts.models import HouseholdSession, HouseholdVendorRollup, Receipt, ReceiptLineItem, Vendor
+from receipts.vendors import closest_vendor, resolve_vendor_key
+from receipts.views import _create_analyzed_receipt
+
+
+class ClosestVendorTests(SimpleTestCase):
+    def test_spelling_variants_match_and_other_vendors_do_not(self):
+        self.assertEqual(closest_vendor("wal mart", ["waitrose", "walmart"]), "walmart")
+        self.assertEqual(closest_vendor("walmart supercenter", ["walmart"]), "walmart")
+        self.assertEqual(closest_vendor("trader joe", ["trader joes", "target"]), "trader joes")
+        self.assertIsNone(closest_vendor("walmart", ["waitrose"]))
+        self.assertIsNone(closest_vendor("target", ["tesco"]))
+
+
+class VendorCanonicalizationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.household = HouseholdSession(
+            household_name="Brick House",
+            member_1_name="Alex",
+            member_2_name="Jamie",
+        )
+        self.household.set_passcode("1234")
+        self.household.save()
+        session = self.client.session
+        session["household_id"] = self.household.id
+        session["user_code"] = Receipt.USER_1
+        session.save()
+        self.url = reverse("vendor-autocomplete")
+
+    def test_manual_and_analyzed_receipts_share_one_vendor_key(self):
+        response = self.client.post(
+            reverse("expense-manual-create"),
+            {"vendor": "Walmart", "expense_date": "2025-03-01", "total": 20},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.content)
+        for vendor in ("WALMART SUPERCENTER #123", "Wal-Mart"):
+            _create_analyzed_receipt(self.household, Receipt.USER_2, None, {"vendor": vendor})
+
+        self.assertEqual(set(self.household.receipts.values_list("vendor_key", flat=True)), {"walmart"})
+        self.assertEqual(list(self.household.vendors.values_list("key", flat=True)), ["walmart"])
+
+        _create_analyzed_receipt(self.household, Receipt.USER_1, None, {"vendor": "Waitrose"})
+        self.assertEqual(list(self.household.vendors.values_list("key", flat=True)), ["waitrose", "walmart"])
+
+    def test_autocomplete_ranks_prefix_matches_first(self):
+        for vendor in ("Corner Market", "Market Hall", "Power Co"):
+            resolve_vendor_key(self.household.id, vendor)
+        other = HouseholdSession(household_name="Other", member_1_name="A", member_2_name="B")
+        other.set_passcode("1234")
+        other.save()
+        resolve_vendor_key(other.id, "Market Street")
+
+        response = self.client.get(self.url, {"q": "mark"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(
+            response.json()["vendors"],
+            [{"key": "market hall", "name": "Market Hall"}, {"key": "corner market", "name": "Corner Market"}],
+        )
+        self.assertEqual(len(self.client.get(self.url, {"q": "market", "limit": 1}).json()["vendors"]), 1)
+        self.assertEqual(self.client.get(self.url, {"q": "#12"}).json()["vendors"], [])
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Vendor.objects.filter(household=other).count(), 1)
+
+    def test_vendor_migration_merges_keys_seeded_before_matching(self):
+        receipts = Receipt.objects.bulk_create(
+            Receipt(
+                household=self.household,
+                uploaded_by=Receipt.USER_1,
+                vendor=vendor,
+                vendor_key=key,
+                expense_date=date(2025, 3, day),
+                total=10,
+                effective_total=10,
+                items=[{"name": "Milk", "total_price": 10}],
+                is_saved=True,
+            )
+            for day, (vendor, key) in enumerate(
+                [("Walmart", "walmart"), ("Wal Mart", "wal mart"), ("Waitrose", "waitrose")], start=1
+            )
+        )
+        Vendor.objects.bulk_create(
+            Vendor(household=self.household, key=receipt.vendor_key, name=receipt.vendor) for receipt in receipts
+        )
+        ReceiptLineItem.objects.bulk_create(
+            ReceiptLineItem(
+                receipt=receipt,
+                household=self.household,
+                position=0,
+                name="Milk",
+                name_key="milk",
+                amount=10,
+                assigned_to="shared",
+                expense_date=receipt.expense_date,
+                vendor=receipt.vendor,
+                vendor_key=receipt.vendor_key,
+            )
+            for receipt in receipts
+        )
+
+        import_module("receipts.migrations.0023_cluster_vendors").cluster_vendors(apps, None)
+
+        self.assertEqual(list(self.household.vendors.values_list("key", flat=True)), ["waitrose", "walmart"])
+        self.assertEqual(
+            list(self.household.receipts.order_by("expense_date").values_list("vendor_key", flat=True)),
+            ["walmart", "walmart", "waitrose"],
+        )
+        self.assertEqual(set(self.household.line_items.values_list("vendor_key", flat=True)), {"walmart", "waitrose"})
+        rollups = HouseholdVendorRollup.objects.filter(household=self.household)
+        self.assertEqual(list(rollups.values_list("vendor_key", "receipt_count")), [("walmart", 2), ("waitrose", 1)])
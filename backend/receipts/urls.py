@@ -1,19 +1,37 @@
 from django.urls import path
 
+from .async_views import (
+    receipt_analyze_async,
+    receipt_bulk_analyze_async,
+    receipt_dashboard_async,
+    receipt_events_stream,
+)
 from .views import (
+    EventTicketView,
     HouseholdCreateView,
     HouseholdSettleView,
+    ItemPriceHistoryView,
     ManualExpenseCreateView,
+    NotificationInboxView,
+    NotificationMarkReadView,
     ReceiptAnalyzeView,
     ReceiptBulkAnalyzeView,
     ReceiptAnalysesView,
+    ReceiptArchiveImportView,
+    ReceiptBootstrapView,
+    ReceiptChangesView,
     ReceiptDashboardView,
     ReceiptDeleteView,
+    ReceiptDetailView,
     ReceiptExpensesOverviewView,
+    ReceiptInsightsView,
     ReceiptItemAssignmentsView,
+    ReceiptReportView,
+    ReceiptSearchView,
     SessionLoginView,
     SessionLogoutView,
     SessionMeView,
+    VendorAutocompleteView,
 )
 
 urlpatterns = [
@@ -21,11 +39,26 @@ urlpatterns = [
     path("settle/", HouseholdSettleView.as_view(), name="household-settle"),
     path("analyze/", ReceiptAnalyzeView.as_view(), name="receipt-analyze"),
     path("analyze/bulk/", ReceiptBulkAnalyzeView.as_view(), name="receipt-analyze-bulk"),
+    path("analyze/archive/", ReceiptArchiveImportView.as_view(), name="receipt-analyze-archive"),
+    path("async/analyze/", receipt_analyze_async, name="receipt-analyze-async"),
+    path("async/analyze/bulk/", receipt_bulk_analyze_async, name="receipt-analyze-bulk-async"),
+    path("async/dashboard/", receipt_dashboard_async, name="receipt-dashboard-async"),
+    path("events/", receipt_events_stream, name="receipt-events"),
+    path("events/ticket/", EventTicketView.as_view(), name="receipt-events-ticket"),
     path("manual/", ManualExpenseCreateView.as_view(), name="expense-manual-create"),
     path("analyses/", ReceiptAnalysesView.as_view(), name="receipt-analyses"),
+    path("search/", ReceiptSearchView.as_view(), name="receipt-search"),
+    path("changes/", ReceiptChangesView.as_view(), name="receipt-changes"),
     path("dashboard/", ReceiptDashboardView.as_view(), name="receipt-dashboard"),
+    path("bootstrap/", ReceiptBootstrapView.as_view(), name="receipt-bootstrap"),
+    path("notifications/", NotificationInboxView.as_view(), name="notification-inbox"),
+    path("notifications/read/", NotificationMarkReadView.as_view(), name="notification-mark-read"),
     path("expenses/", ReceiptExpensesOverviewView.as_view(), name="receipt-expenses-overview"),
-    path("<int:receipt_id>/", ReceiptDeleteView.as_view(), name="receipt-delete"),
+    path("reports/", ReceiptReportView.as_view(), name="receipt-report"),
+    path("insights/", ReceiptInsightsView.as_view(), name="receipt-insights"),
+    path("items/history/", ItemPriceHistoryView.as_view(), name="item-price-history"),
+    path("vendors/", VendorAutocompleteView.as_view(), name="vendor-autocomplete"),
+    path("<int:receipt_id>/", ReceiptDetailView.as_view(), name="receipt-detail"),
     path("<int:receipt_id>/delete/", ReceiptDeleteView.as_view(), name="receipt-delete-post"),
     path("<int:receipt_id>/items/", ReceiptItemAssignmentsView.as_view(), name="receipt-item-assignments"),
     path("session/login/", SessionLoginView.as_view(), name="session-login"),
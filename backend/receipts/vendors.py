@@ -0,0 +1,135 @@
+from difflib import SequenceMatcher
+import hashlib
+import os
+import re
+import unicodedata
+
+from asgiref.sync import sync_to_async
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+
+from .models import Vendor
+
+# Store numbers and receipt noise that should not split one vendor into many ("#0423", "store 12").
+_STORE_NUMBER_RE = re.compile(r"(?:#|\bno\.?\s*|\bstore\s+)\d+\b")
+_APOSTROPHE_RE = re.compile(r"['’`]")
+_NON_ALNUM_RE = re.compile(r"[^0-9a-z&]+")
+
+NAME_KEY_MAX_LENGTH = 255
+
+
+def _fold(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    return _APOSTROPHE_RE.sub("", "".join(char for char in text if not unicodedata.combining(char)).casefold())
+
+
+def _key(text: str) -> str:
+    return " ".join(_NON_ALNUM_RE.sub(" ", text).split())[:NAME_KEY_MAX_LENGTH]
+
+
+def name_key(name: str | None) -> str:
+    """Grouping key for a free-text name: case-folded, accents and punctuation stripped.
+
+    ``"Oat Milk, 1L"`` and ``"OAT-MILK 1l"`` share the key ``"oat milk 1l"``.
+    """
+    if not name:
+        return ""
+    return _key(_fold(name))
+
+
+def vendor_key(name: str | None) -> str:
+    """``name_key`` for a vendor, with store numbers dropped.
+
+    ``"TRADER JOE'S #552"`` and ``"Trader Joes"`` share the key ``"trader joes"``.
+    """
+    if not name:
+        return ""
+    return _key(_STORE_NUMBER_RE.sub(" ", _fold(name)))
+
+
+# Trigram (or difflib) similarity at which two vendor keys name the same store.
+VENDOR_MATCH_SIMILARITY = float(os.getenv("VENDOR_MATCH_SIMILARITY", "0.6"))
+
+
+def same_vendor(key: str, candidate: str, similarity: float) -> bool:
+    """Whether ``key`` names the vendor ``candidate``.
+
+    Besides plain similarity, one key extending the other by whole words ("walmart" and
+    "walmart supercenter") or only by spacing ("wal mart" and "walmart") is the same vendor.
+    """
+    if not key or not candidate:
+        return False
+    if similarity >= VENDOR_MATCH_SIMILARITY:
+        return True
+    shorter, longer = sorted((key, candidate), key=len)
+    return longer.startswith(f"{shorter} ") or key.replace(" ", "") == candidate.replace(" ", "")
+
+
+def closest_vendor(key: str, candidates) -> str | None:
+    """The best match for ``key`` among ``candidates`` keys, scored with difflib; ``None`` when none match."""
+    scored = sorted(
+        ((SequenceMatcher(None, key, candidate).ratio(), candidate) for candidate in candidates),
+        reverse=True,
+    )
+    return next((candidate for similarity, candidate in scored if same_vendor(key, candidate, similarity)), None)
+
+
+# How long a household's raw-to-canonical vendor key mapping stays cached.
+VENDOR_CACHE_SECONDS = int(os.getenv("VENDOR_CACHE_SECONDS", "3600"))
+# Trigram candidates checked per lookup; the index returns them best first.
+VENDOR_MATCH_CANDIDATES = 10
+
+
+def _vendor_cache_key(household_id: int, key: str) -> str:
+    return f"receipts:vendor:{household_id}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+
+def _matching_vendor_key(household_id: int, key: str) -> str | None:
+    vendors = Vendor.objects.filter(household_id=household_id)
+    if vendors.filter(key=key).exists():
+        return key
+    if connection.vendor == "postgresql":
+        # ``%`` prefilters on the trigram index (pg_trgm's 0.3 threshold); same_vendor decides.
+        candidates = (
+            vendors.filter(key__trigram_similar=key)
+            .annotate(similarity=TrigramSimilarity("key", key))
+            .order_by("-similarity")
+            .values_list("key", "similarity")[:VENDOR_MATCH_CANDIDATES]
+        )
+        return next((candidate for candidate, similarity in candidates if same_vendor(key, candidate, similarity)), None)
+    return closest_vendor(key, vendors.values_list("key", flat=True))
+
+
+def resolve_vendor_key(household_id: int | None, name: str | None, create: bool = True) -> str:
+    """Canonical vendor key for ``name`` in the household.
+
+    A name that matches no vendor gets its own ``Vendor``, unless ``create`` is false (reads);
+    its normalized key is returned either way. Writers store the result in ``Receipt.vendor_key``.
+    """
+    key = vendor_key(name)
+    if not key or not household_id:
+        return key
+
+    cache_key = _vendor_cache_key(household_id, key)
+    canonical = cache.get(cache_key)
+    if canonical is not None:
+        return canonical
+
+    canonical = _matching_vendor_key(household_id, key)
+    if canonical is None:
+        if not create:
+            return key
+        canonical = key
+        try:
+            with transaction.atomic():
+                Vendor.objects.create(household_id=household_id, key=key, name=name.strip()[:255])
+        except IntegrityError:
+            # Another writer created it first.
+            pass
+    cache.set(cache_key, canonical, VENDOR_CACHE_SECONDS)
+    return canonical
+
+
+async def aresolve_vendor_key(household_id: int | None, name: str | None) -> str:
+    return await sync_to_async(resolve_vendor_key)(household_id, name)
@@ -1,74 +1,195 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import partial
+from decimal import Decimal, ROUND_HALF_UP
+import hashlib
 import os
 
 from django.conf import settings
 from django.core import signing
-from django.db import transaction
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q, Sum
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
-from django.utils.dateparse import parse_date
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import parse_etags
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .models import HouseholdNotification, HouseholdSession, Receipt
+from .archives import ArchiveEntry, ReceiptArchive, ReceiptArchiveError
+from .changes import receipt_changes, stamp_receipt_changes
+from .events import (
+    EVENT_ANALYSIS_PROGRESS,
+    EVENT_HOUSEHOLD_SETTLED,
+    EVENT_NOTIFICATIONS_READ,
+    EVENT_RECEIPT_CREATED,
+    EVENT_RECEIPT_DELETED,
+    EVENT_RECEIPT_UPDATED,
+    publish_household_event,
+)
+from .models import HouseholdSession, Receipt
+from .money import to_decimal
+from .insights import INSIGHTS_DEFAULT_LIMIT, build_insights
+from .line_items import price_history, price_summary, sync_line_items
+from .notifications import (
+    INBOX_ORDERING,
+    latest_notifications,
+    mark_notifications_read,
+    notification_summaries,
+    notify_members,
+    unread_notification_count,
+)
+from .renderers import NDJSONRenderer
+from .reports import MAX_REPORT_BUCKETS, build_report, report_bucket_count
+from .rollups import closed_month_rows, refresh_household_months
+from .search import search_receipts, vendor_suggestions
 from .serializers import (
+    RECEIPT_RECORD_FIELDS,
+    RECEIPT_RECORD_VALUE_FIELDS,
     BulkReceiptAnalyzeResponseSerializer,
     DashboardSerializer,
+    EventTicketSerializer,
     ExpensesOverviewSerializer,
     HouseholdCreateSerializer,
+    InsightsQuerySerializer,
+    InsightsSerializer,
     ManualExpenseCreateSerializer,
+    NotificationInboxQuerySerializer,
+    NotificationInboxSerializer,
+    NotificationMarkReadSerializer,
+    PriceHistoryQuerySerializer,
+    PriceHistorySerializer,
     ReceiptBulkUploadSerializer,
+    ReceiptChangesQuerySerializer,
+    ReceiptDetailSerializer,
+    ReceiptFieldsQuerySerializer,
     ReceiptAnalysisSerializer,
-    ReceiptAnalysesSerializer,
+    ReceiptArchiveUploadSerializer,
+    ReceiptHistoryQuerySerializer,
     ReceiptItemAssignmentsUpdateSerializer,
     ReceiptRecordSerializer,
+    ReceiptSearchQuerySerializer,
     ReceiptUploadSerializer,
+    ReportQuerySerializer,
+    ReportSerializer,
     SettleHouseholdResponseSerializer,
+    VendorAutocompleteQuerySerializer,
+    VendorAutocompleteSerializer,
     SessionLoginSerializer,
     SessionStateSerializer,
+    receipt_record_rows,
 )
 from .services import ReceiptAnalysisError, analyze_receipt_image
+from .vendors import name_key, resolve_vendor_key
 
 ASSIGNED_SHARED = "shared"
 SESSION_TOKEN_SALT = "receipts.session-token"
+EVENT_TICKET_SALT = "receipts.events.ticket"
+# Event stream tickets only have to survive until the stream connects; reconnects mint a new one.
+EVENT_TICKET_SECONDS = int(os.getenv("EVENT_TICKET_SECONDS", "60"))
+EVENT_STREAM_UNAVAILABLE = "The event stream needs the ASGI server (config.asgi); poll instead."
 MAX_ANALYZE_UPLOAD_BYTES = int(os.getenv("MAX_ANALYZE_UPLOAD_BYTES", str(8 * 1024 * 1024)))
+MAX_ARCHIVE_UPLOAD_BYTES = int(os.getenv("MAX_ARCHIVE_UPLOAD_BYTES", str(512 * 1024 * 1024)))
+ARCHIVE_IMPORT_CONCURRENCY = int(os.getenv("ARCHIVE_IMPORT_CONCURRENCY", "3"))
+READ_CACHE_SECONDS = int(os.getenv("READ_CACHE_SECONDS", "0"))
+ANALYSES_DEFAULT_PAGE_SIZE = 50
+ANALYSES_ORDERING = ("-expense_date", "-uploaded_at", "-id")
+ANALYSES_CURSOR_SALT = "receipts.analyses.cursor"
+ANALYSES_CURSOR_FIELDS = ("expense_date", "uploaded_at", "id")
+SEARCH_DEFAULT_PAGE_SIZE = 20
+SEARCH_CURSOR_SALT = "receipts.search.cursor"
+NOTIFICATIONS_DEFAULT_PAGE_SIZE = 20
+VENDOR_AUTOCOMPLETE_DEFAULT_LIMIT = 10
+PRICE_HISTORY_DEFAULT_PAGE_SIZE = 50
+PRICE_HISTORY_CURSOR_SALT = "receipts.price-history.cursor"
+PRICE_HISTORY_FIELDS = (
+    "id",
+    "receipt_id",
+    "expense_date",
+    "vendor",
+    "name",
+    "quantity",
+    "unit_price",
+    "amount",
+    "assigned_to",
+)
+NOTIFICATIONS_CURSOR_SALT = "receipts.notifications.cursor"
+# Columns ReceiptRecordSerializer reads; list paths load only these and leave raw_text/image behind.
+RECEIPT_RECORD_COLUMNS = (*RECEIPT_RECORD_VALUE_FIELDS, "household")
+# History filters that make the bootstrap history unusable as the dashboard's recent receipts.
+BOOTSTRAP_SHARED_HISTORY_BLOCKERS = ("date_from", "date_to", "category", "member", "status", "settled", "cursor")
 
 
 def _valid_user_codes():
     return {Receipt.USER_1, Receipt.USER_2}
 
 
-def _build_session_token(household: HouseholdSession, user_code: str) -> str:
+def _build_signed_claims(household: HouseholdSession, user_code: str, salt: str) -> str:
     return signing.dumps(
         {
             "household_id": household.id,
             "user_code": user_code,
         },
-        salt=SESSION_TOKEN_SALT,
+        salt=salt,
     )
 
 
-def _parse_session_token(token: str):
+def _signed_claims(token: str, salt: str, max_age: int):
     if not token:
         return None, None
     try:
-        payload = signing.loads(
-            token,
-            salt=SESSION_TOKEN_SALT,
-            max_age=getattr(settings, "SESSION_COOKIE_AGE", 1209600),
-        )
-    except (signing.BadSignature, signing.SignatureExpired, ValueError, TypeError):
+        payload = signing.loads(token, salt=salt, max_age=max_age)
+    except (signing.BadSignature, signing.SignatureExpired, ValueError, TypeError, AttributeError):
         return None, None
 
     user_code = payload.get("user_code")
     household_id = payload.get("household_id")
     if user_code not in _valid_user_codes() or not household_id:
         return None, None
+    return household_id, user_code
+
+
+def _build_session_token(household: HouseholdSession, user_code: str) -> str:
+    return _build_signed_claims(household, user_code, SESSION_TOKEN_SALT)
+
+
+def _session_token_claims(token: str):
+    return _signed_claims(token, SESSION_TOKEN_SALT, getattr(settings, "SESSION_COOKIE_AGE", 1209600))
+
+
+def _build_event_ticket(household: HouseholdSession, user_code: str) -> str:
+    """A short-lived ticket that opens the household's event stream and nothing else.
+
+    ``EventSource`` cannot send headers, so the ticket travels in the query string, where it
+    may be logged; the session token never does.
+    """
+    return _build_signed_claims(household, user_code, EVENT_TICKET_SALT)
+
+
+def _event_ticket_claims(ticket: str):
+    return _signed_claims(ticket, EVENT_TICKET_SALT, EVENT_TICKET_SECONDS)
+
+
+def _served_over_asgi(request) -> bool:
+    """Whether this worker runs under ASGI; under WSGI an endless stream would pin a worker thread."""
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+def _parse_session_token(token: str):
+    household_id, user_code = _session_token_claims(token)
+    if not household_id:
+        return None, None
 
     household = HouseholdSession.objects.filter(id=household_id).first()
     if not household:
@@ -76,6 +197,16 @@ def _parse_session_token(token: str):
     return household, user_code
 
 
+def _request_session_token(request) -> str:
+    auth_header = request.headers.get("Authorization", "").strip()
+    token = ""
+    if auth_header.lower().startswith("bearer "):
+        token = auth_header[7:].strip()
+    if not token:
+        token = request.headers.get("X-Session-Token", "").strip()
+    return token
+
+
 def _session_context(request):
     user_code = request.session.get("user_code")
     household_id = request.session.get("household_id")
@@ -85,14 +216,7 @@ def _session_context(request):
         if household:
             return household, user_code
 
-    auth_header = request.headers.get("Authorization", "").strip()
-    token = ""
-    if auth_header.lower().startswith("bearer "):
-        token = auth_header[7:].strip()
-    if not token:
-        token = request.headers.get("X-Session-Token", "").strip()
-
-    return _parse_session_token(token)
+    return _parse_session_token(_request_session_token(request))
 
 
 def _parse_receipt_date(value: str | None):
@@ -120,15 +244,6 @@ def _parse_receipt_date(value: str | None):
     return None
 
 
-def _to_decimal(value):
-    if value in (None, ""):
-        return None
-    try:
-        return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except (InvalidOperation, ValueError, TypeError):
-        return None
-
-
 def _normalize_receipt_items(items):
     normalized_items = []
     for item in items or []:
@@ -159,98 +274,50 @@ def _normalize_receipt_category(value: str | None):
     return normalized if normalized in valid_categories else Receipt.CATEGORY_OTHER
 
 
-def _item_amount(item):
-    total_price = _to_decimal(item.get("total_price"))
-    if total_price is not None:
-        return total_price
-
-    quantity = _to_decimal(item.get("quantity"))
-    unit_price = _to_decimal(item.get("unit_price"))
-    if quantity is not None and unit_price is not None:
-        return (quantity * unit_price).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    return Decimal("0.00")
-
-
-def _receipt_effective_total(receipt: Receipt) -> Decimal:
-    if receipt.total is not None:
-        return receipt.total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+def _sum_or_zero(value) -> Decimal:
+    return (value or Decimal("0.00")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
-    items_total = sum((_item_amount(item) for item in (receipt.items or [])), Decimal("0.00"))
-    if items_total > Decimal("0.00"):
-        return items_total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
-    subtotal = receipt.subtotal or Decimal("0.00")
-    tax = receipt.tax or Decimal("0.00")
-    tip = receipt.tip or Decimal("0.00")
-    computed = subtotal + tax + tip
-    return computed.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-
-def _calculate_balances(receipts):
-    paid_totals = {
-        Receipt.USER_1: Decimal("0.00"),
-        Receipt.USER_2: Decimal("0.00"),
-    }
-    owed_totals = {
-        Receipt.USER_1: Decimal("0.00"),
-        Receipt.USER_2: Decimal("0.00"),
+def _member_total_sums(prefix: str, condition: Q | None = None):
+    condition = condition or Q()
+    return {
+        f"{prefix}_user_1": Sum("effective_total", filter=condition & Q(uploaded_by=Receipt.USER_1)),
+        f"{prefix}_user_2": Sum("effective_total", filter=condition & Q(uploaded_by=Receipt.USER_2)),
+        f"{prefix}_count": Count("id", filter=condition),
     }
 
-    for receipt in receipts:
-        receipt_total = _receipt_effective_total(receipt)
-        covered_by_items = Decimal("0.00")
-        for item in receipt.items or []:
-            amount = _item_amount(item)
-            if amount <= Decimal("0.00"):
-                continue
-
-            covered_by_items += amount
-            assigned_to = item.get("assigned_to", ASSIGNED_SHARED)
-            if assigned_to == Receipt.USER_1:
-                owed_totals[Receipt.USER_1] += amount
-            elif assigned_to == Receipt.USER_2:
-                owed_totals[Receipt.USER_2] += amount
-            else:
-                half = (amount / 2).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                owed_totals[Receipt.USER_1] += half
-                owed_totals[Receipt.USER_2] += amount - half
 
-        paid_totals[receipt.uploaded_by] += receipt_total
+def _balance_sums(prefix: str, condition: Q | None = None):
+    condition = condition or Q()
+    return {
+        **_member_total_sums(f"{prefix}_paid", condition),
+        f"{prefix}_owed_user_1": Sum("owed_user_1", filter=condition),
+        f"{prefix}_owed_user_2": Sum("owed_user_2", filter=condition),
+    }
 
-        remainder = receipt_total - covered_by_items
-        if remainder != Decimal("0.00"):
-            half = (remainder / 2).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            owed_totals[Receipt.USER_1] += half
-            owed_totals[Receipt.USER_2] += remainder - half
 
-    net_balances = {
-        Receipt.USER_1: (paid_totals[Receipt.USER_1] - owed_totals[Receipt.USER_1]).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        ),
-        Receipt.USER_2: (paid_totals[Receipt.USER_2] - owed_totals[Receipt.USER_2]).quantize(
-            Decimal("0.01"), rounding=ROUND_HALF_UP
-        ),
+def _net_balances_from_sums(sums, prefix: str):
+    return {
+        Receipt.USER_1: _sum_or_zero(sums[f"{prefix}_paid_user_1"]) - _sum_or_zero(sums[f"{prefix}_owed_user_1"]),
+        Receipt.USER_2: _sum_or_zero(sums[f"{prefix}_paid_user_2"]) - _sum_or_zero(sums[f"{prefix}_owed_user_2"]),
     }
-    return net_balances
 
 
-def _sum_by_user(queryset):
-    totals = {
-        Receipt.USER_1: Decimal("0.00"),
-        Receipt.USER_2: Decimal("0.00"),
-    }
+def _open_receipts(household: HouseholdSession, date_from: date, date_to: date):
+    """Saved receipts in the range that have not been settled yet."""
+    return household.receipts.filter(
+        is_saved=True,
+        settled_at__isnull=True,
+        expense_date__range=(date_from, date_to),
+    )
 
-    for receipt in queryset:
-        totals[receipt.uploaded_by] += _receipt_effective_total(receipt)
 
-    totals[Receipt.USER_1] = totals[Receipt.USER_1].quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    totals[Receipt.USER_2] = totals[Receipt.USER_2].quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    return totals
+def _calculate_balances(queryset):
+    return _net_balances_from_sums(queryset.aggregate(**_balance_sums("open")), "open")
 
 
-def _sum_by_category(queryset):
-    totals = {
+def _empty_category_totals():
+    return {
         Receipt.CATEGORY_SUPERMARKET: Decimal("0.00"),
         Receipt.CATEGORY_BILLS: Decimal("0.00"),
         Receipt.CATEGORY_TAXES: Decimal("0.00"),
@@ -258,13 +325,30 @@ def _sum_by_category(queryset):
         Receipt.CATEGORY_OTHER: Decimal("0.00"),
     }
 
-    for receipt in queryset:
-        category = _normalize_receipt_category(getattr(receipt, "category", None))
-        totals[category] += _receipt_effective_total(receipt)
 
-    for key in totals:
-        totals[key] = totals[key].quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    return totals
+def _empty_month_sums():
+    return {"month_user_1": None, "month_user_2": None, "month_count": 0}
+
+
+def _overview_sums_by_month(rows):
+    """Fold ``(month, category, uploaded_by)`` aggregate rows into per-month member and category totals."""
+    sums_by_month = {}
+    categories_by_month = {}
+    for row in rows:
+        month_start = row["month"]
+        if isinstance(month_start, datetime):
+            month_start = month_start.date()
+        member_total = _sum_or_zero(row["member_total"])
+
+        month_sums = sums_by_month.setdefault(month_start, _empty_month_sums())
+        sums_key = f"month_{row['uploaded_by']}"
+        if sums_key in month_sums:
+            month_sums[sums_key] = (month_sums[sums_key] or Decimal("0.00")) + member_total
+        month_sums["month_count"] += row["row_count"]
+
+        category_totals = categories_by_month.setdefault(month_start, _empty_category_totals())
+        category_totals[_normalize_receipt_category(row["category"])] += member_total
+    return sums_by_month, categories_by_month
 
 
 def _category_totals_payload(totals):
@@ -279,20 +363,20 @@ def _category_totals_payload(totals):
     }
 
 
-def _build_month_summary(queryset, start_date, end_date):
-    totals = _sum_by_user(queryset)
-    summary = {
+def _month_summary_from_sums(sums, prefix: str, start_date, end_date):
+    user_1_total = _sum_or_zero(sums[f"{prefix}_user_1"])
+    user_2_total = _sum_or_zero(sums[f"{prefix}_user_2"])
+    return {
         "month_label": start_date.strftime("%B %Y"),
         "start_date": start_date,
         "end_date": end_date,
         "totals": {
-            "user_1": float(totals[Receipt.USER_1]),
-            "user_2": float(totals[Receipt.USER_2]),
-            "combined": float(totals[Receipt.USER_1] + totals[Receipt.USER_2]),
+            "user_1": float(user_1_total),
+            "user_2": float(user_2_total),
+            "combined": float(user_1_total + user_2_total),
         },
-        "receipt_count": queryset.count(),
+        "receipt_count": sums[f"{prefix}_count"],
     }
-    return summary, totals
 
 
 def _month_start_with_offset(reference_start: date, month_offset: int) -> date:
@@ -391,19 +475,540 @@ def _build_notifications(settlement, currency: str, household: HouseholdSession)
 
 
 def _latest_notifications_by_user(household: HouseholdSession):
-    notifications = []
-    for user_code, user_name in household.member_names().items():
-        record = household.notifications.filter(user_code=user_code).order_by("-created_at").first()
-        if not record:
+    return notification_summaries(household, latest_notifications(household))
+
+
+def _analyzed_receipt_fields(household: HouseholdSession, user_code: str, image, parsed_analysis):
+    return {
+        "household": household,
+        "uploaded_by": user_code,
+        "image": image,
+        "expense_date": _parse_receipt_date(parsed_analysis.get("receipt_date")) or timezone.localdate(),
+        "vendor": parsed_analysis.get("vendor", ""),
+        "currency": parsed_analysis.get("currency") or "USD",
+        "category": _normalize_receipt_category(parsed_analysis.get("category")),
+        "subtotal": to_decimal(parsed_analysis.get("subtotal")),
+        "tax": to_decimal(parsed_analysis.get("tax")),
+        "tip": to_decimal(parsed_analysis.get("tip")),
+        "total": to_decimal(parsed_analysis.get("total")),
+        "items": _normalize_receipt_items(parsed_analysis.get("items", [])),
+        "raw_text": parsed_analysis.get("raw_text", ""),
+        "is_saved": False,
+    }
+
+
+def _record_household_write(
+    household: HouseholdSession,
+    dates=(),
+    changed_ids=(),
+    deleted_ids=(),
+    event: str | None = None,
+    items_changed: bool = True,
+    **event_data,
+) -> int:
+    """Refresh rollup months touched by a write, bump the household data version, stamp the
+    written receipts with it for delta sync and publish ``event`` to the household's stream.
+
+    The line items of ``changed_ids`` are re-projected unless ``items_changed`` is false.
+    Call inside the write's transaction so cached reads, ETags and events never outlive the data.
+    """
+    refresh_household_months(household.id, dates)
+    if items_changed:
+        sync_line_items(changed_ids)
+    version = household.bump_data_version()
+    stamp_receipt_changes(household.id, version, changed_ids, deleted_ids)
+    if event:
+        ids = [*changed_ids, *deleted_ids] or None
+        publish_household_event(household.id, event, version, ids, **event_data)
+    return version
+
+
+def _create_analyzed_receipt(household: HouseholdSession, user_code: str, image, parsed_analysis) -> Receipt:
+    # Analyzed receipts start as unsaved drafts, so there are no rollup months to refresh.
+    fields = _analyzed_receipt_fields(household, user_code, image, parsed_analysis)
+    with transaction.atomic():
+        receipt = Receipt.objects.create(**fields, vendor_key=resolve_vendor_key(household.id, fields["vendor"]))
+        _record_household_write(household, changed_ids=[receipt.id], event=EVENT_RECEIPT_CREATED, user=user_code)
+    return receipt
+
+
+def _dashboard_window(today: date):
+    current_start = today.replace(day=1)
+    last_end = current_start - timedelta(days=1)
+    last_start = last_end.replace(day=1)
+    return current_start, last_start, last_end
+
+
+def _current_month_rows(household: HouseholdSession, today: date):
+    """Per category, uploader and settled state totals for the live current-month window."""
+    current_start, _, _ = _dashboard_window(today)
+    return (
+        household.receipts.filter(is_saved=True, expense_date__range=(current_start, today))
+        .order_by()
+        .values(
+            "category",
+            "uploaded_by",
+            settled=ExpressionWrapper(Q(settled_at__isnull=False), output_field=BooleanField()),
+        )
+        .annotate(
+            member_total=Sum("effective_total"),
+            owed_1_total=Sum("owed_user_1"),
+            owed_2_total=Sum("owed_user_2"),
+            row_count=Count("id"),
+        )
+    )
+
+
+def _add_to_sums(sums, key: str, amount):
+    if key in sums:
+        sums[key] += amount or Decimal("0.00")
+
+
+def _dashboard_sums(current_rows, last_month_rows):
+    """Fold current-month rows and last month's rollup rows into the flat sums the dashboard reads."""
+    sums = {
+        f"{prefix}_{user_code}": Decimal("0.00")
+        for prefix in ("current", "open_paid", "open_owed", "last")
+        for user_code in (Receipt.USER_1, Receipt.USER_2)
+    }
+    sums.update(current_count=0, open_paid_count=0, last_count=0)
+
+    for row in current_rows:
+        _add_to_sums(sums, f"current_{row['uploaded_by']}", row["member_total"])
+        sums["current_count"] += row["row_count"]
+        if row["settled"]:
             continue
-        notifications.append(
+        _add_to_sums(sums, f"open_paid_{row['uploaded_by']}", row["member_total"])
+        _add_to_sums(sums, "open_owed_user_1", row["owed_1_total"])
+        _add_to_sums(sums, "open_owed_user_2", row["owed_2_total"])
+        sums["open_paid_count"] += row["row_count"]
+
+    for row in last_month_rows:
+        _add_to_sums(sums, f"last_{row['uploaded_by']}", row["member_total"])
+        sums["last_count"] += row["row_count"]
+    return sums
+
+
+def _build_dashboard_payload(
+    household: HouseholdSession,
+    user_code: str,
+    today: date,
+    sums,
+    currency: str | None,
+    recent_receipts,
+    latest_notifications,
+):
+    """Assemble the dashboard from the flat ``_dashboard_sums`` totals.
+
+    ``latest_notifications`` is only consulted when nothing is left to settle.
+    """
+    current_start, last_start, last_end = _dashboard_window(today)
+    current_month = _month_summary_from_sums(sums, "current", current_start, today)
+    last_month = _month_summary_from_sums(sums, "last", last_start, last_end)
+
+    settlement = _build_settlement(_net_balances_from_sums(sums, "open"), household)
+    currency = currency or "USD"
+    if _has_unsettled_current_month(sums):
+        notifications = _build_notifications(settlement, currency, household)
+    else:
+        notifications = latest_notifications or _build_notifications(settlement, currency, household)
+
+    return {
+        "household_code": household.code,
+        "household_name": household.household_name,
+        "current_user": user_code,
+        "current_user_name": household.name_for_code(user_code),
+        "members": household.member_names(),
+        "current_date": today,
+        "current_month": current_month,
+        "last_month": last_month,
+        "settlement": settlement,
+        "notifications": notifications,
+        "unread_notifications": unread_notification_count(household, user_code),
+        "recent_receipts": list(recent_receipts),
+    }
+
+
+def _dashboard_querysets(household: HouseholdSession, today: date):
+    current_start, last_start, _ = _dashboard_window(today)
+    saved_receipts = household.receipts.filter(is_saved=True)
+    window_qs = saved_receipts.filter(expense_date__range=(current_start, today))
+    last_month_rows = closed_month_rows(household, last_start, last_start)
+    recent_receipts = saved_receipts.order_by(*ANALYSES_ORDERING).only(*RECEIPT_RECORD_COLUMNS)[:4]
+    return window_qs, last_month_rows, recent_receipts
+
+
+def _dashboard_currency_querysets(window_qs):
+    """Currency lookups in preference order: open current-month receipts first, then any this month."""
+    current_month_qs = window_qs.exclude(currency__exact="")
+    return (
+        current_month_qs.filter(settled_at__isnull=True).values_list("currency", flat=True),
+        current_month_qs.values_list("currency", flat=True),
+    )
+
+
+def _dashboard_currency(window_qs):
+    for currency_qs in _dashboard_currency_querysets(window_qs):
+        currency = currency_qs.first()
+        if currency:
+            return currency
+    return None
+
+
+def _has_unsettled_current_month(sums) -> bool:
+    return sums["open_paid_count"] > 0
+
+
+def _read_etag(household: HouseholdSession, *parts) -> str:
+    tag_source = ":".join(str(part) for part in (household.id, household.data_version, *parts))
+    return f'W/"{hashlib.sha256(tag_source.encode()).hexdigest()[:32]}"'
+
+
+def _etag_matches(request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    candidates = parse_etags(if_none_match)
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag.removeprefix("W/") for candidate in candidates
+    )
+
+
+def _versioned_read(request, household: HouseholdSession, build_data, *etag_parts):
+    """Serve a household read keyed on its data version.
+
+    A matching ``If-None-Match`` gets a 304 before ``build_data`` runs any query. With
+    ``READ_CACHE_SECONDS`` set, rendered JSON bodies are cached under the same ETag.
+    """
+    renderer = request.accepted_renderer
+    etag = _read_etag(household, *etag_parts, renderer.format)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if READ_CACHE_SECONDS <= 0 or renderer.format != "json":
+        return Response(build_data(), status=status.HTTP_200_OK, headers=headers)
+
+    cache_key = f"receipts:read:{etag}"
+    body = cache.get(cache_key)
+    if body is None:
+        body = renderer.render(build_data(), request.accepted_media_type, {"request": request})
+        cache.set(cache_key, body, READ_CACHE_SECONDS)
+    return HttpResponse(body, content_type=renderer.media_type, headers=headers)
+
+
+def _dashboard_data(
+    household: HouseholdSession,
+    user_code: str,
+    today: date,
+    current_rows=None,
+    last_month_rows=None,
+    recent_rows=None,
+    receipt_fields=None,
+):
+    """Build the dashboard payload, querying only the rows the caller did not already load.
+
+    ``recent_rows`` are already-rendered receipt records and replace the recent receipts query;
+    otherwise the recent receipts are rendered with ``receipt_fields``.
+    """
+    window_qs, last_month_qs, recent_qs = _dashboard_querysets(household, today)
+    if current_rows is None:
+        current_rows = _current_month_rows(household, today)
+    if last_month_rows is None:
+        last_month_rows = last_month_qs
+    sums = _dashboard_sums(current_rows, last_month_rows)
+    latest_notifications = None
+    if not _has_unsettled_current_month(sums):
+        latest_notifications = _latest_notifications_by_user(household)
+
+    payload = _build_dashboard_payload(
+        household,
+        user_code,
+        today,
+        sums,
+        _dashboard_currency(window_qs),
+        [],
+        latest_notifications,
+    )
+    data = DashboardSerializer(payload).data
+    if recent_rows is None:
+        recent_rows = receipt_record_rows(recent_qs, household, receipt_fields)
+    data["recent_receipts"] = recent_rows
+    return data
+
+
+def _overview_month_rows(household: HouseholdSession, today: date):
+    """The five closed months before the current one, read from the rollup table."""
+    current_start = today.replace(day=1)
+    return closed_month_rows(
+        household,
+        _month_start_with_offset(current_start, -5),
+        _month_start_with_offset(current_start, -1),
+    )
+
+
+def _expenses_overview_data(household: HouseholdSession, today: date, closed_rows=None, current_rows=None):
+    current_start = today.replace(day=1)
+    # Closed months come from the rollup table; only the current month is aggregated live.
+    if closed_rows is None:
+        closed_rows = _overview_month_rows(household, today)
+    if current_rows is None:
+        current_rows = _current_month_rows(household, today)
+    sums_by_month, categories_by_month = _overview_sums_by_month(
+        [*closed_rows, *({**row, "month": current_start} for row in current_rows)]
+    )
+
+    six_month_trend = []
+    six_month_category_trend = []
+    for offset in range(-5, 1):
+        month_start = _month_start_with_offset(current_start, offset)
+        month_end = today if offset == 0 else _month_end(month_start)
+        month_sums = sums_by_month.get(month_start, _empty_month_sums())
+        month_categories = categories_by_month.get(month_start, _empty_category_totals())
+        six_month_trend.append(_month_summary_from_sums(month_sums, "month", month_start, month_end))
+        six_month_category_trend.append(
             {
-                "user": user_name,
-                "message": record.message,
-                "read": record.read,
+                "month_label": month_start.strftime("%B %Y"),
+                "start_date": month_start,
+                "end_date": month_end,
+                "categories": _category_totals_payload(month_categories),
             }
         )
-    return notifications
+
+    current_month = six_month_trend[-1]
+    last_month = six_month_trend[-2]
+    current_month_categories = six_month_category_trend[-1]["categories"]
+    last_month_categories = six_month_category_trend[-2]["categories"]
+
+    payload = {
+        "household_code": household.code,
+        "household_name": household.household_name,
+        "current_date": today,
+        "members": household.member_names(),
+        "current_month": current_month,
+        "last_month": last_month,
+        "six_month_trend": six_month_trend,
+        "current_month_categories": current_month_categories,
+        "last_month_categories": last_month_categories,
+        "six_month_category_trend": six_month_category_trend,
+    }
+
+    return ExpensesOverviewSerializer(payload).data
+
+
+def _report_data(household: HouseholdSession, date_from: date, date_to: date, group_by: str):
+    payload = build_report(household, date_from, date_to, group_by)
+    payload["members"] = household.member_names()
+    return ReportSerializer(payload).data
+
+
+def _insights_data(household: HouseholdSession, month: date, limit: int):
+    return InsightsSerializer(build_insights(household, month, limit)).data
+
+
+def _filtered_receipt_history(household: HouseholdSession, filters):
+    receipts = household.receipts.order_by(*ANALYSES_ORDERING)
+    if filters.get("date_from"):
+        receipts = receipts.filter(expense_date__gte=filters["date_from"])
+    if filters.get("date_to"):
+        receipts = receipts.filter(expense_date__lte=filters["date_to"])
+    if filters.get("category"):
+        receipts = receipts.filter(category=filters["category"])
+    if filters.get("member"):
+        receipts = receipts.filter(uploaded_by=filters["member"])
+    if filters.get("status"):
+        receipts = receipts.filter(is_saved=filters["status"] == ReceiptHistoryQuerySerializer.STATUS_SAVED)
+    if filters.get("settled"):
+        receipts = receipts.filter(settled_at__isnull=filters["settled"] != "true")
+    return receipts
+
+
+def _encode_analyses_cursor(row) -> str:
+    # ``row`` is a rendered history entry, so its dates are already ISO 8601 strings.
+    position = [row[field] for field in ANALYSES_CURSOR_FIELDS]
+    return signing.dumps(position, salt=ANALYSES_CURSOR_SALT, compress=True)
+
+
+def _decode_analyses_cursor(cursor: str):
+    try:
+        expense_date, uploaded_at, receipt_id = signing.loads(cursor, salt=ANALYSES_CURSOR_SALT)
+        position = (parse_date(expense_date), parse_datetime(uploaded_at), int(receipt_id))
+    except (signing.BadSignature, TypeError, ValueError):
+        position = None
+    if not position or None in position:
+        raise ValidationError({"cursor": ["Invalid or expired cursor."]})
+    return position
+
+
+def _after_cursor(receipts, position):
+    # Row-wise "(expense_date, uploaded_at, id) < position" for the descending history order.
+    # The leading ``expense_date <= position`` bound is what the planner turns into a range on
+    # receipt_history_idx, so every page starts where the last one ended regardless of depth;
+    # the OR only trims the rows sharing the cursor's date.
+    expense_date, uploaded_at, receipt_id = position
+    return receipts.filter(
+        Q(expense_date__lte=expense_date),
+        Q(expense_date__lt=expense_date)
+        | Q(expense_date=expense_date, uploaded_at__lt=uploaded_at)
+        | Q(expense_date=expense_date, uploaded_at=uploaded_at, id__lt=receipt_id)
+    )
+
+
+def _analyses_data(household: HouseholdSession, query, position=None):
+    receipts = _filtered_receipt_history(household, query)
+    count = receipts.count() if query.get("include_count") == "true" else None
+    fields = query.get("receipt_fields")
+
+    # Every response is one page; without ``limit`` the default page size applies.
+    limit = query.get("limit", ANALYSES_DEFAULT_PAGE_SIZE)
+    if position:
+        receipts = _after_cursor(receipts, position)
+    page_fields = fields
+    if fields is not None:
+        # The cursor is built from the last row, so its columns are loaded even when not requested.
+        page_fields = tuple(field for field in RECEIPT_RECORD_FIELDS if field in {*fields, *ANALYSES_CURSOR_FIELDS})
+    page = receipt_record_rows(receipts[: limit + 1], household, page_fields)
+    next_cursor = _encode_analyses_cursor(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+    if page_fields != fields:
+        page = [{field: row[field] for field in fields} for row in page]
+
+    payload = {"analyses": page, "next_cursor": next_cursor}
+
+    if count is not None:
+        payload["count"] = count
+    return payload
+
+
+def _encode_search_cursor(text: str, rank: float, receipt_id: int) -> str:
+    return signing.dumps([text, rank, receipt_id], salt=SEARCH_CURSOR_SALT)
+
+
+def _decode_search_cursor(cursor: str, text: str):
+    try:
+        cursor_text, rank, receipt_id = signing.loads(cursor, salt=SEARCH_CURSOR_SALT)
+        position = (float(rank), int(receipt_id))
+    except (signing.BadSignature, TypeError, ValueError):
+        position = None
+    # A cursor only continues the search it came from.
+    if not position or cursor_text != text:
+        raise ValidationError({"cursor": ["Invalid or expired cursor."]})
+    return position
+
+
+def _receipt_search_data(household: HouseholdSession, query, position=None):
+    limit = query.get("limit", SEARCH_DEFAULT_PAGE_SIZE)
+    matches = list(search_receipts(household, query["q"], position).values_list("id", "rank")[: limit + 1])
+    page = matches[:limit]
+
+    fields = query.get("receipt_fields")
+    page_fields = fields
+    if fields is not None and "id" not in fields:
+        # Rows are put back in rank order by id, so the id is loaded even when not requested.
+        page_fields = tuple(field for field in RECEIPT_RECORD_FIELDS if field in {*fields, "id"})
+    order = {receipt_id: index for index, (receipt_id, _) in enumerate(page)}
+    rows = receipt_record_rows(household.receipts.filter(id__in=order), household, page_fields)
+    rows.sort(key=lambda row: order[row["id"]])
+    if page_fields != fields:
+        rows = [{field: row[field] for field in fields} for row in rows]
+
+    next_cursor = None
+    if len(matches) > limit:
+        last_id, last_rank = page[-1]
+        next_cursor = _encode_search_cursor(query["q"], last_rank, last_id)
+    return {"results": rows, "next_cursor": next_cursor}
+
+
+def _encode_price_history_cursor(item_key: str, expense_date: date, line_item_id: int) -> str:
+    return signing.dumps([item_key, expense_date.isoformat(), line_item_id], salt=PRICE_HISTORY_CURSOR_SALT)
+
+
+def _decode_price_history_cursor(cursor: str, item_key: str):
+    try:
+        cursor_key, expense_date, line_item_id = signing.loads(cursor, salt=PRICE_HISTORY_CURSOR_SALT)
+        position = (date.fromisoformat(expense_date), int(line_item_id))
+    except (signing.BadSignature, TypeError, ValueError):
+        position = None
+    # A cursor only continues the item it came from.
+    if not position or cursor_key != item_key:
+        raise ValidationError({"cursor": ["Invalid or expired cursor."]})
+    return position
+
+
+def _price_history_data(household: HouseholdSession, query, item_key: str, position=None):
+    limit = query.get("limit", PRICE_HISTORY_DEFAULT_PAGE_SIZE)
+    line_items = price_history(household, query["item"], query.get("vendor"))
+    page_items = price_history(household, query["item"], query.get("vendor"), position)
+    rows = list(page_items.values(*PRICE_HISTORY_FIELDS)[: limit + 1])
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_price_history_cursor(item_key, page[-1]["expense_date"], page[-1]["id"])
+    payload = {
+        "item_key": item_key,
+        "summary": price_summary(line_items),
+        "history": page,
+        "next_cursor": next_cursor,
+    }
+    return PriceHistorySerializer(payload).data
+
+
+def _vendor_autocomplete_data(household: HouseholdSession, text: str, limit: int):
+    vendors = vendor_suggestions(household, text, limit).values("key", "name")
+    return VendorAutocompleteSerializer({"vendors": vendors}).data
+
+
+def _receipt_changes_data(household: HouseholdSession, since: int | None, fields=None):
+    # The version loaded with the household bounds this sync and becomes the client's next cursor.
+    until = household.data_version
+    if since is not None and since > until:
+        raise ValidationError({"since": ["Cursor is ahead of this household's history."]})
+
+    receipts, deleted_ids = receipt_changes(household, since, until)
+    return {
+        "changed": receipt_record_rows(receipts.order_by(*ANALYSES_ORDERING), household, fields),
+        "deleted": deleted_ids,
+        "cursor": until,
+        "full": since is None,
+    }
+
+
+def _encode_notifications_cursor(record) -> str:
+    return signing.dumps([record.created_at.isoformat(), record.id], salt=NOTIFICATIONS_CURSOR_SALT)
+
+
+def _decode_notifications_cursor(cursor: str):
+    try:
+        created_at, notification_id = signing.loads(cursor, salt=NOTIFICATIONS_CURSOR_SALT)
+        position = (parse_datetime(created_at), int(notification_id))
+    except (signing.BadSignature, TypeError, ValueError):
+        position = None
+    if not position or None in position:
+        raise ValidationError({"cursor": ["Invalid or expired cursor."]})
+    return position
+
+
+def _notification_inbox_data(household: HouseholdSession, user_code: str, limit: int, position=None):
+    notifications = household.notifications.filter(user_code=user_code).order_by(*INBOX_ORDERING)
+    if position:
+        created_at, notification_id = position
+        notifications = notifications.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=notification_id)
+        )
+    page = list(notifications.only("id", "message", "read", "created_at")[: limit + 1])
+    payload = {
+        "notifications": page[:limit],
+        "next_cursor": _encode_notifications_cursor(page[limit - 1]) if len(page) > limit else None,
+        "unread_count": unread_notification_count(household, user_code),
+    }
+    return NotificationInboxSerializer(payload).data
+
+
+def _receipt_detail_data(household: HouseholdSession, receipt_id: int):
+    receipt = household.receipts.filter(id=receipt_id).first()
+    if not receipt:
+        raise NotFound("Receipt not found.")
+    return {"receipt": ReceiptDetailSerializer(receipt).data}
 
 
 def _build_session_state(household: HouseholdSession | None, user_code: str | None):
@@ -426,6 +1031,42 @@ def _build_session_state(household: HouseholdSession | None, user_code: str | No
     }
 
 
+def _bootstrap_data(household: HouseholdSession, user_code: str, today: date, query, position=None):
+    """Session, dashboard, expenses overview and receipt history in one payload.
+
+    The live current-month rows and the closed-month rollup rows are loaded once and feed both
+    the dashboard and the overview; an unfiltered history also supplies the recent receipts.
+    """
+    _, last_start, _ = _dashboard_window(today)
+    current_rows = list(_current_month_rows(household, today))
+    closed_rows = list(_overview_month_rows(household, today))
+    analyses = _analyses_data(household, query, position)
+
+    recent_rows = None
+    fields = query.get("receipt_fields")
+    # Rows can only stand in for the recent receipts if they say which ones are saved.
+    shares_history = fields is None or "is_saved" in fields
+    if shares_history and not any(query.get(key) for key in BOOTSTRAP_SHARED_HISTORY_BLOCKERS):
+        saved_rows = [row for row in analyses["analyses"] if row["is_saved"]]
+        if len(saved_rows) >= 4 or not analyses.get("next_cursor"):
+            recent_rows = saved_rows[:4]
+
+    return {
+        "session": SessionStateSerializer(_build_session_state(household, user_code)).data,
+        "dashboard": _dashboard_data(
+            household,
+            user_code,
+            today,
+            current_rows=current_rows,
+            last_month_rows=[row for row in closed_rows if row["month"] == last_start],
+            recent_rows=recent_rows,
+            receipt_fields=fields,
+        ),
+        "expenses": _expenses_overview_data(household, today, closed_rows=closed_rows, current_rows=current_rows),
+        "analyses": analyses,
+    }
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class HouseholdCreateView(APIView):
     def post(self, request, *args, **kwargs):
@@ -486,33 +1127,185 @@ class ReceiptAnalyzeView(APIView):
         output_serializer = ReceiptAnalysisSerializer(data=analysis)
         output_serializer.is_valid(raise_exception=True)
         parsed_analysis = output_serializer.validated_data
-        expense_date = _parse_receipt_date(parsed_analysis.get("receipt_date")) or timezone.localdate()
         image.seek(0)
 
-        receipt = Receipt.objects.create(
-            household=household,
-            uploaded_by=user_code,
-            image=image,
-            expense_date=expense_date,
-            vendor=parsed_analysis.get("vendor", ""),
-            currency=parsed_analysis.get("currency") or "USD",
-            category=_normalize_receipt_category(parsed_analysis.get("category")),
-            subtotal=_to_decimal(parsed_analysis.get("subtotal")),
-            tax=_to_decimal(parsed_analysis.get("tax")),
-            tip=_to_decimal(parsed_analysis.get("tip")),
-            total=_to_decimal(parsed_analysis.get("total")),
-            items=_normalize_receipt_items(parsed_analysis.get("items", [])),
-            raw_text=parsed_analysis.get("raw_text", ""),
-            is_saved=False,
-        )
+        receipt = _create_analyzed_receipt(household, user_code, image, parsed_analysis)
 
         receipt_serializer = ReceiptRecordSerializer(receipt)
         return Response({"receipt": receipt_serializer.data}, status=status.HTTP_201_CREATED)
 
 
+def _analyze_upload(image_bytes: bytes, mime_type: str, filename: str, index: int, total: int):
+    """Run one bulk/archive image through the model, returning ``(parsed_analysis, failure)``."""
+    try:
+        analysis = analyze_receipt_image(
+            image_bytes=image_bytes,
+            mime_type=mime_type,
+            bulk_index=index,
+            bulk_total=total,
+        )
+        output_serializer = ReceiptAnalysisSerializer(data=analysis)
+        output_serializer.is_valid(raise_exception=True)
+        return output_serializer.validated_data, None
+    except (ReceiptAnalysisError, ValidationError, ValueError, TypeError) as exc:
+        return None, {"filename": filename, "detail": str(exc)}
+    except Exception:
+        return None, {"filename": filename, "detail": "Unexpected analysis service error."}
+
+
+def _iter_bulk_analysis(household: HouseholdSession, user_code: str, images):
+    """Analyze and save each image in turn, yielding ``(receipt, failure)`` as soon as it is done."""
+    total_images = len(images)
+    for index, image in enumerate(images, start=1):
+        filename = getattr(image, "name", f"receipt-{index}")
+        if getattr(image, "size", 0) and image.size > MAX_ANALYZE_UPLOAD_BYTES:
+            yield None, {
+                "filename": filename,
+                "detail": "Image file is too large. Please upload a smaller ticket image.",
+            }
+            continue
+
+        parsed_analysis, failure = _analyze_upload(
+            image.read(),
+            image.content_type or "image/jpeg",
+            filename,
+            index,
+            total_images,
+        )
+        if failure:
+            yield None, failure
+            continue
+
+        image.seek(0)
+        receipt = _create_analyzed_receipt(household, user_code, image, parsed_analysis)
+        yield receipt, None
+
+
+def _publish_analysis_progress(household: HouseholdSession, user_code: str, results, total: int):
+    """Pass ``results`` through, telling the household's event stream as each upload finishes."""
+    for index, (receipt, failure) in enumerate(results, start=1):
+        publish_household_event(
+            household.id,
+            EVENT_ANALYSIS_PROGRESS,
+            user=user_code,
+            index=index,
+            total=total,
+            failed=failure is not None,
+        )
+        yield receipt, failure
+
+
+def _analyze_archive_entry(entry: ArchiveEntry, total: int):
+    try:
+        return _analyze_upload(entry.data, entry.mime_type, entry.filename, entry.index, total)
+    finally:
+        # Worker threads get their own DB connections (the model-call governor uses them).
+        connections.close_all()
+
+
+def _iter_archive_analysis(household: HouseholdSession, user_code: str, archive: ReceiptArchive):
+    """Analyze archive entries with bounded concurrency, yielding results in archive order.
+
+    At most ``ARCHIVE_IMPORT_CONCURRENCY`` entries are read into memory at a time; the rest
+    stay compressed in the disk-spooled upload until a slot frees up.
+    """
+    total = len(archive.entries)
+    pending = deque()
+    entries = iter(archive.iter_entries())
+    with ThreadPoolExecutor(max_workers=ARCHIVE_IMPORT_CONCURRENCY) as executor:
+        while True:
+            while len(pending) < ARCHIVE_IMPORT_CONCURRENCY:
+                entry = next(entries, None)
+                if entry is None:
+                    break
+                if entry.failure:
+                    pending.append((entry, None))
+                else:
+                    pending.append((entry, executor.submit(_analyze_archive_entry, entry, total)))
+            if not pending:
+                break
+
+            entry, future = pending.popleft()
+            if future is None:
+                yield None, entry.failure
+                continue
+
+            parsed_analysis, failure = future.result()
+            if failure:
+                yield None, failure
+                continue
+
+            image = ContentFile(entry.data, name=os.path.basename(entry.filename))
+            receipt = _create_analyzed_receipt(household, user_code, image, parsed_analysis)
+            yield receipt, None
+
+
+def _stream_analysis_events(results, total: int, renderer):
+    processed_count = 0
+    failed_count = 0
+    for index, (receipt, failure) in enumerate(results, start=1):
+        if failure:
+            failed_count += 1
+            yield renderer.render({"type": "failed", "index": index, "total": total, **failure})
+            continue
+        processed_count += 1
+        yield renderer.render(
+            {
+                "type": "receipt",
+                "index": index,
+                "total": total,
+                "receipt": ReceiptRecordSerializer(receipt).data,
+            }
+        )
+
+    yield renderer.render(
+        {
+            "type": "summary",
+            "processed_count": processed_count,
+            "failed_count": failed_count,
+        }
+    )
+
+
+def _streaming_analysis_response(results, total: int, renderer):
+    response = StreamingHttpResponse(
+        _stream_analysis_events(results, total, renderer),
+        content_type=NDJSONRenderer.media_type,
+        status=status.HTTP_200_OK,
+    )
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _collected_analysis_response(results):
+    created_receipts = []
+    failed = []
+    for receipt, failure in results:
+        if failure:
+            failed.append(failure)
+        else:
+            created_receipts.append(receipt)
+
+    if not created_receipts:
+        return Response(
+            {"detail": "No receipts were analyzed successfully.", "failed": failed},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    payload = {
+        "receipts": created_receipts,
+        "processed_count": len(created_receipts),
+        "failed_count": len(failed),
+        "failed": failed,
+    }
+    serializer = BulkReceiptAnalyzeResponseSerializer(payload)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class ReceiptBulkAnalyzeView(APIView):
     parser_classes = [MultiPartParser, FormParser]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
 
     def post(self, request, *args, **kwargs):
         household, user_code = _session_context(request)
@@ -524,84 +1317,55 @@ class ReceiptBulkAnalyzeView(APIView):
         upload_serializer.is_valid(raise_exception=True)
         validated_images = upload_serializer.validated_data["images"]
 
-        created_receipts = []
-        failed = []
-        total_images = len(validated_images)
-
-        for index, image in enumerate(validated_images, start=1):
-            if getattr(image, "size", 0) and image.size > MAX_ANALYZE_UPLOAD_BYTES:
-                failed.append(
-                    {
-                        "filename": getattr(image, "name", f"receipt-{index}"),
-                        "detail": "Image file is too large. Please upload a smaller ticket image.",
-                    }
-                )
-                continue
+        results = _publish_analysis_progress(
+            household,
+            user_code,
+            _iter_bulk_analysis(household, user_code, validated_images),
+            len(validated_images),
+        )
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return _streaming_analysis_response(results, len(validated_images), request.accepted_renderer)
+        return _collected_analysis_response(results)
 
-            image_bytes = image.read()
-            mime_type = image.content_type or "image/jpeg"
 
-            try:
-                analysis = analyze_receipt_image(
-                    image_bytes=image_bytes,
-                    mime_type=mime_type,
-                    bulk_index=index,
-                    bulk_total=total_images,
-                )
-                output_serializer = ReceiptAnalysisSerializer(data=analysis)
-                output_serializer.is_valid(raise_exception=True)
-                parsed_analysis = output_serializer.validated_data
-            except (ReceiptAnalysisError, ValidationError, ValueError, TypeError) as exc:
-                failed.append(
-                    {
-                        "filename": getattr(image, "name", f"receipt-{index}"),
-                        "detail": str(exc),
-                    }
-                )
-                continue
-            except Exception:
-                failed.append(
-                    {
-                        "filename": getattr(image, "name", f"receipt-{index}"),
-                        "detail": "Unexpected analysis service error.",
-                    }
-                )
-                continue
+@method_decorator(csrf_exempt, name="dispatch")
+class ReceiptArchiveImportView(APIView):
+    parser_classes = [MultiPartParser]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
 
-            expense_date = _parse_receipt_date(parsed_analysis.get("receipt_date")) or timezone.localdate()
-            image.seek(0)
-            receipt = Receipt.objects.create(
-                household=household,
-                uploaded_by=user_code,
-                image=image,
-                expense_date=expense_date,
-                vendor=parsed_analysis.get("vendor", ""),
-                currency=parsed_analysis.get("currency") or "USD",
-                category=_normalize_receipt_category(parsed_analysis.get("category")),
-                subtotal=_to_decimal(parsed_analysis.get("subtotal")),
-                tax=_to_decimal(parsed_analysis.get("tax")),
-                tip=_to_decimal(parsed_analysis.get("tip")),
-                total=_to_decimal(parsed_analysis.get("total")),
-                items=_normalize_receipt_items(parsed_analysis.get("items", [])),
-                raw_text=parsed_analysis.get("raw_text", ""),
-                is_saved=False,
-            )
-            created_receipts.append(receipt)
+    def initialize_request(self, request, *args, **kwargs):
+        # Always spool the archive to disk, however small, so entries are read lazily from it.
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        household, user_code = _session_context(request)
+        if not household or not user_code:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        if not created_receipts:
+        upload_serializer = ReceiptArchiveUploadSerializer(data={"archive": request.FILES.get("archive")})
+        upload_serializer.is_valid(raise_exception=True)
+        archive_file = upload_serializer.validated_data["archive"]
+        if getattr(archive_file, "size", 0) > MAX_ARCHIVE_UPLOAD_BYTES:
             return Response(
-                {"detail": "No receipts were analyzed successfully.", "failed": failed},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"detail": "Archive is too large. Split it into smaller ZIP files."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             )
 
-        payload = {
-            "receipts": ReceiptRecordSerializer(created_receipts, many=True).data,
-            "processed_count": len(created_receipts),
-            "failed_count": len(failed),
-            "failed": failed,
-        }
-        serializer = BulkReceiptAnalyzeResponseSerializer(payload)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        try:
+            archive = ReceiptArchive(archive_file, max_entry_bytes=MAX_ANALYZE_UPLOAD_BYTES)
+        except ReceiptArchiveError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = _publish_analysis_progress(
+            household,
+            user_code,
+            _iter_archive_analysis(household, user_code, archive),
+            len(archive.entries),
+        )
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            return _streaming_analysis_response(results, len(archive.entries), request.accepted_renderer)
+        return _collected_analysis_response(results)
 
 
 class ReceiptDashboardView(APIView):
@@ -610,104 +1374,91 @@ class ReceiptDashboardView(APIView):
         if not household or not user_code:
             return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
 
+        query_serializer = ReceiptFieldsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        fields = query_serializer.validated_data["receipt_fields"]
         today = timezone.localdate()
-        current_start = today.replace(day=1)
-        last_end = current_start - timedelta(days=1)
-        last_start = last_end.replace(day=1)
+        return _versioned_read(
+            request,
+            household,
+            partial(_dashboard_data, household, user_code, today, receipt_fields=fields),
+            "dashboard",
+            user_code,
+            today,
+            fields,
+        )
 
-        saved_receipts = household.receipts.filter(is_saved=True)
-        current_month_qs = saved_receipts.filter(expense_date__range=(current_start, today))
-        last_month_qs = saved_receipts.filter(expense_date__range=(last_start, last_end))
 
-        current_month, current_totals = _build_month_summary(current_month_qs, current_start, today)
-        last_month, _ = _build_month_summary(last_month_qs, last_start, last_end)
+class ReceiptExpensesOverviewView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, _ = _session_context(request)
+        if not household:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        unsettled_current_month_qs = current_month_qs.filter(settled_at__isnull=True)
-        net_balances = _calculate_balances(unsettled_current_month_qs)
-        settlement = _build_settlement(net_balances, household)
-        currency = (
-            unsettled_current_month_qs.exclude(currency__exact="")
-            .values_list("currency", flat=True)
-            .first()
-            or current_month_qs.exclude(currency__exact="").values_list("currency", flat=True).first()
-            or "USD"
+        today = timezone.localdate()
+        return _versioned_read(
+            request,
+            household,
+            partial(_expenses_overview_data, household, today),
+            "expenses",
+            today,
         )
-        if unsettled_current_month_qs.exists():
-            notifications = _build_notifications(settlement, currency, household)
-        else:
-            notifications = _latest_notifications_by_user(household) or _build_notifications(settlement, currency, household)
-        recent_receipts = saved_receipts[:4]
-
-        payload = {
-            "household_code": household.code,
-            "household_name": household.household_name,
-            "current_user": user_code,
-            "current_user_name": household.name_for_code(user_code),
-            "members": household.member_names(),
-            "current_date": today,
-            "current_month": current_month,
-            "last_month": last_month,
-            "settlement": settlement,
-            "notifications": notifications,
-            "recent_receipts": ReceiptRecordSerializer(recent_receipts, many=True).data,
-        }
-
-        serializer = DashboardSerializer(payload)
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class ReceiptExpensesOverviewView(APIView):
+class ReceiptReportView(APIView):
     def get(self, request, *args, **kwargs):
         household, _ = _session_context(request)
         if not household:
             return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        today = timezone.localdate()
-        current_start = today.replace(day=1)
-        last_end = current_start - timedelta(days=1)
-        last_start = last_end.replace(day=1)
-
-        saved_receipts = household.receipts.filter(is_saved=True)
-        current_month_qs = saved_receipts.filter(expense_date__range=(current_start, today))
-        last_month_qs = saved_receipts.filter(expense_date__range=(last_start, last_end))
-
-        current_month, _ = _build_month_summary(current_month_qs, current_start, today)
-        last_month, _ = _build_month_summary(last_month_qs, last_start, last_end)
-        current_month_categories = _category_totals_payload(_sum_by_category(current_month_qs))
-        last_month_categories = _category_totals_payload(_sum_by_category(last_month_qs))
-
-        six_month_trend = []
-        six_month_category_trend = []
-        for offset in range(-5, 1):
-            month_start = _month_start_with_offset(current_start, offset)
-            month_end = today if offset == 0 else _month_end(month_start)
-            month_qs = saved_receipts.filter(expense_date__range=(month_start, month_end))
-            month_summary, _ = _build_month_summary(month_qs, month_start, month_end)
-            six_month_trend.append(month_summary)
-            six_month_category_trend.append(
+        query_serializer = ReportQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        date_to = query.get("date_to") or timezone.localdate()
+        date_from = query.get("date_from") or date_to.replace(day=1)
+        if date_from > date_to:
+            raise ValidationError({"from": ["from must be on or before to."]})
+        group_by = query["group_by"]
+        bucket_count = report_bucket_count(group_by, date_from, date_to)
+        if bucket_count is not None and bucket_count > MAX_REPORT_BUCKETS:
+            raise ValidationError(
                 {
-                    "month_label": month_start.strftime("%B %Y"),
-                    "start_date": month_start,
-                    "end_date": month_end,
-                    "categories": _category_totals_payload(_sum_by_category(month_qs)),
+                    "group_by": [
+                        f"This range has {bucket_count} {group_by} buckets; the limit is {MAX_REPORT_BUCKETS}. "
+                        "Narrow the range or group by a longer period."
+                    ]
                 }
             )
 
-        payload = {
-            "household_code": household.code,
-            "household_name": household.household_name,
-            "current_date": today,
-            "members": household.member_names(),
-            "current_month": current_month,
-            "last_month": last_month,
-            "six_month_trend": six_month_trend,
-            "current_month_categories": current_month_categories,
-            "last_month_categories": last_month_categories,
-            "six_month_category_trend": six_month_category_trend,
-        }
+        return _versioned_read(
+            request,
+            household,
+            partial(_report_data, household, date_from, date_to, group_by),
+            "report",
+            date_from,
+            date_to,
+            group_by,
+        )
 
-        serializer = ExpensesOverviewSerializer(payload)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class ReceiptInsightsView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, _ = _session_context(request)
+        if not household:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        query_serializer = InsightsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        month = (query_serializer.validated_data.get("month") or timezone.localdate()).replace(day=1)
+        limit = query_serializer.validated_data.get("limit", INSIGHTS_DEFAULT_LIMIT)
+        return _versioned_read(
+            request,
+            household,
+            partial(_insights_data, household, month, limit),
+            "insights",
+            month,
+            limit,
+        )
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -719,11 +1470,7 @@ class HouseholdSettleView(APIView):
 
         today = timezone.localdate()
         current_start = today.replace(day=1)
-        open_receipts = household.receipts.filter(
-            is_saved=True,
-            settled_at__isnull=True,
-            expense_date__range=(current_start, today),
-        )
+        open_receipts = _open_receipts(household, current_start, today)
 
         net_balances = _calculate_balances(open_receipts)
         settlement = _build_settlement(net_balances, household)
@@ -735,7 +1482,15 @@ class HouseholdSettleView(APIView):
         )
 
         with transaction.atomic():
-            open_receipts.update(settled_at=timezone.now())
+            settled_ids = list(open_receipts.values_list("id", flat=True))
+            household.receipts.filter(id__in=settled_ids).update(settled_at=timezone.now())
+            _record_household_write(
+                household,
+                [current_start],
+                changed_ids=settled_ids,
+                event=EVENT_HOUSEHOLD_SETTLED,
+                items_changed=False,
+            )
 
             if settlement["amount"] > 0:
                 payer = settlement["payer"]
@@ -751,17 +1506,12 @@ class HouseholdSettleView(APIView):
                 payer_message = "Settlement completed: No payment was required."
                 payee_message = "Settlement completed: No payment was required."
 
-            HouseholdNotification.objects.create(
-                household=household,
-                user_code=Receipt.USER_1,
-                message=payer_message if Receipt.USER_1 == settlement.get("payer") else payee_message,
-                read=False,
-            )
-            HouseholdNotification.objects.create(
-                household=household,
-                user_code=Receipt.USER_2,
-                message=payer_message if Receipt.USER_2 == settlement.get("payer") else payee_message,
-                read=False,
+            notify_members(
+                household,
+                {
+                    user_code: payer_message if user_code == settlement.get("payer") else payee_message
+                    for user_code in (Receipt.USER_1, Receipt.USER_2)
+                },
             )
 
         notifications = _latest_notifications_by_user(household)
@@ -785,35 +1535,45 @@ class ManualExpenseCreateView(APIView):
         serializer.is_valid(raise_exception=True)
         payload = serializer.validated_data
 
-        total = _to_decimal(payload.get("total"))
+        total = to_decimal(payload.get("total"))
         if total is None:
             return Response({"detail": "Total is required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        subtotal = _to_decimal(payload.get("subtotal"))
+        subtotal = to_decimal(payload.get("subtotal"))
         if subtotal is None:
             subtotal = total
 
-        tax = _to_decimal(payload.get("tax"))
-        tip = _to_decimal(payload.get("tip"))
+        tax = to_decimal(payload.get("tax"))
+        tip = to_decimal(payload.get("tip"))
         currency = (payload.get("currency") or "USD").strip().upper()
         expense_date = payload.get("expense_date") or timezone.localdate()
+        vendor = payload.get("vendor", "").strip()
 
-        receipt = Receipt.objects.create(
-            household=household,
-            uploaded_by=user_code,
-            image=None,
-            expense_date=expense_date,
-            vendor=payload.get("vendor", "").strip(),
-            currency=currency or "USD",
-            category=_normalize_receipt_category(payload.get("category")),
-            subtotal=subtotal,
-            tax=tax,
-            tip=tip,
-            total=total,
-            items=_normalize_receipt_items(payload.get("items", [])),
-            raw_text=payload.get("notes", "").strip(),
-            is_saved=True,
-        )
+        with transaction.atomic():
+            receipt = Receipt.objects.create(
+                household=household,
+                uploaded_by=user_code,
+                image=None,
+                expense_date=expense_date,
+                vendor=vendor,
+                vendor_key=resolve_vendor_key(household.id, vendor),
+                currency=currency or "USD",
+                category=_normalize_receipt_category(payload.get("category")),
+                subtotal=subtotal,
+                tax=tax,
+                tip=tip,
+                total=total,
+                items=_normalize_receipt_items(payload.get("items", [])),
+                raw_text=payload.get("notes", "").strip(),
+                is_saved=True,
+            )
+            _record_household_write(
+                household,
+                [receipt.expense_date],
+                changed_ids=[receipt.id],
+                event=EVENT_RECEIPT_CREATED,
+                user=user_code,
+            )
 
         output_serializer = ReceiptRecordSerializer(receipt)
         return Response({"receipt": output_serializer.data}, status=status.HTTP_201_CREATED)
@@ -826,7 +1586,7 @@ class ReceiptItemAssignmentsView(APIView):
         if not household:
             return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        receipt = household.receipts.filter(id=receipt_id).first()
+        receipt = household.receipts.defer("raw_text").filter(id=receipt_id).first()
         if not receipt:
             return Response({"detail": "Receipt not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -853,7 +1613,14 @@ class ReceiptItemAssignmentsView(APIView):
         update_fields = ["items", "is_saved"]
         if category:
             update_fields.append("category")
-        receipt.save(update_fields=update_fields)
+        with transaction.atomic():
+            receipt.save(update_fields=update_fields)
+            _record_household_write(
+                household,
+                [receipt.expense_date],
+                changed_ids=[receipt.id],
+                event=EVENT_RECEIPT_UPDATED,
+            )
 
         output_serializer = ReceiptRecordSerializer(receipt)
         return Response({"receipt": output_serializer.data}, status=status.HTTP_200_OK)
@@ -866,11 +1633,18 @@ class ReceiptDeleteView(APIView):
         if not household:
             return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        receipt = household.receipts.filter(id=receipt_id).first()
+        receipt = household.receipts.only("id", "household", "expense_date").filter(id=receipt_id).first()
         if not receipt:
             return Response({"detail": "Receipt not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        receipt.delete()
+        with transaction.atomic():
+            receipt.delete()
+            _record_household_write(
+                household,
+                [receipt.expense_date],
+                deleted_ids=[receipt_id],
+                event=EVENT_RECEIPT_DELETED,
+            )
         return Response({"detail": "Receipt deleted."}, status=status.HTTP_200_OK)
 
     def delete(self, request, receipt_id, *args, **kwargs):
@@ -881,16 +1655,160 @@ class ReceiptDeleteView(APIView):
         return self._delete_receipt(request, receipt_id)
 
 
+class ReceiptDetailView(ReceiptDeleteView):
+    def get(self, request, receipt_id, *args, **kwargs):
+        household, _ = _session_context(request)
+        if not household:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        return _versioned_read(
+            request,
+            household,
+            partial(_receipt_detail_data, household, receipt_id),
+            "receipt",
+            receipt_id,
+        )
+
+
 class ReceiptAnalysesView(APIView):
     def get(self, request, *args, **kwargs):
         household, _ = _session_context(request)
         if not household:
             return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        analyses = household.receipts.all()
-        payload = {"analyses": ReceiptRecordSerializer(analyses, many=True).data}
-        serializer = ReceiptAnalysesSerializer(payload)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        query_serializer = ReceiptHistoryQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        position = _decode_analyses_cursor(query["cursor"]) if query.get("cursor") else None
+        return _versioned_read(
+            request,
+            household,
+            partial(_analyses_data, household, query, position),
+            "analyses",
+            sorted(request.query_params.items()),
+        )
+
+
+class ReceiptSearchView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, _ = _session_context(request)
+        if not household:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        query_serializer = ReceiptSearchQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        position = _decode_search_cursor(query["cursor"], query["q"]) if query.get("cursor") else None
+        return _versioned_read(
+            request,
+            household,
+            partial(_receipt_search_data, household, query, position),
+            "search",
+            sorted(request.query_params.items()),
+        )
+
+
+class ItemPriceHistoryView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, _ = _session_context(request)
+        if not household:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        query_serializer = PriceHistoryQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        item_key = name_key(query["item"])
+        if not item_key:
+            raise ValidationError({"item": ["Enter an item name with at least one letter or digit."]})
+        position = _decode_price_history_cursor(query["cursor"], item_key) if query.get("cursor") else None
+        return _versioned_read(
+            request,
+            household,
+            partial(_price_history_data, household, query, item_key, position),
+            "price-history",
+            sorted(request.query_params.items()),
+        )
+
+
+class VendorAutocompleteView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, _ = _session_context(request)
+        if not household:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        query_serializer = VendorAutocompleteQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        limit = query.get("limit", VENDOR_AUTOCOMPLETE_DEFAULT_LIMIT)
+        return _versioned_read(
+            request,
+            household,
+            partial(_vendor_autocomplete_data, household, query["q"], limit),
+            "vendors",
+            query["q"],
+            limit,
+        )
+
+
+class ReceiptChangesView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, _ = _session_context(request)
+        if not household:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        query_serializer = ReceiptChangesQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        since = query_serializer.validated_data.get("since")
+        fields = query_serializer.validated_data["receipt_fields"]
+        return _versioned_read(
+            request,
+            household,
+            partial(_receipt_changes_data, household, since, fields),
+            "changes",
+            since,
+            fields,
+        )
+
+
+class NotificationInboxView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, user_code = _session_context(request)
+        if not household or not user_code:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        query_serializer = NotificationInboxQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        limit = query.get("limit", NOTIFICATIONS_DEFAULT_PAGE_SIZE)
+        position = _decode_notifications_cursor(query["cursor"]) if query.get("cursor") else None
+        return _versioned_read(
+            request,
+            household,
+            partial(_notification_inbox_data, household, user_code, limit, position),
+            "notifications",
+            user_code,
+            sorted(request.query_params.items()),
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class NotificationMarkReadView(APIView):
+    def post(self, request, *args, **kwargs):
+        household, user_code = _session_context(request)
+        if not household or not user_code:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            updated = mark_notifications_read(household, user_code, serializer.validated_data.get("ids"))
+            if updated:
+                # Read flags show on the dashboard and inbox, so their ETags must move.
+                _record_household_write(household, event=EVENT_NOTIFICATIONS_READ, user=user_code)
+        return Response(
+            {"updated": updated, "unread_count": unread_notification_count(household, user_code)},
+            status=status.HTTP_200_OK,
+        )
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -941,6 +1859,44 @@ class SessionLogoutView(APIView):
         return Response({"detail": "Logged out."}, status=status.HTTP_200_OK)
 
 
+class ReceiptBootstrapView(APIView):
+    def get(self, request, *args, **kwargs):
+        household, user_code = _session_context(request)
+        if not household or not user_code:
+            session = SessionStateSerializer(_build_session_state(None, None)).data
+            return Response({"session": session}, status=status.HTTP_200_OK)
+
+        query_serializer = ReceiptHistoryQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        query = query_serializer.validated_data
+        position = _decode_analyses_cursor(query["cursor"]) if query.get("cursor") else None
+        today = timezone.localdate()
+        return _versioned_read(
+            request,
+            household,
+            partial(_bootstrap_data, household, user_code, today, query, position),
+            "bootstrap",
+            user_code,
+            today,
+            sorted(request.query_params.items()),
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class EventTicketView(APIView):
+    def post(self, request, *args, **kwargs):
+        household, user_code = _session_context(request)
+        if not household or not user_code:
+            return Response({"detail": "Authentication required. Login first."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        if not _served_over_asgi(request):
+            # Clients only subscribe once they hold a ticket, so this keeps them off the stream.
+            return Response({"detail": EVENT_STREAM_UNAVAILABLE}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        payload = {"ticket": _build_event_ticket(household, user_code), "expires_in": EVENT_TICKET_SECONDS}
+        return Response(EventTicketSerializer(payload).data, status=status.HTTP_201_CREATED)
+
+
 class SessionMeView(APIView):
     def get(self, request, *args, **kwargs):
         household, user_code = _session_context(request)
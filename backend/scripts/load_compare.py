@@ -0,0 +1,181 @@
+"""Compare the sync analyze endpoints under gunicorn gthread with the async ones under uvicorn.
+
+A fake OpenAI upstream answers every call after ``--upstream-latency`` seconds, so the test
+measures how many in-flight model calls one worker can hold and how dashboard reads behave
+while they are waiting. Run from ``backend/``::
+
+    python scripts/load_compare.py --analyses 24 --upstream-latency 2
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from PIL import Image
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+UPSTREAM_APP = """
+import asyncio, json, os
+
+LATENCY = float(os.environ["FAKE_OPENAI_LATENCY"])
+BODY = json.dumps({"choices": [{"message": {"content": json.dumps({
+    "vendor": "Load Test Market", "receipt_date": "", "currency": "USD", "category": "supermarket",
+    "subtotal": 10, "tax": 0, "tip": 0, "total": 10,
+    "items": [{"name": "Bread", "quantity": 1, "unit_price": 10, "total_price": 10}], "raw_text": "bread",
+})}}]}).encode()
+
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    while (await receive()).get("more_body"):
+        pass
+    await asyncio.sleep(LATENCY)
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": BODY})
+"""
+
+
+def _png_bytes() -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (600, 900), "white").save(output, format="PNG")
+    return output.getvalue()
+
+
+def _wait_for(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TimeoutException:
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+
+def _start(command: list[str], env: dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _prepare_database(env: dict[str, str]) -> str:
+    subprocess.run([sys.executable, "manage.py", "migrate", "--no-input"], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+    script = (
+        "from receipts.models import HouseholdSession, Receipt\n"
+        "from receipts.views import _build_session_token\n"
+        "household = HouseholdSession(household_name='Load Test', member_1_name='Alex', member_2_name='Jamie')\n"
+        "household.set_passcode('1234')\n"
+        "household.save()\n"
+        "print(_build_session_token(household, Receipt.USER_1))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "manage.py", "shell", "-c", script],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+async def _run_load(base_url: str, analyze_path: str, dashboard_path: str, token: str, analyses: int, image: bytes):
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=analyses + 8)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=600, limits=limits) as client:
+        async def analyze(index: int):
+            response = await client.post(analyze_path, files={"image": (f"r{index}.png", image, "image/png")})
+            return response.status_code
+
+        async def dashboard_probe():
+            latencies = []
+            await asyncio.sleep(0.5)
+            for _ in range(10):
+                started = time.perf_counter()
+                response = await client.get(dashboard_path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.2)
+            return latencies
+
+        started = time.perf_counter()
+        probe = asyncio.create_task(dashboard_probe())
+        statuses = await asyncio.gather(*(analyze(index) for index in range(analyses)))
+        wall_time = time.perf_counter() - started
+        latencies = await probe
+
+    return {
+        "analyses": analyses,
+        "succeeded": sum(1 for code in statuses if code == 201),
+        "wall_seconds": round(wall_time, 2),
+        "dashboard_p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "dashboard_max_ms": round(max(latencies) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analyses", type=int, default=24)
+    parser.add_argument("--upstream-latency", type=float, default=2.0)
+    parser.add_argument("--threads", type=int, default=int(os.getenv("GUNICORN_THREADS", "2")))
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="splithappens-load-"))
+    upstream_file = workdir / "fake_openai.py"
+    upstream_file.write_text(UPSTREAM_APP)
+
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{workdir / 'load.sqlite3'}",
+        "OPENAI_API_KEY": "load-test",
+        "OPENAI_CHAT_COMPLETIONS_URL": "http://127.0.0.1:18900/v1/chat/completions",
+        "OPENAI_GOVERNOR_ENABLED": "False",
+        "ASYNC_BULK_ANALYZE_CONCURRENCY": str(args.analyses),
+        "FAKE_OPENAI_LATENCY": str(args.upstream_latency),
+        "DJANGO_DEBUG": "True",
+        "PYTHONPATH": f"{workdir}{os.pathsep}{os.environ.get('PYTHONPATH', '')}",
+    }
+    token = _prepare_database(env)
+    image = _png_bytes()
+    results = {}
+    processes = [_start([sys.executable, "-m", "uvicorn", "fake_openai:app", "--port", "18900", "--log-level", "warning"], env)]
+    try:
+        _wait_for("http://127.0.0.1:18900/")
+
+        gthread = _start(
+            ["gunicorn", "config.wsgi:application", "--bind", "127.0.0.1:18901", "--workers", "1", "--threads", str(args.threads), "--timeout", "600"],
+            env,
+        )
+        processes.append(gthread)
+        _wait_for("http://127.0.0.1:18901/api/receipts/session/me/")
+        results[f"gunicorn gthread (1 worker x {args.threads} threads)"] = asyncio.run(
+            _run_load("http://127.0.0.1:18901", "/api/receipts/analyze/", "/api/receipts/dashboard/", token, args.analyses, image)
+        )
+        gthread.terminate()
+        gthread.wait()
+
+        uvicorn = _start([sys.executable, "-m", "uvicorn", "config.asgi:application", "--port", "18902", "--log-level", "warning"], env)
+        processes.append(uvicorn)
+        _wait_for("http://127.0.0.1:18902/api/receipts/session/me/")
+        results["uvicorn async views (1 worker)"] = asyncio.run(
+            _run_load("http://127.0.0.1:18902", "/api/receipts/async/analyze/", "/api/receipts/async/dashboard/", token, args.analyses, image)
+        )
+    finally:
+        for process in processes:
+            process.terminate()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
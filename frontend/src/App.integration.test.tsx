@@ -15,6 +15,7 @@ vi.mock("./api", async () => {
     createHouseholdSession: vi.fn(),
     createManualExpense: vi.fn(),
     deleteReceipt: vi.fn(),
+    fetchBootstrap: vi.fn(),
     fetchDashboard: vi.fn(),
     fetchExpensesOverview: vi.fn(),
     fetchReceiptAnalyses: vi.fn(),
@@ -98,6 +99,7 @@ function buildDashboard(overrides: Partial<DashboardData> = {}): DashboardData {
       message: "No transfer needed. Spending is currently balanced.",
     },
     notifications: [],
+    unread_notifications: 0,
     recent_receipts: [],
     ...overrides,
   };
@@ -161,6 +163,14 @@ describe("App integration flows", () => {
     window.localStorage.clear();
     window.history.pushState({}, "", "/");
 
+    // Bootstrap is assembled from the per-section mocks so each test only stubs those.
+    vi.mocked(api.fetchBootstrap).mockImplementation(async () => {
+      const session = await api.fetchSession();
+      if (!session.user_name) {
+        return { session };
+      }
+      return { session, dashboard: await api.fetchDashboard() };
+    });
     vi.mocked(api.fetchReceiptAnalyses).mockResolvedValue({ analyses: [] });
     vi.mocked(api.fetchExpensesOverview).mockResolvedValue(buildExpensesOverview());
     vi.mocked(api.loginSession).mockResolvedValue(buildSession({ user: "user_1", user_name: "Alex" }));
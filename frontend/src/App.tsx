@@ -9,16 +9,18 @@ import {
   deleteReceipt,
   ExpenseCategory,
   ExpensesOverviewData,
+  fetchBootstrap,
   fetchDashboard,
   fetchExpensesOverview,
   fetchReceiptAnalyses,
-  fetchSession,
+  HouseholdEvent,
   loginSession,
   logoutSession,
   MemberNames,
   ReceiptRecord,
   settleHousehold,
   SessionState,
+  subscribeToHouseholdEvents,
   updateReceiptItemAssignments,
 } from "./api";
 import { MonthlyExpensesSection } from "./components/dashboard/MonthlyExpensesSection";
@@ -127,6 +129,8 @@ export default function App() {
   const [savingManualExpense, setSavingManualExpense] = useState(false);
   const [loadingDashboard, setLoadingDashboard] = useState(false);
   const [loadingAnalyses, setLoadingAnalyses] = useState(false);
+  const [analysesNextCursor, setAnalysesNextCursor] = useState<string | null>(null);
+  const [loadingMoreAnalyses, setLoadingMoreAnalyses] = useState(false);
   const [loadingExpenses, setLoadingExpenses] = useState(false);
   const [checkingSession, setCheckingSession] = useState(true);
   const [authLoading, setAuthLoading] = useState(false);
@@ -135,6 +139,8 @@ export default function App() {
   const [error, setError] = useState("");
   const [notice, setNotice] = useState("");
   const resultSectionRef = useRef<HTMLElement | null>(null);
+  const skipRouteReloadRef = useRef(false);
+  const eventReloadTimerRef = useRef<number | null>(null);
 
   function showError(errorValue: unknown, fallback: string) {
     setError(toUserErrorMessage(errorValue, fallback));
@@ -250,6 +256,11 @@ export default function App() {
   }, []);
 
   useEffect(() => {
+    if (skipRouteReloadRef.current) {
+      // The bootstrap payload already carried analyses and the expenses overview.
+      skipRouteReloadRef.current = false;
+      return;
+    }
     if (sessionUserName && route === "analyses") {
       void loadAnalyses();
     }
@@ -258,6 +269,15 @@ export default function App() {
     }
   }, [route, sessionUserName]);
 
+  useEffect(() => {
+    if (!sessionUserName) return;
+    const unsubscribe = subscribeToHouseholdEvents(handleHouseholdEvent);
+    return () => {
+      unsubscribe();
+      if (eventReloadTimerRef.current !== null) window.clearTimeout(eventReloadTimerRef.current);
+    };
+  }, [sessionUserName]);
+
   useEffect(() => {
     if (!latestReceipt) return;
     setTimeout(() => {
@@ -274,13 +294,29 @@ export default function App() {
     }
   }
 
+  function applyDashboard(data: DashboardData) {
+    setDashboard(data);
+    setSessionHouseholdCode(data.household_code);
+    setSessionHouseholdName(data.household_name);
+    setSessionUserName(data.current_user_name);
+    setSessionMembers(data.members);
+  }
+
   async function initializeSession() {
     setCheckingSession(true);
     try {
-      const session = await fetchSession();
-      applySessionState(session);
-      if (session.user_name) {
-        await loadDashboard();
+      const data = await fetchBootstrap();
+      skipRouteReloadRef.current = Boolean(data.session.user_name && data.analyses && data.expenses);
+      applySessionState(data.session);
+      if (data.dashboard) {
+        applyDashboard(data.dashboard);
+      }
+      if (data.analyses) {
+        setAnalyses(data.analyses.analyses);
+        setAnalysesNextCursor(data.analyses.next_cursor ?? null);
+      }
+      if (data.expenses) {
+        setExpensesOverview(data.expenses);
       }
     } catch (sessionError) {
       showError(sessionError, "Failed to check session.");
@@ -289,15 +325,28 @@ export default function App() {
     }
   }
 
+  function handleHouseholdEvent(event: HouseholdEvent) {
+    if (event.type === "stream.ready" || event.type === "analysis.progress") return;
+    if (event.type === "receipt.deleted" && event.ids) {
+      const deletedIds = new Set(event.ids);
+      setAnalyses((current) => current.filter((receipt) => !deletedIds.has(receipt.id)));
+    }
+    // Coalesce bursts (bulk uploads, settlements) into one reload of what is on screen.
+    if (eventReloadTimerRef.current !== null) window.clearTimeout(eventReloadTimerRef.current);
+    eventReloadTimerRef.current = window.setTimeout(() => {
+      eventReloadTimerRef.current = null;
+      // Read the route from the URL: this handler was captured when the stream was opened.
+      const currentRoute = routeFromPath(window.location.pathname);
+      void loadDashboard();
+      if (currentRoute === "analyses") void loadAnalyses();
+      if (currentRoute === "expenses") void loadExpensesOverview();
+    }, 500);
+  }
+
   async function loadDashboard() {
     setLoadingDashboard(true);
     try {
-      const data = await fetchDashboard();
-      setDashboard(data);
-      setSessionHouseholdCode(data.household_code);
-      setSessionHouseholdName(data.household_name);
-      setSessionUserName(data.current_user_name);
-      setSessionMembers(data.members);
+      applyDashboard(await fetchDashboard());
     } catch (loadError) {
       showError(loadError, "Failed to load dashboard.");
     } finally {
@@ -310,6 +359,7 @@ export default function App() {
     try {
       const data = await fetchReceiptAnalyses();
       setAnalyses(data.analyses);
+      setAnalysesNextCursor(data.next_cursor ?? null);
     } catch (loadError) {
       showError(loadError, "Failed to load analyses.");
     } finally {
@@ -317,6 +367,20 @@ export default function App() {
     }
   }
 
+  async function loadMoreAnalyses() {
+    if (!analysesNextCursor) return;
+    setLoadingMoreAnalyses(true);
+    try {
+      const data = await fetchReceiptAnalyses(analysesNextCursor);
+      setAnalyses((current) => [...current, ...data.analyses]);
+      setAnalysesNextCursor(data.next_cursor ?? null);
+    } catch (loadError) {
+      showError(loadError, "Failed to load more analyses.");
+    } finally {
+      setLoadingMoreAnalyses(false);
+    }
+  }
+
   async function loadExpensesOverview() {
     setLoadingExpenses(true);
     try {
@@ -409,6 +473,7 @@ export default function App() {
       setSessionMembers(null);
       setDashboard(null);
       setAnalyses([]);
+      setAnalysesNextCursor(null);
       setReviewReceipts([]);
       setReviewReceiptIndex(0);
       setUploadImages([]);
@@ -865,7 +930,7 @@ export default function App() {
         <>
           {loadingAnalyses && (
             <section className="card">
-              <p>Loading all analyzed receipts...</p>
+              <p>Loading analyzed receipts...</p>
             </section>
           )}
 
@@ -876,6 +941,9 @@ export default function App() {
               onEditReceipt={openReceiptForReview}
               onDeleteReceipt={(receipt) => void handleDeleteReceipt(receipt)}
               deletingReceiptId={deletingReceiptId}
+              hasMore={analysesNextCursor !== null}
+              loadingMore={loadingMoreAnalyses}
+              onLoadMore={() => void loadMoreAnalyses()}
             />
           )}
         </>
@@ -1,6 +1,8 @@
 const rawApiBaseUrl = import.meta.env.VITE_API_BASE_URL || "http://127.0.0.1:8000";
 const API_BASE_URL = /^https?:\/\//.test(rawApiBaseUrl) ? rawApiBaseUrl : `https://${rawApiBaseUrl}`;
 const SESSION_TOKEN_STORAGE_KEY = "splithappens_session_token";
+// Receipt history is fetched a page at a time; the rest follows the response's next_cursor.
+export const ANALYSES_PAGE_SIZE = 50;
 
 export type UserCode = "user_1" | "user_2";
 export type AssignedTo = "shared" | UserCode;
@@ -124,6 +126,7 @@ export interface DashboardData {
   last_month: MonthSummary;
   settlement: Settlement;
   notifications: DashboardNotification[];
+  unread_notifications: number;
   recent_receipts: ReceiptRecord[];
 }
 
@@ -158,6 +161,24 @@ export interface CategoryTrendPoint {
 
 export interface ReceiptAnalysesData {
   analyses: ReceiptRecord[];
+  next_cursor?: string | null;
+}
+
+export interface BootstrapData {
+  session: SessionState;
+  dashboard?: DashboardData;
+  expenses?: ExpensesOverviewData;
+  analyses?: ReceiptAnalysesData;
+}
+
+export interface HouseholdEvent {
+  type: string;
+  version: number | null;
+  ids?: number[] | null;
+  user?: UserCode;
+  index?: number;
+  total?: number;
+  failed?: boolean;
 }
 
 interface ApiError {
@@ -290,6 +311,12 @@ export async function fetchSession(): Promise<SessionState> {
   });
 }
 
+export async function fetchBootstrap(): Promise<BootstrapData> {
+  return apiFetch<BootstrapData>(`${API_BASE_URL}/api/receipts/bootstrap/?limit=${ANALYSES_PAGE_SIZE}`, {
+    method: "GET",
+  });
+}
+
 export async function analyzeReceipt(imageFile: File): Promise<AnalyzeReceiptResponse> {
   const formData = new FormData();
   formData.append("image", imageFile);
@@ -345,8 +372,10 @@ export async function fetchDashboard(): Promise<DashboardData> {
   });
 }
 
-export async function fetchReceiptAnalyses(): Promise<ReceiptAnalysesData> {
-  return apiFetch<ReceiptAnalysesData>(`${API_BASE_URL}/api/receipts/analyses/`, {
+export async function fetchReceiptAnalyses(cursor?: string | null): Promise<ReceiptAnalysesData> {
+  const params = new URLSearchParams({ limit: String(ANALYSES_PAGE_SIZE) });
+  if (cursor) params.set("cursor", cursor);
+  return apiFetch<ReceiptAnalysesData>(`${API_BASE_URL}/api/receipts/analyses/?${params.toString()}`, {
     method: "GET",
   });
 }
@@ -372,3 +401,55 @@ export async function settleHousehold(): Promise<SettleResponse> {
     method: "POST",
   });
 }
+
+export interface EventTicket {
+  ticket: string;
+  expires_in: number;
+}
+
+export async function createEventTicket(): Promise<EventTicket> {
+  return apiFetch<EventTicket>(`${API_BASE_URL}/api/receipts/events/ticket/`, {
+    method: "POST",
+  });
+}
+
+const EVENT_STREAM_RETRY_MS = 5000;
+
+export function subscribeToHouseholdEvents(onEvent: (event: HouseholdEvent) => void): () => void {
+  if (typeof EventSource === "undefined") return () => undefined;
+  let source: EventSource | null = null;
+  let retryTimer: number | null = null;
+  let closed = false;
+
+  // EventSource cannot send headers, so each connection gets a short-lived ticket for its query
+  // string. A dropped stream outlives its ticket, so reconnects mint a fresh one.
+  const connect = async () => {
+    let ticket: EventTicket;
+    try {
+      ticket = await createEventTicket();
+    } catch {
+      // Not signed in any more, or the server cannot stream; stay quiet.
+      return;
+    }
+    if (closed) return;
+    source = new EventSource(`${API_BASE_URL}/api/receipts/events/?ticket=${encodeURIComponent(ticket.ticket)}`);
+    source.onmessage = (message) => {
+      try {
+        onEvent(JSON.parse(message.data) as HouseholdEvent);
+      } catch {
+        // Ignore anything that is not one of our JSON events.
+      }
+    };
+    source.onerror = () => {
+      if (closed || source?.readyState !== EventSource.CLOSED) return;
+      retryTimer = window.setTimeout(() => void connect(), EVENT_STREAM_RETRY_MS);
+    };
+  };
+
+  void connect();
+  return () => {
+    closed = true;
+    if (retryTimer !== null) window.clearTimeout(retryTimer);
+    source?.close();
+  };
+}
@@ -11,6 +11,9 @@ interface ReceiptAnalysesCardProps {
   onEditReceipt: (receipt: ReceiptRecord) => void;
   onDeleteReceipt: (receipt: ReceiptRecord) => void;
   deletingReceiptId: number | null;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 export function ReceiptAnalysesCard({
@@ -19,6 +22,9 @@ export function ReceiptAnalysesCard({
   onEditReceipt,
   onDeleteReceipt,
   deletingReceiptId,
+  hasMore = false,
+  loadingMore = false,
+  onLoadMore,
 }: ReceiptAnalysesCardProps) {
   return (
     <section className="card">
@@ -110,6 +116,11 @@ export function ReceiptAnalysesCard({
           </article>
         ))}
       </div>
+      {hasMore && onLoadMore && (
+        <button type="button" className="secondary-btn" onClick={onLoadMore} disabled={loadingMore}>
+          {loadingMore ? "Loading..." : "Load more"}
+        </button>
+      )}
     </section>
   );
 }